@@ -1,37 +1,298 @@
-from trafficTSP.Compare.compare_strategies import compare_strategies
-from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
-# from trafficTSP.Approaches.Random.random_strategy import RandomStrategy
-from trafficTSP.Approaches.Discrete.discrete_strategy import (
-    DiscreteStrategy
-)
 import argparse
-import random
+import contextlib
+import json
+import sys
+import time
+from functools import partial
+from trafficTSP.Approaches.registry import STRATEGIES, load_strategy
 
+# Every command imports only what it needs, so that short runs such as
+# solve-single do not pay for matplotlib, pandas, SQLAlchemy or ortools
+COMMANDS = ("run", "plot", "merge", "solve-single", "serve")
+# Strategies that can restrict their neighbourhoods to candidate lists
+CANDIDATE_STRATEGIES = ("Greedy", "VectorizedGreedy", "LocalSearch",
+                        "Discrete")
 
-def main():
-    # Set up argument parsing
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--nodes', type=int,
-                        help='Number of nodes',
-                        default=9)
-    parser.add_argument('--n_repetitions', type=int,
-                        help='Number of repetitions',
-                        default=20)
-    args = parser.parse_args()
+
+def add_solver_arguments(parser: argparse.ArgumentParser):
+    """Adds the options of the discrete strategy."""
+    parser.add_argument('--solver_workers', type=int,
+                        help='CP-SAT search workers (0 lets CP-SAT choose)',
+                        default=0)
+    parser.add_argument('--time_limit', type=float,
+                        help='CP-SAT time limit in seconds',
+                        default=60.0)
+    parser.add_argument('--gap', type=float,
+                        help='CP-SAT relative gap limit',
+                        default=0.05)
+    parser.add_argument('--solver_log', action='store_true',
+                        help='Print the CP-SAT search log')
+    parser.add_argument('--bins', type=int,
+                        help='Number of time bins of the discrete strategy',
+                        default=30)
+    parser.add_argument('--discretisation', type=str,
+                        choices=['uniform', 'adaptive'],
+                        help='Placement of the time bins',
+                        default='uniform')
+    parser.add_argument('--no_prune', action='store_true',
+                        help='Keep the timed edges that no tour can use')
+    parser.add_argument('--prune_by_bound', action='store_true',
+                        help='Also drop the timed edges of tours worse '
+                             'than greedy')
+
+
+def add_candidate_arguments(parser: argparse.ArgumentParser):
+    """Adds the options of the candidate lists."""
+    parser.add_argument('--candidates', type=int,
+                        help='Restrict the neighbourhoods to the nearest '
+                             'nodes of every node',
+                        default=None)
+    parser.add_argument('--candidates_by', type=str,
+                        choices=['distance', 'min_travel_time'],
+                        help='Order of the candidate lists',
+                        default='distance')
+
+
+def build_strategy(name: str, args: argparse.Namespace):
+    """Returns the strategy registered as name, with its options."""
+    strategy = load_strategy(name)
+    options = {}
+    if args.candidates is not None and name in CANDIDATE_STRATEGIES:
+        options = {"n_candidates": args.candidates,
+                   "candidates_by": args.candidates_by}
+    if name == "Discrete":
+        return partial(
+            strategy,
+            n_bins=args.bins,
+            discretisation=args.discretisation,
+            num_workers=args.solver_workers,
+            max_time_in_seconds=args.time_limit,
+            relative_gap_limit=args.gap,
+            log_callback=print if args.solver_log else None,
+            prune=not args.no_prune,
+            prune_by_bound=args.prune_by_bound,
+            **options
+        )
+    if options:
+        return partial(strategy, **options)
+    return strategy
+
+
+def run(args: argparse.Namespace):
+    """Compares the strategies on a sweep of instances."""
+    from trafficTSP.Compare.compare_strategies import (
+        compare_strategies,
+        parse_shard
+    )
+
+    strategies = {
+        "Greedy": build_strategy("Greedy", args),
+        "MultiStartGreedy": partial(build_strategy("VectorizedGreedy",
+                                                   args),
+                                    all_starts=True),
+        # "Random": build_strategy("Random", args),
+        "LocalSearch": build_strategy("LocalSearch", args),
+        "Discrete": build_strategy("Discrete", args)
+    }
+    if args.exact:
+        strategies["DynamicProgramming"] = build_strategy(
+            "DynamicProgramming", args
+        )
 
     # Compare strategies
     compare_strategies(
-        strategies={
-            "Greedy": GreedyStrategy,
-            # "Random": RandomStrategy,
-            "Discrete": DiscreteStrategy
-        },
+        strategies=strategies,
         max_nodes=args.nodes,
-        n_repetitions=args.n_repetitions
+        n_repetitions=args.n_repetitions,
+        workers=args.workers,
+        seed=args.seed,
+        instance_set=args.instance_set,
+        run_id=args.run_id,
+        resume=args.resume,
+        cache_size=args.cache_size,
+        profile=args.profile,
+        plot=not args.no_plot,
+        shard=None if args.shard is None else parse_shard(args.shard),
+        sizes=args.sizes
+    )
+
+
+def plot(args: argparse.Namespace):
+    """Plots the results of a run to files, without showing them."""
+    from trafficTSP.Compare.plot_results import visualise_results
+    from trafficTSP.Compare.results_writer import default_db_location
+
+    db_name = default_db_location if args.db is None else args.db
+    visualise_results(args.name, db_name, args.old_strategy,
+                      args.new_strategy, run_id=args.run_id)
+
+
+def merge(args: argparse.Namespace):
+    """Appends the results of several databases, such as shards, to one."""
+    from trafficTSP.Compare.results_writer import (
+        default_db_location,
+        merge_results
+    )
+
+    output_db = default_db_location if args.output is None else args.output
+    n_added = merge_results(args.dbs, output_db)
+    print(f"{n_added} results merged into {output_db}")
+
+
+def solve_single(args: argparse.Namespace):
+    """Solves one generated instance and prints the result as JSON."""
+    from trafficTSP.CreateProblems.graphs import (
+        InstanceSpec,
+        create_graph_from_spec
     )
+    from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+
+    graph = create_graph_from_spec(InstanceSpec(args.nodes, args.seed))
+    start_time = time.time()
+    # Keep stdout for the result, strategies print their progress
+    with contextlib.redirect_stdout(sys.stderr):
+        strategy = build_strategy(args.strategy, args)(graph)
+        solution = strategy.solve()
+    time_taken = time.time() - start_time
+    print(json.dumps({"strategy": args.strategy, "n_nodes": args.nodes,
+                      "seed": args.seed,
+                      "cost": evaluate_solution(graph, solution),
+                      "time_taken": time_taken,
+                      "solution": [int(node) for node in solution],
+                      **getattr(strategy, "solve_stats", {})},
+                     default=float))
+
+
+def serve(args: argparse.Namespace):
+    """
+    Solves the JSON-lines requests of stdin with warm worker processes,
+    writing the responses to stdout.
+    """
+    from trafficTSP.Service.solve_service import serve as serve_requests
+
+    serve_requests(workers=args.workers, strategies=tuple(args.warm))
+
+
+def parse_arguments(arguments: list[str] = None) -> argparse.Namespace:
+    """
+    Parses the command line. Without a command, run is assumed, so the
+    options of earlier versions keep working.
+    """
+    if arguments is None:
+        arguments = sys.argv[1:]
+    if not arguments or arguments[0] not in COMMANDS + ('-h', '--help'):
+        arguments = ["run"] + list(arguments)
+
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Compare the strategies")
+    run_parser.add_argument('--nodes', type=int,
+                            help='Number of nodes',
+                            default=9)
+    run_parser.add_argument('--n_repetitions', type=int,
+                            help='Number of repetitions',
+                            default=20)
+    run_parser.add_argument('--workers', type=int,
+                            help='Number of processes solving instances',
+                            default=1)
+    run_parser.add_argument('--seed', type=int,
+                            help='Seed of the generated instances',
+                            default=0)
+    run_parser.add_argument('--instance_set', type=str,
+                            help='Name of the stored set of instances to use',
+                            default=None)
+    run_parser.add_argument('--run_id', type=str,
+                            help='Identifier of the run in the results table',
+                            default=None)
+    run_parser.add_argument('--resume', action='store_true',
+                            help='Skip the results that run_id already has')
+    run_parser.add_argument('--cache_size', type=int,
+                            help='Size of the weight cache shared by '
+                                 'strategies',
+                            default=None)
+    run_parser.add_argument('--profile', type=str,
+                            choices=['cprofile', 'tracemalloc'],
+                            help='Profile every strategy run',
+                            default=None)
+    run_parser.add_argument('--exact', action='store_true',
+                            help='Also solve exactly with dynamic '
+                                 'programming (up to 18 nodes)')
+    run_parser.add_argument('--no_plot', action='store_true',
+                            help='Only save the results, without plots')
+    run_parser.add_argument('--shard', type=str,
+                            help='Run only the slice i/N of the sweep '
+                                 '(needs --run_id)',
+                            default=None)
+    run_parser.add_argument('--sizes', type=int, nargs='+',
+                            help='Numbers of nodes of the sweep (3 to '
+                                 'nodes - 1 by default)',
+                            default=None)
+    add_solver_arguments(run_parser)
+    add_candidate_arguments(run_parser)
+    run_parser.set_defaults(function=run)
+
+    plot_parser = commands.add_parser("plot",
+                                      help="Plot the results of a run")
+    plot_parser.add_argument('--run_id', type=str,
+                             help='Run to plot (all results by default)',
+                             default=None)
+    plot_parser.add_argument('--db', type=str,
+                             help='Results database',
+                             default=None)
+    plot_parser.add_argument('--name', type=str,
+                             help='File name of the plot',
+                             default="results.png")
+    plot_parser.add_argument('--old_strategy', type=str, default="Greedy")
+    plot_parser.add_argument('--new_strategy', type=str, default="Discrete")
+    plot_parser.set_defaults(function=plot)
+
+    merge_parser = commands.add_parser(
+        "merge", help="Merge the results of several databases"
+    )
+    merge_parser.add_argument('dbs', type=str, nargs='+',
+                              help='Results databases to merge')
+    merge_parser.add_argument('--output', type=str,
+                              help='Database the results are appended to',
+                              default=None)
+    merge_parser.set_defaults(function=merge)
+
+    solve_parser = commands.add_parser(
+        "solve-single", help="Solve one instance and print it as JSON"
+    )
+    solve_parser.add_argument('--strategy', type=str,
+                              choices=sorted(STRATEGIES),
+                              default="Greedy")
+    solve_parser.add_argument('--nodes', type=int,
+                              help='Number of nodes',
+                              default=9)
+    solve_parser.add_argument('--seed', type=int,
+                              help='Seed of the instance',
+                              default=0)
+    add_solver_arguments(solve_parser)
+    add_candidate_arguments(solve_parser)
+    solve_parser.set_defaults(function=solve_single)
+
+    serve_parser = commands.add_parser(
+        "serve", help="Solve JSON-lines requests from stdin"
+    )
+    serve_parser.add_argument('--workers', type=int,
+                              help='Number of worker processes',
+                              default=2)
+    serve_parser.add_argument('--warm', type=str, nargs='*',
+                              choices=sorted(STRATEGIES),
+                              help='Strategies imported by the workers '
+                                   'on start',
+                              default=["Greedy", "Discrete"])
+    serve_parser.set_defaults(function=serve)
+
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list[str] = None):
+    args = parse_arguments(arguments)
+    args.function(args)
 
 
 if __name__ == "__main__":
-    # Fix the seed for reproducibility
-    random.seed(0)
     main()
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from trafficTSP.Approaches.Decomposition.clustering import (
+    cluster_nodes,
+    kmeans,
+    order_clusters
+)
+
+
+@pytest.fixture
+def points():
+    """Three groups of points far from each other."""
+    rng = np.random.default_rng(0)
+    centres = np.array([[0, 0], [10, 0], [0, 10]])
+    return np.concatenate([centre + rng.normal(scale=0.5, size=(8, 2))
+                           for centre in centres])
+
+
+def test_kmeans_finds_groups(points):
+    """Points of the same group get the same label."""
+    labels, centroids = kmeans(points, 3, seed=1)
+
+    assert centroids.shape == (3, 2)
+    for group in range(3):
+        assert len(set(labels[8 * group:8 * (group + 1)])) == 1
+    assert len(set(labels)) == 3
+
+
+def test_kmeans_more_clusters_than_points():
+    """Every cluster gets a point, even with repeated points."""
+    labels, _ = kmeans(np.zeros((4, 2)), 6)
+
+    assert sorted(labels) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("max_cluster_size", [1, 3, 5, 8, 30])
+def test_cluster_nodes_sizes(points, max_cluster_size):
+    """Every point is in exactly one cluster of bounded size."""
+    clusters = cluster_nodes(points, max_cluster_size)
+
+    assert sorted(np.concatenate(clusters)) == list(range(len(points)))
+    assert all(0 < len(cluster) <= max_cluster_size
+               for cluster in clusters)
+
+
+def test_order_clusters():
+    """Clusters on a line are visited along it from the first one."""
+    centroids = [[0, 0], [3, 0], [1, 0], [2, 0], [4, 0]]
+
+    assert order_clusters(centroids, first=2) in ([2, 0, 3, 1, 4],
+                                                  [2, 3, 1, 4, 0])
+    assert sorted(order_clusters(centroids)) == list(range(5))
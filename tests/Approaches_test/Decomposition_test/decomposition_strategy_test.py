@@ -0,0 +1,93 @@
+import pytest
+import random
+from functools import partial
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.Decomposition.decomposition_strategy import (
+    DecompositionStrategy
+)
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph using a deterministic seed."""
+    random.seed(42)
+    return create_graph(n_nodes=40)
+
+
+def test_clusters(fixed_graph):
+    """The clusters split the nodes, the one of start_node first."""
+    strategy = DecompositionStrategy(fixed_graph, start_node=5,
+                                     max_cluster_size=8)
+    clusters = strategy.clusters()
+
+    assert 5 in clusters[0]
+    assert sorted(node for cluster in clusters
+                  for node in cluster) == list(range(40))
+    assert all(len(cluster) <= 8 for cluster in clusters)
+
+
+def test_entry_points(fixed_graph):
+    """Clusters are entered in order, at increasing times."""
+    strategy = DecompositionStrategy(fixed_graph, max_cluster_size=8)
+    clusters = strategy.clusters()
+    entries = strategy.entry_points(clusters)
+
+    assert entries[0] == (0, 0.0)
+    for cluster, (entry, _) in zip(clusters, entries):
+        assert entry in cluster
+    times = [t for _, t in entries]
+    assert times == sorted(times)
+
+
+@pytest.mark.parametrize("start_node", [0, 17])
+def test_solution_is_tour(fixed_graph, start_node):
+    """The solution visits every node once, from start_node."""
+    strategy = DecompositionStrategy(fixed_graph, start_node=start_node,
+                                     max_cluster_size=8,
+                                     repair_time_limit=0.2)
+    solution = strategy.solve()
+
+    assert solution[0] == start_node
+    assert sorted(solution) == list(range(40))
+    assert strategy.solve_stats["n_clusters"] >= 5
+    assert strategy.solve_stats["largest_cluster"] <= 8
+
+
+def test_repair_improves_stitched_tour(fixed_graph):
+    """The local search repair does not make the stitched tour worse."""
+    stitched = DecompositionStrategy(fixed_graph, max_cluster_size=8,
+                                     repair_time_limit=0).solve()
+    repaired = DecompositionStrategy(fixed_graph, max_cluster_size=8,
+                                     repair_time_limit=1.0).solve()
+
+    assert (evaluate_solution(fixed_graph, repaired) <=
+            evaluate_solution(fixed_graph, stitched) + 1e-9)
+    assert (evaluate_solution(fixed_graph, repaired) <=
+            evaluate_solution(fixed_graph,
+                              GreedyStrategy(fixed_graph).solve()))
+
+
+def test_parallel_clusters_match_sequential(fixed_graph):
+    """Solving the clusters in processes gives the same tour."""
+    strategy = partial(DecompositionStrategy, max_cluster_size=8,
+                       repair_time_limit=0)
+
+    assert (strategy(fixed_graph, workers=2).solve() ==
+            strategy(fixed_graph, workers=1).solve())
+
+
+def test_discrete_clusters(fixed_graph):
+    """The clusters can be solved with the discrete strategy."""
+    from trafficTSP.Approaches.Discrete.discrete_strategy import (
+        DiscreteStrategy
+    )
+
+    strategy = DecompositionStrategy(
+        fixed_graph, max_cluster_size=6, repair_time_limit=0,
+        cluster_strategy=partial(DiscreteStrategy, n_bins=20,
+                                 max_time_in_seconds=2.0)
+    )
+
+    assert sorted(strategy.solve()) == list(range(40))
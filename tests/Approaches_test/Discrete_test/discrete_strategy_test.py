@@ -0,0 +1,210 @@
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.Approaches.Discrete.discrete_strategy import DiscreteStrategy
+from trafficTSP.Compare.profiling import record_stages
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph using a deterministic seed."""
+    random.seed(42)
+    return create_graph(n_nodes=4)
+
+
+def test_edge_indexes(fixed_graph):
+    """Ensure the edge indexes contain exactly the edges of the model."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=10)
+    edges = set(strategy.edge_vars)
+
+    for node in range(fixed_graph['n_nodes']):
+        assert set(strategy.edges_from_node(node)) == {
+            edge for edge in edges if edge.start_node == node
+        }
+        assert set(strategy.edges_to_node(node)) == {
+            edge for edge in edges if edge.end_node == node
+        }
+        for step in range(strategy.n_bins):
+            assert set(strategy.edges_from_vertex(node, step)) == {
+                edge for edge in edges
+                if (edge.start_node, edge.start_step) == (node, step)
+            }
+            assert set(strategy.edges_to_vertex(node, step)) == {
+                edge for edge in edges
+                if (edge.end_node, edge.end_step) == (node, step)
+            }
+
+
+def test_discrete_strategy_valid_path(fixed_graph):
+    """Check if the discrete strategy returns a valid path."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=20)
+    solution = strategy.solve()
+
+    assert solution[0] == 0, "Solution must start at the starting node"
+    assert sorted(solution) == list(range(fixed_graph['n_nodes'])), (
+        "Solution must contain all nodes exactly once"
+    )
+
+
+def test_edges_arrive_at_rounded_travel_time(fixed_graph):
+    """Every edge arrives at the step closest to its travel time."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=15, prune=False)
+    n_edges = 0
+    for i in range(fixed_graph['n_nodes']):
+        for j in range(fixed_graph['n_nodes']):
+            if i == j:
+                continue
+            for step in range(strategy.n_bins):
+                t = step * strategy.time_increments
+                travel_time = fixed_graph[(i, j)](t)
+                end_step = step + max(
+                    1, round(travel_time / strategy.time_increments)
+                )
+                edges = [edge for edge in strategy.edges_from_vertex(i, step)
+                         if edge.end_node == j]
+                if end_step < strategy.n_bins:
+                    assert [edge.end_step for edge in edges] == [end_step]
+                    assert strategy.travel_times[edges[0]] == (
+                        pytest.approx(travel_time)
+                    )
+                    n_edges += 1
+                else:
+                    assert edges == []
+    assert n_edges == len(strategy.edge_vars)
+
+
+def test_greedy_hint(fixed_graph):
+    """The greedy tour is projected on the time-expanded edges."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=20)
+    edges = strategy.greedy_edges
+
+    assert [edge.start_node for edge in edges] == strategy.greedy_solution()
+    assert edges[0].start_step == 0
+    assert edges[-1].end_node == strategy.starting_node
+    for edge, next_edge in zip(edges, edges[1:]):
+        assert edge.end_node == next_edge.start_node
+        assert edge.end_step == next_edge.start_step
+
+
+def test_greedy_upper_bound(fixed_graph):
+    """With the greedy bound the solution is not worse than greedy."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=20,
+                                greedy_upper_bound=True)
+    solution = strategy.solve()
+    solution_edges = strategy.project_tour(solution)
+
+    assert (strategy.edges_cost(solution_edges) <=
+            strategy.edges_cost(strategy.greedy_edges))
+
+
+def test_hint_tour(fixed_graph):
+    """A hint tour replaces the greedy hint."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=20,
+                                hint_tour=[0, 3, 2, 1])
+    hint = strategy.model.Proto().solution_hint
+    hinted = {index for index, value in zip(hint.vars, hint.values)
+              if value}
+    edges = strategy.project_tour([0, 3, 2, 1])
+
+    assert hinted == {strategy.edge_vars[edge].Index() for edge in edges}
+
+
+def test_open_tour(fixed_graph):
+    """An open tour pays nothing to go back to the starting node."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=30, open_tour=True)
+    solution = strategy.solve()
+    edges = strategy.project_tour(solution)
+
+    assert sorted(solution) == [0, 1, 2, 3]
+    for edge in strategy.edges_to_node(strategy.starting_node):
+        assert edge.end_step == strategy.n_bins - 1
+        assert strategy.edge_cost(edge) == 0
+    # The cost is the step at which the last node is reached
+    assert strategy.edges_cost(edges) == edges[-1].start_step
+    assert strategy.solve_stats["solver_objective"] == edges[-1].start_step
+
+
+def test_tour_outside_time_range(fixed_graph):
+    """A tour that does not fit in the time range cannot be projected."""
+    strategy = DiscreteStrategy(fixed_graph, n_bins=20,
+                                time_range=(0, 5))
+    assert strategy.project_tour([0, 1, 2, 3]) is None
+    assert strategy.greedy_edges is None
+
+
+def test_solver_parameters_and_stats(fixed_graph):
+    """Solver parameters are used and the solve statistics recorded."""
+    log_lines = []
+    strategy = DiscreteStrategy(fixed_graph, n_bins=20, num_workers=1,
+                                max_time_in_seconds=10,
+                                log_callback=log_lines.append)
+    strategy.solve()
+    stats = strategy.solve_stats
+
+    assert log_lines, "The search log should be sent to the callback"
+    assert stats["solver_status"] in ["OPTIMAL", "FEASIBLE"]
+    assert stats["solver_n_solutions"] >= 1
+    assert stats["solver_objective"] >= stats["solver_best_bound"]
+    assert 0 <= stats["solver_gap"] <= 1
+    assert 0 <= stats["solver_wall_time"] <= 10
+
+
+def test_discrete_strategy_stages(fixed_graph):
+    """Model building, greedy tour and CP-SAT search are timed apart."""
+    with record_stages() as timer:
+        DiscreteStrategy(fixed_graph, n_bins=10).solve()
+
+    assert {"model_variables", "model_constraints", "greedy",
+            "cp_sat"} <= set(timer.durations)
+
+
+def test_discrete_strategy_candidates():
+    """Only candidate edges, edges of the start and greedy edges exist."""
+    random.seed(3)
+    graph = create_graph(n_nodes=7)
+    strategy = DiscreteStrategy(graph, n_bins=15, n_candidates=2)
+    allowed = strategy.allowed_pairs()
+    candidates = graph.candidate_lists(2)
+
+    for edge in strategy.edge_vars:
+        assert allowed[edge.start_node, edge.end_node]
+    assert allowed.sum() < 7 * 6
+    for node in range(7):
+        assert allowed[node, candidates[node]].all()
+    solution = strategy.solve()
+    assert sorted(solution) == list(range(7))
+
+
+def test_pruning_keeps_the_optimum(fixed_graph):
+    """Pruned edges cannot be in a tour, so the optimum does not change."""
+    pruned = DiscreteStrategy(fixed_graph, n_bins=20, relative_gap_limit=0)
+    full = DiscreteStrategy(fixed_graph, n_bins=20, relative_gap_limit=0,
+                            prune=False)
+    pruned.solve()
+    full.solve()
+    stats = pruned.pruning_stats
+
+    assert set(pruned.edge_vars) < set(full.edge_vars)
+    assert stats["candidate_edges"] == len(full.edge_vars)
+    assert stats["removed"] == len(full.edge_vars) - len(pruned.edge_vars)
+    assert stats["removed"] == (stats["unreachable"] + stats["dead_ends"] +
+                                stats["dominated"])
+    assert pruned.solve_stats["pruning_removed"] == stats["removed"]
+    assert (pruned.solve_stats["solver_objective"] ==
+            full.solve_stats["solver_objective"])
+    # The starting node is only left at step 0
+    assert all(edge.start_step == 0 for edge in
+               pruned.edges_from_node(pruned.starting_node))
+
+
+def test_pruning_by_bound(fixed_graph):
+    """Pruning by the greedy bound keeps the greedy tour."""
+    pruned = DiscreteStrategy(fixed_graph, n_bins=20, prune_by_bound=True)
+    reachable = DiscreteStrategy(fixed_graph, n_bins=20)
+
+    assert set(pruned.edge_vars) <= set(reachable.edge_vars)
+    assert pruned.pruning_stats["dominated"] >= 0
+    assert pruned.greedy_edges is not None
+    solution = pruned.solve()
+    assert (pruned.edges_cost(pruned.project_tour(solution)) <=
+            pruned.edges_cost(pruned.greedy_edges))
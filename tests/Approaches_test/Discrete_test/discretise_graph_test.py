@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 import random
 from trafficTSP.CreateProblems.graphs import create_graph
@@ -89,5 +90,40 @@ def test_discretise_and_approximate_graph_rounding(fixed_graph_4):
     )
 
 
+def test_discretise_and_approximate_graph_tensor(fixed_graph_4):
+    """The tensor output holds the same travel times as the DataFrame"""
+    tensor = discretise_and_approximate_graph(fixed_graph_4, bins=5,
+                                              output="tensor")
+    result = discretise_and_approximate_graph(fixed_graph_4, bins=5)
+
+    assert tensor.dtype == np.int32
+    assert tensor.shape == (4, 4, 5)
+    for row in result.itertuples():
+        assert tensor[row.start_node, row.final_node, row.time] == (
+            row.travel_time
+        )
+    # Travel times from a node to itself are zero
+    assert not tensor[np.arange(4), np.arange(4)].any()
+
+
+def test_discretise_and_approximate_graph_values(fixed_graph_4):
+    """Travel times are the weights rounded to the closest timestep"""
+    result = discretise_and_approximate_graph(fixed_graph_4, bins=5)
+    timestep = 480 / 4
+
+    for row in result.itertuples():
+        weight = fixed_graph_4[(row.start_node, row.final_node)](
+            row.time * timestep
+        )
+        assert row.travel_time == round(weight / timestep)
+
+
+def test_discretise_and_approximate_graph_unknown_output(fixed_graph_2):
+    """An unknown output raises a ValueError"""
+    with pytest.raises(ValueError):
+        discretise_and_approximate_graph(fixed_graph_2, bins=5,
+                                         output="list")
+
+
 if __name__ == "__main__":
     pytest.main()
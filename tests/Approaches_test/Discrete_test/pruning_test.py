@@ -0,0 +1,67 @@
+import numpy as np
+from trafficTSP.Approaches.Discrete.pruning import (
+    backward_costs,
+    forward_costs,
+    prune_edges
+)
+
+# Time-expanded graph of 3 nodes and 5 steps, as (start_node, start_step,
+# end_node, end_step, cost)
+EDGES = np.array([
+    (0, 0, 1, 1, 1),
+    (0, 0, 2, 2, 4),
+    (1, 1, 2, 2, 1),
+    (2, 2, 0, 3, 1),
+    (2, 2, 1, 4, 3),
+    (1, 4, 0, 4, 9),  # Back to the start at the same step
+    (1, 3, 2, 4, 1),  # (1, 3) cannot be reached
+    (0, 1, 2, 2, 1),  # The start is only left at step 0
+    (2, 4, 1, 4, 1),  # (2, 4) cannot be reached either
+    (1, 1, 2, 3, 1),  # (2, 3) cannot get back to the start
+]).T
+N_NODES, N_BINS = 3, 5
+
+
+def test_forward_costs():
+    """Every vertex gets the cost of its cheapest path from the start."""
+    reach = forward_costs(*EDGES[:4], EDGES[4], N_NODES, N_BINS, 0)
+
+    assert reach[0, 0] == 0
+    assert reach[1, 1] == 1
+    assert reach[2, 2] == 2
+    assert reach[0, 3] == 3
+    assert reach[1, 4] == 5
+    assert np.isinf(reach[1, 3])
+
+
+def test_backward_costs():
+    """Every vertex gets the cost of its cheapest path back to the start."""
+    back = backward_costs(*EDGES[:4], EDGES[4], N_NODES, N_BINS, 0)
+
+    assert back[2, 2] == 1
+    assert back[1, 1] == 2
+    assert back[0, 0] == 3
+    assert np.isinf(back[2, 4])
+    assert np.isinf(back[2, 3])
+    assert all(back[0, 1:] == 0)
+
+
+def test_prune_edges():
+    """Only the edges of paths from the start and back to it are kept."""
+    keep, stats = prune_edges(tuple(EDGES), EDGES[4], N_NODES, N_BINS, 0)
+
+    assert keep.tolist() == [True, True, True, True, True,
+                             True, False, False, False, False]
+    assert stats == {"candidate_edges": 10, "unreachable": 3,
+                     "dead_ends": 1, "dominated": 0, "removed": 4}
+
+
+def test_prune_edges_by_bound():
+    """With a bound, the edges only on costlier paths are dominated."""
+    keep, stats = prune_edges(tuple(EDGES), EDGES[4], N_NODES, N_BINS, 0,
+                              upper_bound=3)
+
+    assert keep.tolist() == [True, False, True, True, False,
+                             False, False, False, False, False]
+    assert stats["dominated"] == 3
+    assert stats["removed"] == 7
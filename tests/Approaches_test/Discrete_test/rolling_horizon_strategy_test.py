@@ -0,0 +1,70 @@
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.Approaches.Discrete.rolling_horizon_strategy import (
+    RollingHorizonStrategy
+)
+from trafficTSP.Compare.evaluate_strategy import TourEvaluator
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph using a deterministic seed."""
+    random.seed(42)
+    return create_graph(n_nodes=12)
+
+
+def test_window_nodes(fixed_graph):
+    """A window keeps the planned visits among the nearest nodes left."""
+    strategy = RollingHorizonStrategy(fixed_graph, window_size=4)
+    nodes_left = set(range(1, 12))
+    window = strategy.window_nodes(0, nodes_left, plan=[])
+
+    by_distance = sorted(nodes_left,
+                         key=lambda node: fixed_graph.distances[0, node])
+    nearest = by_distance[:4]
+    assert window[0] == 0
+    assert sorted(window[1:]) == sorted(nearest)
+
+    # The farthest node is not in the window, even if planned
+    plan = [nearest[2], by_distance[-1], nearest[0]]
+    window = strategy.window_nodes(0, nodes_left, plan)
+    assert window[1:3] == [nearest[2], nearest[0]]
+    assert sorted(window[1:]) == sorted(nearest)
+
+
+def test_solve_window_not_worse_than_hint(fixed_graph):
+    """The order of a window reaches its last node no later than the hint."""
+    strategy = RollingHorizonStrategy(fixed_graph)
+    strategy.solve_stats = {"solver_wall_time": 0.0}
+    nodes = [0, 4, 7, 2, 9, 5]
+    order = strategy.solve_window(nodes, t=50.0)
+
+    subgraph = fixed_graph.subgraph(nodes, 50.0)
+    local = [nodes.index(node) for node in order]
+    assert order[0] == 0
+    assert sorted(order) == sorted(nodes)
+    assert (TourEvaluator(subgraph, local).departure_times[-2] <=
+            TourEvaluator(subgraph, range(6)).departure_times[-2] + 1e-9)
+
+
+@pytest.mark.parametrize("window_size, commit_size", [(4, 1), (6, 2),
+                                                      (5, 5)])
+def test_solution_is_tour(fixed_graph, window_size, commit_size):
+    """The solution visits every node once, from start_node."""
+    strategy = RollingHorizonStrategy(fixed_graph, start_node=3,
+                                      window_size=window_size,
+                                      commit_size=commit_size)
+    solution = strategy.solve()
+
+    assert solution[0] == 3
+    assert sorted(solution) == list(range(12))
+    assert strategy.solve_stats["n_windows"] >= 11 // window_size
+
+
+def test_commit_size_checked(fixed_graph):
+    """At least one visit and at most a window are committed."""
+    for commit_size in [0, 7]:
+        with pytest.raises(ValueError):
+            RollingHorizonStrategy(fixed_graph, window_size=6,
+                                   commit_size=commit_size)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.CreateProblems.time_dependent_graph import TimeDependentGraph
+from trafficTSP.Approaches.Discrete.time_bins import (
+    uniform_bin_times,
+    adaptive_bin_times
+)
+from trafficTSP.Approaches.Discrete.discrete_strategy import DiscreteStrategy
+
+
+@pytest.fixture
+def one_disruption_graph():
+    """Two nodes whose edges have a single wide disruption at t=100."""
+    means = np.full((2, 2, 1), 100.0)
+    maxima = np.array([[[0.0], [0.05]], [[0.05], [0.0]]])
+    return TimeDependentGraph([(0, 0), (3, 4)], means, maxima, (0, 480))
+
+
+def test_uniform_bin_times():
+    """Uniform bins are evenly spaced across the time range."""
+    times = uniform_bin_times((0, 480), 5)
+    assert times.tolist() == [0, 120, 240, 360, 480]
+
+
+def test_adaptive_bin_times_range(one_disruption_graph):
+    """Adaptive bins are increasing and cover the whole time range."""
+    times = adaptive_bin_times(one_disruption_graph, 20)
+
+    assert len(times) == 20
+    assert times[0] == 0 and times[-1] == 480
+    assert (np.diff(times) > 0).all()
+
+
+def test_adaptive_bins_around_disruptions(one_disruption_graph):
+    """Adaptive bins are closer together around the disruption."""
+    times = adaptive_bin_times(one_disruption_graph, 20)
+    uniform = uniform_bin_times((0, 480), 20)
+
+    def bins_near_disruption(bin_times):
+        return np.sum(np.abs(bin_times - 100) < 20)
+
+    assert bins_near_disruption(times) > bins_near_disruption(uniform)
+
+
+def test_adaptive_bins_horizon(one_disruption_graph):
+    """With a horizon only the last bin is placed after it."""
+    times = adaptive_bin_times(one_disruption_graph, 10, horizon=200)
+
+    assert times[-1] == 480
+    assert (times[:-1] <= 200).all()
+
+
+def test_adaptive_bins_need_time_dependent_graph():
+    """Adaptive bins need the disruptions stored in the graph."""
+    random.seed(0)
+    graph = dict(create_graph(3).items())
+    with pytest.raises(TypeError):
+        adaptive_bin_times(graph, 10)
+
+
+def test_discrete_strategy_adaptive():
+    """The discrete strategy finds a valid tour with adaptive bins."""
+    random.seed(42)
+    graph = create_graph(n_nodes=5)
+    strategy = DiscreteStrategy(graph, n_bins=15, discretisation="adaptive")
+    solution = strategy.solve()
+
+    assert len(strategy.bin_times) == 15
+    assert solution[0] == 0
+    assert sorted(solution) == list(range(5))
+    for edge, travel_time in strategy.travel_times.items():
+        assert edge.end_step > edge.start_step
+        assert travel_time == pytest.approx(
+            graph[(edge.start_node, edge.end_node)](
+                strategy.bin_times[edge.start_step]
+            )
+        )
+
+
+def test_unknown_discretisation():
+    """An unknown discretisation raises a ValueError."""
+    graph = create_graph(n_nodes=3)
+    with pytest.raises(ValueError):
+        DiscreteStrategy(graph, discretisation="random")
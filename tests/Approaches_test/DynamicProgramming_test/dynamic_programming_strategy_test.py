@@ -0,0 +1,79 @@
+import itertools
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.DynamicProgramming.dynamic_programming_strategy \
+    import DynamicProgrammingStrategy
+
+
+def enumeration_cost(graph, start_node=0):
+    """Returns the weight of the best tour, trying all of them."""
+    others = [node for node in range(graph['n_nodes'])
+              if node != start_node]
+    return min(evaluate_solution(graph, [start_node] + list(permutation))
+               for permutation in itertools.permutations(others))
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("prune", [True, False])
+def test_dynamic_programming_is_optimal(seed, prune):
+    """The solution is as good as the best tour found by enumeration."""
+    random.seed(seed)
+    graph = create_graph(n_nodes=6)
+    solution = DynamicProgrammingStrategy(graph, prune=prune).solve()
+
+    assert solution[0] == 0
+    assert sorted(solution) == list(range(6))
+    assert evaluate_solution(graph, solution) == pytest.approx(
+        enumeration_cost(graph)
+    )
+
+
+def test_dynamic_programming_start_node():
+    """Tours start at start_node."""
+    random.seed(3)
+    graph = create_graph(n_nodes=5)
+    solution = DynamicProgrammingStrategy(graph, start_node=2).solve()
+
+    assert solution[0] == 2
+    assert sorted(solution) == list(range(5))
+    assert evaluate_solution(graph, solution) == pytest.approx(
+        enumeration_cost(graph, start_node=2)
+    )
+
+
+def test_dynamic_programming_pruning():
+    """Pruning drops states without changing the solution."""
+    random.seed(4)
+    graph = create_graph(n_nodes=11)
+    pruned = DynamicProgrammingStrategy(graph)
+    full = DynamicProgrammingStrategy(graph, prune=False)
+    solution = pruned.solve()
+
+    assert solution == full.solve()
+    assert pruned.solve_stats["dp_pruned"] > 0
+    assert full.solve_stats["dp_pruned"] == 0
+    assert pruned.solve_stats["dp_states"] < full.solve_stats["dp_states"]
+    assert evaluate_solution(graph, solution) <= evaluate_solution(
+        graph, GreedyStrategy(graph).solve()
+    )
+
+
+@pytest.mark.parametrize("n_nodes", [1, 2])
+def test_dynamic_programming_small_graphs(n_nodes):
+    """Graphs with one or two nodes have a single tour."""
+    random.seed(0)
+    graph = create_graph(n_nodes=n_nodes)
+
+    assert DynamicProgrammingStrategy(graph).solve() == list(range(n_nodes))
+
+
+def test_dynamic_programming_too_many_nodes():
+    """Graphs over max_nodes are rejected."""
+    random.seed(0)
+    graph = create_graph(n_nodes=6)
+
+    with pytest.raises(ValueError):
+        DynamicProgrammingStrategy(graph, max_nodes=5)
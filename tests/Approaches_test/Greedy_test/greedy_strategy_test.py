@@ -44,3 +44,14 @@ def test_greedy_strategy_output(fixed_graph):
     assert solution == [0, 3, 2, 1], (
         "The solution should be "
     )
+
+
+def test_greedy_strategy_candidates(fixed_graph):
+    """Candidate lists restrict the choice but give a valid tour."""
+    n_nodes = fixed_graph['n_nodes']
+    all_candidates = GreedyStrategy(fixed_graph,
+                                    n_candidates=n_nodes - 1).solve()
+    solution = GreedyStrategy(fixed_graph, n_candidates=1).solve()
+
+    assert all_candidates == GreedyStrategy(fixed_graph).solve()
+    assert sorted(solution) == list(range(n_nodes))
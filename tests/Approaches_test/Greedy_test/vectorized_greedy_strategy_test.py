@@ -0,0 +1,73 @@
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.Greedy.vectorized_greedy_strategy import (
+    VectorizedGreedyStrategy
+)
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph for testing."""
+    random.seed(42)
+    return create_graph(n_nodes=15)
+
+
+@pytest.mark.parametrize("start_node", [0, 4])
+def test_vectorized_greedy_matches_greedy(fixed_graph, start_node):
+    """A single run builds the same tour as GreedyStrategy."""
+    solution = VectorizedGreedyStrategy(fixed_graph, start_node).solve()
+
+    assert solution == GreedyStrategy(fixed_graph, start_node).solve()
+
+
+@pytest.mark.parametrize("options", [{"all_starts": True},
+                                     {"k_best": 3, "n_runs": 10, "seed": 0},
+                                     {"all_starts": True, "k_best": 2,
+                                      "n_runs": 3, "seed": 1}])
+def test_vectorized_greedy_batches(fixed_graph, options):
+    """Batched runs give valid tours no worse than a single greedy run."""
+    solution = VectorizedGreedyStrategy(fixed_graph, start_node=2,
+                                        **options).solve()
+
+    assert solution[0] == 2
+    assert sorted(solution) == list(range(15))
+    assert evaluate_solution(fixed_graph, solution) <= evaluate_solution(
+        fixed_graph, GreedyStrategy(fixed_graph, start_node=2).solve()
+    )
+
+
+def test_vectorized_greedy_seed(fixed_graph):
+    """Randomised runs are reproducible with a seed."""
+    def solve(seed):
+        return VectorizedGreedyStrategy(fixed_graph, k_best=3, n_runs=5,
+                                        seed=seed).solve()
+
+    assert solve(3) == solve(3)
+
+
+def test_vectorized_greedy_plain_dict():
+    """Graphs without vectorized evaluation are evaluated edge by edge."""
+    random.seed(0)
+    graph = create_graph(n_nodes=6)
+    plain_graph = dict(graph.items())
+
+    assert VectorizedGreedyStrategy(plain_graph).solve() == (
+        GreedyStrategy(graph).solve()
+    )
+
+
+@pytest.mark.parametrize("options", [{},
+                                     {"all_starts": True},
+                                     {"k_best": 3, "n_runs": 5, "seed": 0}])
+def test_vectorized_greedy_candidates(fixed_graph, options):
+    """Candidate lists give valid tours, as the scalar greedy does."""
+    solution = VectorizedGreedyStrategy(fixed_graph, n_candidates=2,
+                                        **options).solve()
+
+    assert sorted(solution) == list(range(15))
+    if not options:
+        assert solution == GreedyStrategy(fixed_graph,
+                                          n_candidates=2).solve()
@@ -0,0 +1,89 @@
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.Random.random_strategy import RandomStrategy
+from trafficTSP.Approaches.LocalSearch.local_search_strategy import (
+    LocalSearchStrategy,
+    or_opt_permutations,
+    swap_permutations,
+    two_opt_permutations
+)
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph using a deterministic seed."""
+    random.seed(42)
+    return create_graph(n_nodes=12)
+
+
+@pytest.mark.parametrize("permutations", [
+    two_opt_permutations(6),
+    swap_permutations(6),
+    or_opt_permutations(6, 1),
+    or_opt_permutations(6, 2),
+    or_opt_permutations(6, 3)
+])
+def test_moves_are_permutations(permutations):
+    """Every move is a permutation that changes the first node."""
+    for permutation in permutations:
+        assert sorted(permutation) == list(range(6))
+        assert permutation[0] != 0
+
+
+def test_moves():
+    """Check some moves against their definition."""
+    assert two_opt_permutations(4).tolist() == [[1, 0, 2, 3],
+                                                [2, 1, 0, 3],
+                                                [3, 2, 1, 0]]
+    assert [3, 1, 2, 0] in swap_permutations(4).tolist()
+    # Move the segment [0, 1] after node 3, and [2, 3] to the front
+    assert [2, 3, 0, 1, 4] in or_opt_permutations(5, 2).tolist()
+    assert [3, 4, 0, 1, 2] in or_opt_permutations(5, 2).tolist()
+
+
+@pytest.mark.parametrize("initial_strategy", [GreedyStrategy,
+                                              RandomStrategy])
+def test_local_search_improves(fixed_graph, initial_strategy):
+    """The local search returns a valid tour no worse than its start."""
+    random.seed(0)
+    strategy = LocalSearchStrategy(fixed_graph,
+                                   initial_strategy=initial_strategy)
+    initial_cost = evaluate_solution(fixed_graph, strategy.initial_tour())
+    random.seed(0)
+    solution = strategy.solve()
+
+    assert solution[0] == 0
+    assert sorted(solution) == list(range(12))
+    assert evaluate_solution(fixed_graph, solution) <= initial_cost
+
+
+def test_local_search_beats_greedy(fixed_graph):
+    """On this graph the local search finds a better tour than greedy."""
+    solution = LocalSearchStrategy(fixed_graph).solve()
+    greedy_solution = GreedyStrategy(fixed_graph).solve()
+
+    assert (evaluate_solution(fixed_graph, solution) <
+            evaluate_solution(fixed_graph, greedy_solution))
+
+
+@pytest.mark.parametrize("n_nodes", [1, 2, 3])
+def test_local_search_small_graphs(n_nodes):
+    """Edge case: graphs too small for most moves."""
+    graph = create_graph(n_nodes)
+    solution = LocalSearchStrategy(graph).solve()
+
+    assert sorted(solution) == list(range(n_nodes))
+    assert solution[0] == 0
+
+
+def test_local_search_candidates(fixed_graph):
+    """Moves restricted to candidate lists still improve the tour."""
+    greedy_cost = evaluate_solution(fixed_graph,
+                                    GreedyStrategy(fixed_graph).solve())
+    solution = LocalSearchStrategy(fixed_graph, n_candidates=4).solve()
+
+    assert sorted(solution) == list(range(fixed_graph['n_nodes']))
+    assert evaluate_solution(fixed_graph, solution) <= greedy_cost
@@ -0,0 +1,16 @@
+import pytest
+from trafficTSP.Approaches.registry import STRATEGIES, load_strategy
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+
+
+def test_load_strategy():
+    """Registered strategies are imported by name."""
+    assert load_strategy("Greedy") is GreedyStrategy
+    for name in STRATEGIES:
+        assert callable(load_strategy(name))
+
+
+def test_load_unknown_strategy():
+    """Unknown names are rejected."""
+    with pytest.raises(ValueError):
+        load_strategy("Quantum")
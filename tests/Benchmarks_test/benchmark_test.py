@@ -0,0 +1,84 @@
+import json
+import os
+import pytest
+from trafficTSP.Benchmarks.benchmark import (
+    STAGES,
+    default_baseline_location,
+    compare_to_baseline,
+    load_benchmarks,
+    main,
+    run_benchmarks,
+    save_benchmarks,
+    summarise
+)
+
+
+def test_summarise():
+    """Summaries have the median, percentiles and extremes."""
+    summary = summarise([3.0, 1.0, 2.0, 5.0, 4.0])
+
+    assert summary["median"] == 3.0
+    assert summary["min"] == 1.0
+    assert summary["max"] == 5.0
+    assert summary["p10"] == pytest.approx(1.4)
+    assert summary["p90"] == pytest.approx(4.6)
+    assert summary["n"] == 5
+
+
+def test_run_benchmarks():
+    """Every stage and size is timed on every seed."""
+    stages = {"greedy": ((4, 5), *STAGES["greedy"][1:]),
+              "evaluate": ((4,), *STAGES["evaluate"][1:])}
+    benchmarks = run_benchmarks(stages, seeds=(0, 1), repeat=2)
+
+    assert set(benchmarks["results"]) == {"greedy/4", "greedy/5",
+                                          "evaluate/4"}
+    assert all(summary["n"] == 4 and summary["median"] > 0
+               for summary in benchmarks["results"].values())
+    json.dumps(benchmarks)
+
+
+def test_compare_to_baseline():
+    """Only medians slower than the threshold are regressions."""
+    def benchmarks(medians):
+        return {"results": {name: {"median": median}
+                            for name, median in medians.items()}}
+    baseline = benchmarks({"a/10": 1.0, "b/10": 1.0, "c/10": 0.0})
+    current = benchmarks({"a/10": 1.2, "b/10": 1.5, "c/10": 1.0,
+                          "d/10": 9.0})
+
+    regressions = compare_to_baseline(current, baseline, threshold=0.25)
+
+    assert [regression["benchmark"] for regression in regressions] == [
+        "b/10"
+    ]
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
+
+
+def test_main_baseline(tmp_path):
+    """The command line stores a baseline and compares with it."""
+    output = str(tmp_path / "benchmarks.json")
+    baseline = str(tmp_path / "baseline.json")
+    arguments = ["--stages", "evaluate", "--repeat", "1",
+                 "--output", output, "--baseline", baseline]
+
+    assert main(arguments + ["--save_baseline"]) == 0
+    assert load_benchmarks(baseline) == load_benchmarks(output)
+
+    slow = load_benchmarks(baseline)
+    for summary in slow["results"].values():
+        summary["median"] *= 1e-6
+    save_benchmarks(slow, baseline)
+    assert main(arguments) == 1
+
+
+def test_pinned_baseline():
+    """The committed baseline covers every stage and size."""
+    baseline = load_benchmarks(os.path.join(
+        os.path.dirname(__file__), "..", "..", default_baseline_location
+    ))
+
+    assert set(baseline["results"]) == {f"{name}/{size}"
+                                        for name, (sizes, _, _)
+                                        in STAGES.items()
+                                        for size in sizes}
@@ -0,0 +1,185 @@
+import pickle
+import pytest
+from trafficTSP.CreateProblems.graphs import (
+    InstanceSpec,
+    create_graph_from_spec
+)
+from trafficTSP.Compare.compare_strategies import (
+    instance_specs,
+    iter_instance_specs,
+    parse_shard,
+    run_instance,
+    run_sweep,
+    shard_instances,
+    stream_results
+)
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.Random.random_strategy import RandomStrategy
+
+
+def test_instance_specs_deterministic():
+    """The same seed gives the same instances, other seeds do not."""
+    specs = instance_specs(max_nodes=6, n_repetitions=3, seed=1)
+
+    assert len(specs) == 3 * 3
+    assert [spec.n_nodes for spec in specs] == [3, 3, 3, 4, 4, 4, 5, 5, 5]
+    assert specs == instance_specs(max_nodes=6, n_repetitions=3, seed=1)
+    assert specs != instance_specs(max_nodes=6, n_repetitions=3, seed=2)
+    assert len({spec.seed for spec in specs}) == len(specs)
+
+
+def test_instance_specs_sizes():
+    """Only the given sizes are generated, in the given order."""
+    specs = instance_specs(max_nodes=6, n_repetitions=2, seed=1,
+                           sizes=[7, 4])
+
+    assert [spec.n_nodes for spec in specs] == [7, 7, 4, 4]
+
+
+def test_parse_shard():
+    """Shards are written as i/N with 0 <= i < N."""
+    assert parse_shard("0/3") == (0, 3)
+    assert parse_shard("2/3") == (2, 3)
+    for shard in ["3/3", "-1/3", "1", "a/b", "1/2/3"]:
+        with pytest.raises(ValueError):
+            parse_shard(shard)
+
+
+def test_shards_split_the_sweep():
+    """The shards of a sweep are disjoint and together are the sweep."""
+    specs = instance_specs(max_nodes=8, n_repetitions=3, seed=2)
+    shards = [list(shard_instances(
+        iter_instance_specs(max_nodes=8, n_repetitions=3, seed=2),
+        (index, 4)
+    )) for index in range(4)]
+
+    assert sorted(sum(shards, [])) == sorted(specs)
+    assert len(set(sum(shards, []))) == len(specs)
+    assert all(shard for shard in shards)
+
+
+def test_sharded_sweep_matches_full_sweep():
+    """Running every shard gives the results of the whole sweep."""
+    strategies = {"Greedy": GreedyStrategy}
+    full = run_sweep(strategies, max_nodes=6, n_repetitions=2, seed=3)
+    shards = [run_sweep(strategies, max_nodes=6, n_repetitions=2, seed=3,
+                        shard=(index, 2))
+              for index in range(2)]
+
+    def key(row):
+        return row["n_nodes"], row["seed"], row["cost"]
+
+    assert (sorted(key(row) for row in full) ==
+            sorted(key(row) for shard in shards for row in shard))
+
+
+def test_stream_results_is_lazy():
+    """Instances are only read while their results are being produced."""
+    read = []
+
+    def instances():
+        for spec in instance_specs(max_nodes=8, n_repetitions=2, seed=1):
+            read.append(spec)
+            yield spec
+
+    stream = stream_results(instances(), {"Greedy": GreedyStrategy},
+                            workers=2, max_in_flight=2)
+    instance, results = next(stream)
+    stream.close()
+
+    assert instance in read
+    assert results[0]["seed"] == instance.seed
+    assert len(read) == 2
+
+
+def test_sweep_without_keeping_results(tmp_path):
+    """Without keep_results, the results only go to the writer."""
+    from trafficTSP.Compare.results_writer import ResultsWriter
+
+    db_name = str(tmp_path / "results.db")
+    with ResultsWriter(db_name, "run") as writer:
+        results = run_sweep({"Greedy": GreedyStrategy}, max_nodes=5,
+                            n_repetitions=2, writer=writer,
+                            keep_results=False)
+
+    assert results == []
+    assert len(writer.completed()) == 2 * 4
+
+
+def test_graph_from_spec_is_reproducible():
+    """A spec can be pickled and always rebuilds the same graph."""
+    spec = pickle.loads(pickle.dumps(InstanceSpec(5, 1234)))
+    graph_1 = create_graph_from_spec(spec)
+    graph_2 = create_graph_from_spec(spec)
+
+    assert (graph_1.nodes == graph_2.nodes).all()
+    assert (graph_1.means == graph_2.means).all()
+    assert (graph_1.maxima == graph_2.maxima).all()
+
+
+def test_run_instance():
+    """Every strategy gets a result row for the instance."""
+    results = run_instance(InstanceSpec(4, 7), {"Greedy": GreedyStrategy,
+                                                "Random": RandomStrategy})
+
+    assert [row["strategy"] for row in results] == ["Greedy", "Random"]
+    assert all(row["n_nodes"] == 4 and row["seed"] == 7 for row in results)
+    assert all(row["cost"] > 0 for row in results)
+
+
+def test_parallel_sweep_matches_sequential():
+    """The results do not depend on the number of workers."""
+    strategies = {"Greedy": GreedyStrategy, "Random": RandomStrategy}
+    sequential = run_sweep(strategies, max_nodes=6, n_repetitions=2,
+                           workers=1, seed=3)
+    parallel = run_sweep(strategies, max_nodes=6, n_repetitions=2,
+                         workers=2, seed=3)
+
+    def key(row):
+        return row["strategy"], row["n_nodes"], row["seed"], row["cost"]
+
+    # Parallel results arrive as instances are solved
+    assert (sorted(key(row) for row in sequential) ==
+            sorted(key(row) for row in parallel))
+
+
+def test_sweep_on_instance_set(tmp_path):
+    """Runs on a stored set use the same instances every time."""
+    instances_db = str(tmp_path / "instances.db")
+    first = run_sweep({"Greedy": GreedyStrategy}, max_nodes=5,
+                      n_repetitions=2, seed=4,
+                      instance_set="test", instances_db=instances_db)
+    # A different seed does not matter once the set exists
+    second = run_sweep({"Random": RandomStrategy}, max_nodes=5,
+                       n_repetitions=2, seed=5,
+                       instance_set="test", instances_db=instances_db)
+
+    assert len(first) == len(second) == 4
+    assert ([row["instance_id"] for row in first] ==
+            [row["instance_id"] for row in second])
+
+
+def test_run_instance_with_cache():
+    """With a cache, hits and misses are recorded for every strategy."""
+    strategies = {"Greedy": GreedyStrategy, "Greedy again": GreedyStrategy}
+    results = run_instance(InstanceSpec(5, 7), strategies, cache_size=1000)
+    uncached = run_instance(InstanceSpec(5, 7), strategies)
+
+    assert results[0]["cache_misses"] > 0
+    assert results[1]["cache_misses"] == 0
+    assert results[1]["cache_hits"] > 0
+    assert results[0]["cost"] == pytest.approx(uncached[0]["cost"])
+
+
+def test_run_instance_stages(tmp_path):
+    """Stages reported by the strategies become result columns."""
+    results = run_instance(InstanceSpec(5, 7), {"Greedy": GreedyStrategy},
+                           profile="tracemalloc")
+
+    assert {"stage_build", "stage_solve", "stage_evaluate",
+            "peak_memory"} <= results[0].keys()
+    assert results[0]["stage_solve"] <= results[0]["time_taken"]
+
+    results = run_instance(InstanceSpec(5, 7), {"Greedy": GreedyStrategy},
+                           profile="cprofile", profile_dir=str(tmp_path))
+    assert results[0]["profile_file"].startswith(str(tmp_path))
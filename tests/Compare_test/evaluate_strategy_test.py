@@ -3,8 +3,12 @@ import pytest
 import random
 from trafficTSP.CreateProblems.graphs import create_graph
 from trafficTSP.Compare.evaluate_strategy import (
+    TourEvaluator,
     evaluate_solution,
-    evaluate_strategy
+    evaluate_solutions,
+    evaluate_strategy,
+    evaluate_suffixes,
+    run_strategy
 )
 from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
 
@@ -64,3 +68,94 @@ def test_evaluate_strategy(fixed_graph):
     assert total_weight == np.float64(13.661218871595167), (
         "Total weight should be 13.661218871595167"
     )
+
+
+# ---- Test Run Strategy ---- #
+
+
+def test_run_strategy(fixed_graph):
+    """run_strategy returns the cost and the statistics of the strategy."""
+    class StrategyWithStats(GreedyStrategy):
+        def solve(self):
+            self.solve_stats = {"solver_n_solutions": 1}
+            return super().solve()
+
+    run = run_strategy(fixed_graph, StrategyWithStats)
+
+    assert run["cost"] == evaluate_strategy(fixed_graph, GreedyStrategy)
+    assert run["solver_n_solutions"] == 1
+    assert run_strategy(fixed_graph, GreedyStrategy).keys() == {"cost"}
+
+
+# ---- Test Batch and Incremental Evaluation ---- #
+
+
+@pytest.fixture
+def larger_graph():
+    """Creates a fixed random graph with 12 nodes."""
+    random.seed(7)
+    return create_graph(n_nodes=12)
+
+
+def test_evaluate_suffixes(larger_graph):
+    """Batch evaluation of suffixes matches evaluate_solution."""
+    tours = np.array([random.sample(range(1, 12), 11) for _ in range(5)])
+    costs = evaluate_suffixes(larger_graph, 0, 0, tours, 0)
+
+    for tour, cost in zip(tours, costs):
+        assert cost == pytest.approx(
+            evaluate_solution(larger_graph, [0] + tour.tolist())
+        )
+
+
+def test_evaluate_solutions(larger_graph):
+    """Batch evaluation of whole solutions matches evaluate_solution."""
+    solutions = np.array([random.sample(range(12), 12) for _ in range(5)])
+    weights = evaluate_solutions(larger_graph, solutions)
+
+    for solution, weight in zip(solutions, weights):
+        assert weight == pytest.approx(
+            evaluate_solution(larger_graph, solution.tolist())
+        )
+    assert evaluate_solutions(larger_graph, [[0], [3]]).tolist() == [0, 0]
+
+
+def test_tour_evaluator(larger_graph):
+    """Incremental evaluation matches evaluating the whole path again."""
+    solution = list(range(12))
+    evaluator = TourEvaluator(larger_graph, solution)
+    assert evaluator.total_weight == pytest.approx(
+        evaluate_solution(larger_graph, solution)
+    )
+    assert evaluator.weights().sum() == pytest.approx(
+        evaluator.total_weight
+    )
+
+    for position in [1, 4, 10]:
+        suffix = solution[position:][::-1]
+        new_solution = solution[:position] + suffix
+        expected = evaluate_solution(larger_graph, new_solution)
+        assert evaluator.evaluate_change(suffix, position) == (
+            pytest.approx(expected)
+        )
+        evaluator.apply_change(suffix, position)
+        solution = new_solution
+        assert evaluator.solution.tolist() == solution
+        assert evaluator.total_weight == pytest.approx(expected)
+
+    assert TourEvaluator(larger_graph, [5]).total_weight == 0
+
+
+def test_tour_evaluator_whole_path(larger_graph):
+    """A change from position 0 replaces the whole path."""
+    evaluator = TourEvaluator(larger_graph, list(range(12)))
+    new_solution = list(range(12))[::-1]
+    expected = evaluate_solution(larger_graph, new_solution)
+
+    assert evaluator.evaluate_change(new_solution, 0) == (
+        pytest.approx(expected)
+    )
+    evaluator.apply_change(new_solution, 0)
+    assert evaluator.total_weight == pytest.approx(expected)
+    with pytest.raises(ValueError):
+        evaluator.evaluate_change(new_solution, -1)
@@ -0,0 +1,23 @@
+import os
+import matplotlib
+from trafficTSP.Compare.results_writer import save_results_to_sql
+from trafficTSP.Compare.plot_results import visualise_results
+
+
+def test_visualise_results_headless(tmp_path, monkeypatch):
+    """Plots are saved to files without a display."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("results")
+    db_name = str(tmp_path / "results.db")
+    results = [{"strategy": strategy, "n_nodes": n_nodes, "seed": seed,
+                "cost": cost, "time_taken": 0.1}
+               for n_nodes in (3, 4)
+               for seed in (1, 2)
+               for strategy, cost in (("Greedy", 12.0), ("Discrete", 10.0))]
+    save_results_to_sql(results, db_name, run_id="run")
+
+    visualise_results("plot.png", db_name, run_id="run")
+
+    assert matplotlib.get_backend().lower() == "agg"
+    assert os.path.exists("results\\plot.png")
+    assert os.path.exists("results\\improvement_Greedy_to_Discrete.png")
@@ -0,0 +1,63 @@
+import os
+import pstats
+import pytest
+from trafficTSP.Compare.profiling import (
+    StageTimer,
+    profile_task,
+    record_stages,
+    stage
+)
+
+
+def test_stage_timer():
+    """Stages add up their time, and nested stages are inclusive."""
+    timer = StageTimer()
+    with timer.stage("outer"):
+        with timer.stage("inner"):
+            sum(range(10000))
+    with timer.stage("inner"):
+        pass
+
+    assert set(timer.durations) == {"outer", "inner"}
+    assert timer.durations["outer"] > 0
+    assert set(timer.columns()) == {"stage_outer", "stage_inner"}
+
+
+def test_record_stages():
+    """Stages are recorded only inside record_stages."""
+    with stage("ignored"):
+        pass
+    with record_stages() as timer:
+        with stage("recorded"):
+            pass
+        with record_stages() as inner_timer:
+            with stage("inner"):
+                pass
+    with stage("ignored"):
+        pass
+
+    assert set(timer.durations) == {"recorded"}
+    assert set(inner_timer.durations) == {"inner"}
+
+
+def test_profile_task(tmp_path):
+    """Profiles are saved to a file or give the peak memory."""
+    file_name = str(tmp_path / "profiles" / "task.prof")
+    with profile_task("cprofile", file_name) as profile:
+        sorted(range(1000), reverse=True)
+    assert profile == {"profile_file": file_name}
+    assert os.path.exists(file_name)
+    pstats.Stats(file_name)
+
+    with profile_task("tracemalloc") as profile:
+        data = list(range(100000))
+    assert profile["peak_memory"] > 0
+    del data
+
+    with profile_task() as profile:
+        pass
+    assert profile == {}
+
+    with pytest.raises(ValueError):
+        with profile_task("perf"):
+            pass
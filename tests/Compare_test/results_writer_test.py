@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from trafficTSP.Compare.results_writer import (
+    ResultsWriter,
+    completed_results,
+    merge_results,
+    save_results_to_sql
+)
+from trafficTSP.Compare.compare_strategies import run_sweep
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.Random.random_strategy import RandomStrategy
+
+
+@pytest.fixture
+def db_name(tmp_path):
+    """Path of an empty results database."""
+    return str(tmp_path / "results.db")
+
+
+def read_results(db_name):
+    """Returns the results table as a DataFrame."""
+    engine = create_engine(f"sqlite:///{db_name}")
+    return pd.read_sql("SELECT * FROM results", con=engine)
+
+
+def test_save_results_appends(db_name):
+    """Saving twice keeps both runs."""
+    row = {"strategy": "Greedy", "n_nodes": 3, "cost": 1.0}
+    save_results_to_sql([row], db_name, run_id="a")
+    save_results_to_sql([row, row], db_name, run_id="b")
+
+    results = read_results(db_name)
+    assert list(results["run_id"]) == ["a", "b", "b"]
+
+
+def test_save_results_new_columns(db_name):
+    """Tables written without some columns can still be appended to."""
+    save_results_to_sql([{"strategy": "Greedy", "n_nodes": 3}], db_name,
+                        run_id="a")
+    save_results_to_sql([{"strategy": "Greedy", "n_nodes": 3,
+                          "cost": 2.0}], db_name, run_id="b")
+
+    results = read_results(db_name)
+    assert results["cost"].isnull().tolist() == [True, False]
+
+
+def test_writer_batches(db_name):
+    """The writer saves full batches and the rest when it is closed."""
+    row = {"strategy": "Greedy", "n_nodes": 3, "cost": 1.0}
+    with ResultsWriter(db_name, run_id="a", batch_size=2) as writer:
+        writer.add([row])
+        writer.add([row])
+        assert len(read_results(db_name)) == 2
+        writer.add([row])
+    assert len(read_results(db_name)) == 3
+
+
+def test_resume_skips_completed(db_name):
+    """Resuming a run only solves the pairs without results."""
+    strategies = {"Greedy": GreedyStrategy}
+    with ResultsWriter(db_name, run_id="run") as writer:
+        first = run_sweep(strategies, max_nodes=5, n_repetitions=2,
+                          writer=writer)
+    assert len(first) == 4
+
+    strategies["Random"] = RandomStrategy
+    with ResultsWriter(db_name, run_id="run") as writer:
+        second = run_sweep(strategies, max_nodes=5, n_repetitions=2,
+                           writer=writer, resume=True)
+    assert [row["strategy"] for row in second] == ["Random"] * 4
+
+    completed = completed_results(db_name, "run")
+    for row in first + second:
+        assert (row["instance_id"], row["strategy"]) in completed
+        assert (row["seed"], row["strategy"]) in completed
+
+
+def test_merge_shards(tmp_path, db_name):
+    """Merging the databases of the shards gives the whole sweep once."""
+    strategies = {"Greedy": GreedyStrategy}
+    shard_dbs = [str(tmp_path / f"shard_{index}.db") for index in range(2)]
+    for index, shard_db in enumerate(shard_dbs):
+        with ResultsWriter(shard_db, "sweep") as writer:
+            run_sweep(strategies, max_nodes=6, n_repetitions=2, seed=1,
+                      writer=writer, shard=(index, 2))
+
+    assert merge_results(shard_dbs, db_name, chunk_size=3) == 6
+    # Merging again adds nothing
+    assert merge_results(shard_dbs, db_name) == 0
+
+    merged = read_results(db_name)
+    full = run_sweep(strategies, max_nodes=6, n_repetitions=2, seed=1)
+    assert set(merged["run_id"]) == {"sweep"}
+    assert sorted(merged["instance_id"]) == sorted(row["instance_id"]
+                                                   for row in full)
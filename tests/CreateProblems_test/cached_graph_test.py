@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.CreateProblems.cached_graph import CachedGraph
+from trafficTSP.Compare.evaluate_strategy import evaluate_strategy
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph using a deterministic seed."""
+    random.seed(42)
+    return create_graph(n_nodes=4)
+
+
+def test_cached_graph_structure(fixed_graph):
+    """A cached graph has the same keys as the wrapped graph."""
+    graph = CachedGraph(fixed_graph)
+
+    assert graph['n_nodes'] == 4
+    assert graph['time_range'] == fixed_graph['time_range']
+    assert list(graph) == list(fixed_graph)
+    assert len(graph) == len(fixed_graph)
+    assert np.array_equal(graph.distances, fixed_graph.distances)
+    with pytest.raises(KeyError):
+        graph[(1, 1)]
+
+
+def test_cached_weights(fixed_graph):
+    """Cached weights match the graph and are only computed once."""
+    graph = CachedGraph(fixed_graph)
+    for _ in range(3):
+        for t in [0, 10.5, 250]:
+            assert graph[(0, 1)](t) == pytest.approx(fixed_graph[(0, 1)](t))
+
+    info = graph.cache_info()
+    assert info.misses == 3
+    assert info.hits == 6
+
+
+def test_cache_quantises_time(fixed_graph):
+    """Times closer than the resolution share their cached weight."""
+    graph = CachedGraph(fixed_graph, resolution=1e-3)
+    graph[(2, 3)](100.0)
+    graph[(2, 3)](100.0001)
+    assert graph.cache_info().hits == 1
+
+
+def test_cache_is_bounded(fixed_graph):
+    """The cache never holds more than maxsize weights."""
+    graph = CachedGraph(fixed_graph, maxsize=5)
+    for t in range(20):
+        graph[(0, 1)](t)
+    info = graph.cache_info()
+    assert info.currsize == 5
+    assert info.misses == 20
+
+
+def test_strategies_share_cache(fixed_graph):
+    """A second run of a strategy on the same cached graph only hits."""
+    graph = CachedGraph(fixed_graph)
+    cost = evaluate_strategy(graph, GreedyStrategy)
+    misses = graph.cache_info().misses
+
+    assert cost == pytest.approx(evaluate_strategy(fixed_graph,
+                                                   GreedyStrategy))
+    assert evaluate_strategy(graph, GreedyStrategy) == cost
+    assert graph.cache_info().misses == misses
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from trafficTSP.CreateProblems.graphs import (
+    InstanceSpec,
+    create_graph_from_spec
+)
+from trafficTSP.CreateProblems.instance_store import (
+    InstanceStore,
+    instance_id
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Creates an empty instance store in a temporary folder."""
+    return InstanceStore(str(tmp_path / "instances.db"))
+
+
+def test_instance_id_is_content_hash():
+    """The same graph gives the same id, a different graph does not."""
+    graph = create_graph_from_spec(InstanceSpec(5, 1))
+
+    assert instance_id(graph) == instance_id(
+        create_graph_from_spec(InstanceSpec(5, 1))
+    )
+    assert instance_id(graph) != instance_id(
+        create_graph_from_spec(InstanceSpec(5, 2))
+    )
+
+
+def test_add_and_load(store):
+    """A loaded graph is identical to the saved one."""
+    graph = create_graph_from_spec(InstanceSpec(6, 3))
+    graph_id = store.add(graph)
+    loaded = store.load(graph_id)
+
+    assert graph_id == instance_id(graph) == instance_id(loaded)
+    assert loaded.time_range == graph.time_range
+    assert np.array_equal(loaded.distances, graph.distances)
+    assert loaded[(1, 2)](100) == graph[(1, 2)](100)
+
+
+def test_add_twice(store):
+    """Saving the same graph twice keeps a single copy."""
+    graph = create_graph_from_spec(InstanceSpec(4, 3))
+    assert store.add(graph) == store.add(graph)
+
+
+def test_load_missing(store):
+    """Loading an unknown id raises a KeyError."""
+    with pytest.raises(KeyError):
+        store.load("missing")
+
+
+def test_instance_sets(store):
+    """Sets keep their instances in order and can be extended."""
+    specs = [InstanceSpec(n_nodes, seed)
+             for n_nodes, seed in [(3, 1), (4, 2), (5, 3)]]
+    instances = store.create_set("sweep", specs[:2])
+
+    assert [instance.n_nodes for instance in instances] == [3, 4]
+
+    store.create_set("sweep", specs[2:])
+    graph_ids = [graph_id for graph_id, _ in store.iter_set("sweep")]
+
+    assert graph_ids == [instance_id(create_graph_from_spec(spec))
+                         for spec in specs]
+    assert store.set_instances("other") == []
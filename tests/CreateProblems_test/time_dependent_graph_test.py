@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+import random
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.CreateProblems.time_dependent_graph import (
+    TimeDependentGraph,
+    candidate_lists,
+    evaluate_weights
+)
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph using a deterministic seed."""
+    random.seed(42)
+    return create_graph(n_nodes=5)
+
+
+def test_create_graph_returns_time_dependent_graph(fixed_graph):
+    """Ensure create_graph stores the graph in arrays."""
+    assert isinstance(fixed_graph, TimeDependentGraph)
+    assert fixed_graph.nodes.shape == (5, 2)
+    assert fixed_graph.distances.shape == (5, 5)
+    assert fixed_graph.means.shape == (5, 5, 2)
+    assert fixed_graph.maxima.shape == (5, 5, 2)
+
+
+def test_evaluate_matches_edge_functions(fixed_graph):
+    """Ensure the vectorized evaluation matches graph[(i, j)](t)."""
+    times = [0, 17.5, 240, 479.9]
+    for t in times:
+        matrix = fixed_graph.matrix(t)
+        for i in range(5):
+            row = fixed_graph.row(i, t)
+            for j in range(5):
+                expected = 0 if i == j else fixed_graph[(i, j)](t)
+                assert matrix[i, j] == pytest.approx(expected, rel=1e-12)
+                assert row[j] == pytest.approx(expected, rel=1e-12)
+
+
+def test_evaluate_batch(fixed_graph):
+    """Ensure a batch of (edge, t) pairs is evaluated elementwise."""
+    starts = np.array([0, 1, 4, 2])
+    ends = np.array([1, 0, 3, 2])
+    times = np.array([3.0, 100.0, 400.0, 50.0])
+    weights = fixed_graph.evaluate(starts, ends, times)
+
+    assert weights.shape == (4,)
+    for weight, i, j, t in zip(weights, starts, ends, times):
+        expected = 0 if i == j else fixed_graph[(i, j)](t)
+        assert weight == pytest.approx(expected, rel=1e-12)
+
+
+def test_evaluate_weights_dict_graph(fixed_graph):
+    """Ensure evaluate_weights also works with a dictionary graph."""
+    dict_graph = dict(fixed_graph.items())
+    times = np.array([[0.0], [240.0]])
+    weights = evaluate_weights(dict_graph, 0, np.arange(5), times)
+
+    assert weights.shape == (2, 5)
+    assert np.allclose(weights, evaluate_weights(fixed_graph, 0,
+                                                 np.arange(5), times))
+
+
+def test_missing_edges(fixed_graph):
+    """Loops and nodes out of range are not edges of the graph."""
+    with pytest.raises(KeyError):
+        fixed_graph[(1, 1)]
+    with pytest.raises(KeyError):
+        fixed_graph[(0, 5)]
+    assert (0, 1) in fixed_graph
+    assert (2, 2) not in fixed_graph
+
+
+def test_candidate_lists(fixed_graph):
+    """Candidates are the nearest other nodes, nearest first."""
+    candidates = fixed_graph.candidate_lists(3)
+
+    assert candidates.shape == (5, 3)
+    for node in range(5):
+        order = [other for other in np.argsort(fixed_graph.distances[node],
+                                               kind='stable')
+                 if other != node]
+        assert candidates[node].tolist() == order[:3]
+    assert fixed_graph.candidate_lists(10).shape == (5, 4)
+
+
+def test_candidate_lists_by_min_travel_time(fixed_graph):
+    """Minimum travel times are never below the distance."""
+    min_travel_times = fixed_graph.min_travel_times()
+    off_diagonal = ~np.eye(5, dtype=bool)
+
+    assert (min_travel_times[off_diagonal] >=
+            fixed_graph.distances[off_diagonal]).all()
+    candidates = fixed_graph.candidate_lists(2, by="min_travel_time")
+    assert candidates.shape == (5, 2)
+    assert (candidates != np.arange(5)[:, None]).all()
+    with pytest.raises(ValueError):
+        fixed_graph.candidate_lists(2, by="colour")
+
+
+def test_candidate_lists_plain_dict(fixed_graph):
+    """Graphs without distances are ordered by minimum travel time."""
+    plain_graph = dict(fixed_graph.items())
+
+    assert (candidate_lists(plain_graph, 2) ==
+            fixed_graph.candidate_lists(2, by="min_travel_time")).all()
+
+
+def test_subgraph(fixed_graph):
+    """A subgraph has the weights of its nodes, seen from time_offset."""
+    nodes = [3, 0, 4]
+    subgraph = fixed_graph.subgraph(nodes, time_offset=100.0)
+
+    assert subgraph['n_nodes'] == 3
+    assert subgraph['time_range'] == fixed_graph['time_range']
+    assert np.allclose(subgraph.nodes, fixed_graph.nodes[nodes])
+    for i, j in [(0, 1), (1, 2), (2, 0)]:
+        for t in [0.0, 37.5, 250.0]:
+            assert subgraph[(i, j)](t) == pytest.approx(
+                fixed_graph[(nodes[i], nodes[j])](t + 100.0)
+            )
+    assert np.allclose(subgraph.matrix(10.0),
+                       fixed_graph.matrix(110.0)[np.ix_(nodes, nodes)])
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import random
+from trafficTSP.CreateProblems.weight_functions import (
+    gaussian,
+    create_random_weight_function
+)
+from trafficTSP.CreateProblems.weight_kernels import (
+    fast_gaussian,
+    inverse_std_dev,
+    disrupted_weight
+)
+
+# ---- Test Fast Gaussian ---- #
+
+
+@pytest.mark.parametrize("mean, maximum", [(0, 1), (240, 0.3),
+                                           (17.5, 1.9), (479, 0.01)])
+def test_fast_gaussian_matches_gaussian_scalar(mean, maximum):
+    """Ensure the closed form matches the scipy Gaussian for scalar t."""
+    for t in np.linspace(mean - 3, mean + 3, 61):
+        assert fast_gaussian(float(t), mean, maximum) == pytest.approx(
+            gaussian(t, mean, maximum), rel=1e-12, abs=1e-300
+        )
+
+
+def test_fast_gaussian_matches_gaussian_array():
+    """Ensure the closed form matches the scipy Gaussian for array t."""
+    random.seed(0)
+    for _ in range(20):
+        mean = random.uniform(0, 480)
+        maximum = random.uniform(0, 2)
+        t = np.linspace(0, 480, 1001)
+        assert np.allclose(fast_gaussian(t, mean, maximum),
+                           gaussian(t, mean, maximum),
+                           rtol=1e-12, atol=1e-300)
+
+
+def test_fast_gaussian_precomputed_constant():
+    """Ensure a precomputed inverse standard deviation gives the same."""
+    t = np.linspace(230, 250, 41)
+    inv_std_dev = inverse_std_dev(0.7)
+    assert np.array_equal(fast_gaussian(t, 240, 0.7, inv_std_dev),
+                          fast_gaussian(t, 240, 0.7))
+
+
+# ---- Test Disrupted Weight ---- #
+
+
+def test_disrupted_weight_matches_gaussian():
+    """Ensure the weight of an edge matches the scipy reference."""
+    random.seed(1)
+    means = np.array([random.uniform(0, 480) for _ in range(3)])
+    maxima = np.array([random.uniform(0, 2) for _ in range(3)])
+    t = np.concatenate([np.linspace(0, 480, 481), means])
+
+    expected = 5 * np.ones_like(t)
+    for mean, maximum in zip(means, maxima):
+        expected *= 1 + gaussian(t, mean, maximum)
+    weights = disrupted_weight(5, t, means, maxima, inverse_std_dev(maxima))
+
+    assert np.allclose(weights, expected, rtol=1e-12, atol=0)
+
+
+def test_weight_function_scalar_and_array():
+    """Ensure weight functions give the same values for floats and arrays."""
+    random.seed(2)
+    weight_function = create_random_weight_function((0, 0), (3, 4))
+    t = np.linspace(0, 480, 97)
+    weights = weight_function(t)
+
+    for time, weight in zip(t, weights):
+        assert weight_function(float(time)) == pytest.approx(weight,
+                                                             rel=1e-12)
@@ -0,0 +1,106 @@
+import io
+import json
+import random
+import time
+import pytest
+from trafficTSP.CreateProblems.graphs import create_graph
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Service.solve_service import (
+    SolveService,
+    graph_from_json,
+    graph_to_json,
+    serve,
+    solve_request
+)
+
+
+@pytest.fixture
+def fixed_graph():
+    """Creates a fixed random graph for testing."""
+    random.seed(42)
+    return create_graph(n_nodes=6)
+
+
+def test_graph_json_round_trip(fixed_graph):
+    """Instances sent as JSON rebuild the same graph."""
+    graph = graph_from_json(json.loads(json.dumps(graph_to_json(fixed_graph))))
+
+    assert (graph.nodes == fixed_graph.nodes).all()
+    assert (graph.means == fixed_graph.means).all()
+    assert (graph.maxima == fixed_graph.maxima).all()
+    assert graph.time_range == fixed_graph.time_range
+
+
+def test_solve_request(fixed_graph):
+    """Responses have the tour and its cost, or the error."""
+    response = solve_request({"id": 7, "strategy": "Greedy",
+                              "instance": graph_to_json(fixed_graph)})
+
+    assert response["id"] == 7
+    assert response["solution"] == GreedyStrategy(fixed_graph).solve()
+    assert response["cost"] == evaluate_solution(fixed_graph,
+                                                 response["solution"])
+
+    response = solve_request({"id": 8, "strategy": "Unknown",
+                              "instance": graph_to_json(fixed_graph)})
+    assert response["id"] == 8
+    assert response["error"].startswith("ValueError")
+
+
+def test_solve_service(fixed_graph):
+    """Warm workers answer the queued requests."""
+    instance = graph_to_json(fixed_graph)
+    with SolveService(workers=2, strategies=("Greedy",)) as service:
+        futures = [service.submit({"id": i, "strategy": "Greedy",
+                                   "instance": instance})
+                   for i in range(4)]
+        responses = [future.result() for future in futures]
+
+    assert [response["id"] for response in responses] == [0, 1, 2, 3]
+    assert all(response["solution"] == responses[0]["solution"]
+               for response in responses)
+
+
+def test_serve(fixed_graph):
+    """Every JSON line gets a response line, in any order."""
+    instance = graph_to_json(fixed_graph)
+    requests = [json.dumps({"id": 1, "strategy": "Greedy",
+                            "instance": instance}),
+                "",
+                "not json",
+                json.dumps({"id": 2, "strategy": "LocalSearch",
+                            "options": {"time_limit": 0.1},
+                            "instance": instance})]
+    output = io.StringIO()
+    serve(io.StringIO("\n".join(requests) + "\n"), output, workers=1,
+          strategies=("Greedy", "LocalSearch"))
+
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(responses) == 3
+    by_id = {response["id"]: response for response in responses}
+    assert "error" in by_id[None]
+    assert sorted(by_id[1]["solution"]) == list(range(6))
+    assert by_id[2]["cost"] <= by_id[1]["cost"]
+
+
+class SlowOutput(io.StringIO):
+    """Output stream that takes a while to write every response."""
+
+    def write(self, text: str) -> int:
+        time.sleep(0.05)
+        return super().write(text)
+
+
+def test_serve_returns_after_responses(fixed_graph):
+    """serve returns once every response is written, not just solved."""
+    instance = graph_to_json(fixed_graph)
+    requests = "".join(json.dumps({"id": i, "strategy": "Greedy",
+                                   "instance": instance}) + "\n"
+                       for i in range(4))
+    output = SlowOutput()
+    with SolveService(workers=2, strategies=("Greedy",)) as service:
+        service.serve(io.StringIO(requests), output)
+        n_responses = len(output.getvalue().splitlines())
+
+    assert n_responses == 4
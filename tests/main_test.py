@@ -0,0 +1,68 @@
+import json
+import pathlib
+import subprocess
+import sys
+from main import main, parse_arguments
+
+ROOT = pathlib.Path(__file__).parents[1]
+
+
+def test_run_is_the_default_command():
+    """Options without a command are those of run."""
+    args = parse_arguments(["--nodes", "5", "--exact"])
+
+    assert args.command == "run"
+    assert args.nodes == 5
+    assert args.exact
+    assert parse_arguments([]).command == "run"
+
+
+def test_solve_single(capsys):
+    """solve-single prints the result as JSON."""
+    main(["solve-single", "--strategy", "Greedy", "--nodes", "6",
+          "--seed", "2"])
+    result = json.loads(capsys.readouterr().out)
+
+    assert result["strategy"] == "Greedy"
+    assert sorted(result["solution"]) == list(range(6))
+    assert result["cost"] > 0
+
+
+def test_solve_single_imports():
+    """solve-single with greedy does not import the heavy packages."""
+    code = ("import sys, main\n"
+            "main.main(['solve-single', '--nodes', '5'])\n"
+            "heavy = ['matplotlib', 'pandas', 'sqlalchemy', 'ortools',\n"
+            "         'scipy']\n"
+            "print([name for name in heavy if name in sys.modules])\n")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+
+    assert output.stdout.splitlines()[-1] == "[]"
+
+
+def test_shard_and_merge_arguments():
+    """Sweeps can be sharded and their databases merged."""
+    args = parse_arguments(["run", "--shard", "1/4", "--sizes", "5", "8",
+                            "--run_id", "sweep"])
+    assert args.shard == "1/4"
+    assert args.sizes == [5, 8]
+
+    args = parse_arguments(["merge", "shard_0.db", "shard_1.db",
+                            "--output", "all.db"])
+    assert args.command == "merge"
+    assert args.dbs == ["shard_0.db", "shard_1.db"]
+    assert args.output == "all.db"
+
+
+def test_solve_single_solver_log():
+    """The CP-SAT log goes to stderr only, stdout just has the result."""
+    output = subprocess.run([sys.executable, "main.py", "solve-single",
+                             "--strategy", "Discrete", "--nodes", "5",
+                             "--bins", "15", "--solver_log"],
+                            cwd=ROOT, capture_output=True, text=True,
+                            check=True)
+
+    assert "CpSolverResponse" in output.stderr
+    assert len(output.stdout.splitlines()) == 1
+    assert json.loads(output.stdout)["strategy"] == "Discrete"
@@ -0,0 +1,106 @@
+import math
+import numpy as np
+
+
+def kmeans(points: np.ndarray, n_clusters: int, seed: int = 0,
+           n_iterations: int = 50) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the labels of the points and the centroids of n_clusters
+    clusters found with Lloyd's algorithm, starting from k-means++
+    centroids. Clusters left empty take the point farthest from its
+    centroid, so every cluster has at least one point.
+    """
+    points = np.asarray(points, dtype=float)
+    n_clusters = max(1, min(n_clusters, len(points)))
+    rng = np.random.default_rng(seed)
+
+    # k-means++: every new centroid is drawn with probability
+    # proportional to the squared distance to the nearest one
+    centroids = [points[rng.integers(len(points))]]
+    for _ in range(1, n_clusters):
+        squared_distances = np.min(
+            ((points[:, None, :] - np.array(centroids)[None]) ** 2).sum(-1),
+            axis=1
+        )
+        if squared_distances.sum() == 0:
+            centroids.append(points[rng.integers(len(points))])
+        else:
+            centroids.append(points[rng.choice(
+                len(points), p=squared_distances / squared_distances.sum()
+            )])
+    centroids = np.array(centroids)
+
+    labels = None
+    for _ in range(n_iterations):
+        squared_distances = ((points[:, None, :] -
+                              centroids[None]) ** 2).sum(-1)
+        new_labels = np.argmin(squared_distances, axis=1)
+        counts = np.bincount(new_labels, minlength=n_clusters)
+        for cluster in np.flatnonzero(counts == 0):
+            # Farthest point of the clusters that can give one
+            nearest = squared_distances[np.arange(len(points)), new_labels]
+            nearest[counts[new_labels] <= 1] = -1
+            point = np.argmax(nearest)
+            counts[new_labels[point]] -= 1
+            counts[cluster] = 1
+            new_labels[point] = cluster
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        centroids = np.array([points[labels == cluster].mean(axis=0)
+                              for cluster in range(n_clusters)])
+    return labels, centroids
+
+
+def cluster_nodes(points: np.ndarray, max_cluster_size: int,
+                  seed: int = 0) -> list[np.ndarray]:
+    """
+    Returns the indices of the points of every cluster, grouping the
+    points by location in clusters of at most max_cluster_size points.
+    Clusters that k-means leaves too large are split again.
+    """
+    points = np.asarray(points, dtype=float)
+    n_clusters = math.ceil(len(points) / max_cluster_size)
+    labels, _ = kmeans(points, n_clusters, seed)
+    clusters = []
+    for cluster in range(n_clusters):
+        members = np.flatnonzero(labels == cluster)
+        if len(members) > max_cluster_size:
+            clusters.extend(members[split]
+                            for split in cluster_nodes(points[members],
+                                                       max_cluster_size,
+                                                       seed))
+        else:
+            clusters.append(members)
+    return clusters
+
+
+def order_clusters(centroids: np.ndarray, first: int = 0) -> list[int]:
+    """
+    Returns the order in which the clusters are visited, starting at
+    first: the nearest neighbour tour of the centroids, improved with
+    2-opt moves while they shorten it.
+    """
+    centroids = np.asarray(centroids, dtype=float)
+    distances = np.sqrt(((centroids[:, None, :] -
+                          centroids[None]) ** 2).sum(-1))
+    order = [first]
+    left = set(range(len(centroids))) - {first}
+    while left:
+        order.append(min(left, key=lambda cluster:
+                         distances[order[-1], cluster]))
+        left.remove(order[-1])
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(order) - 1):
+            for j in range(i + 1, len(order)):
+                # Reverse order[i:j + 1], keeping the first cluster
+                a, b = order[i - 1], order[i]
+                c, d = order[j], order[(j + 1) % len(order)]
+                if (distances[a, c] + distances[b, d] <
+                        distances[a, b] + distances[c, d] - 1e-12):
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    improved = True
+    return order
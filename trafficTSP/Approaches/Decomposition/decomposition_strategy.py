@@ -0,0 +1,163 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
+from typing import Callable
+import numpy as np
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.LocalSearch.local_search_strategy import (
+    LocalSearchStrategy
+)
+from trafficTSP.Approaches.Decomposition.clustering import (
+    cluster_nodes,
+    order_clusters
+)
+from trafficTSP.Compare.evaluate_strategy import TourEvaluator
+from trafficTSP.Compare.profiling import stage
+
+
+def solve_cluster(graph: dict, strategy: Callable) -> list[int]:
+    """
+    Returns the tour of the strategy on the graph of a cluster, starting
+    at its node 0. Runs in worker processes, so graph and strategy must
+    be picklable.
+    """
+    tour = list(strategy(graph).solve())
+    first = tour.index(0)
+    return tour[first:] + tour[:first]
+
+
+class GivenTour:
+    def __init__(self, graph: dict, tour: list[int]):
+        """
+        Strategy whose solution is a given tour, so that a local search
+        can start from it.
+        """
+        self.graph = graph
+        self.tour = tour
+
+    def solve(self):
+        return list(self.tour)
+
+
+class DecompositionStrategy:
+    def __init__(self, graph: dict, start_node: int = 0,
+                 max_cluster_size: int = 12,
+                 cluster_strategy: Callable = GreedyStrategy,
+                 workers: int = 1,
+                 repair_time_limit: float = 1.0,
+                 n_candidates: int = 10,
+                 seed: int = 0):
+        """
+        Decomposition strategy to solve the TSP on large graphs.
+        Groups the nodes by location in clusters of at most
+        max_cluster_size nodes, and visits the clusters from the one of
+        start_node to the nearest one left.
+        The tour of every cluster is solved with cluster_strategy on its
+        subgraph, seen from the time at which the tour is expected to
+        enter the cluster, so the clusters are solved independently, in
+        workers processes. The tours of the clusters are then stitched
+        together and repaired with a local search of repair_time_limit
+        seconds over the n_candidates nearest nodes.
+        The graph must have node coordinates, as TimeDependentGraph.
+        """
+        self.graph = graph
+        self.start_node = start_node
+        self.n_nodes = graph['n_nodes']
+        self.max_cluster_size = max_cluster_size
+        self.cluster_strategy = cluster_strategy
+        self.workers = workers
+        self.repair_time_limit = repair_time_limit
+        self.n_candidates = n_candidates
+        self.seed = seed
+        self.solve_stats = {}
+
+    def clusters(self) -> list[np.ndarray]:
+        """
+        Returns the nodes of every cluster, in the order they are
+        visited, starting with the cluster of start_node.
+        """
+        clusters = cluster_nodes(self.graph.nodes, self.max_cluster_size,
+                                 self.seed)
+        centroids = [self.graph.nodes[cluster].mean(axis=0)
+                     for cluster in clusters]
+        first = next(index for index, cluster in enumerate(clusters)
+                     if self.start_node in cluster)
+        return [clusters[index]
+                for index in order_clusters(centroids, first)]
+
+    def entry_points(self, clusters: list[np.ndarray]
+                     ) -> list[tuple[int, float]]:
+        """
+        Returns the node by which the tour enters every cluster and the
+        time at which it does, estimated with greedy tours: every
+        cluster is entered by its nearest node to the end of the greedy
+        tour of the previous cluster.
+        """
+        entries = []
+        entry, t = self.start_node, 0.0
+        for index, cluster in enumerate(clusters):
+            entries.append((entry, t))
+            nodes = self.entry_first(cluster, entry)
+            subgraph = self.graph.subgraph(nodes, t)
+            path = solve_cluster(subgraph, GreedyStrategy)
+            # Time at which the last node of the cluster is reached
+            t += TourEvaluator(subgraph, path).departure_times[-2]
+            if index + 1 < len(clusters):
+                last = nodes[path[-1]]
+                next_cluster = clusters[index + 1]
+                entry = int(next_cluster[np.argmin(
+                    self.graph.distances[last, next_cluster]
+                )])
+                t += self.graph[(last, entry)](t)
+        return entries
+
+    @staticmethod
+    def entry_first(cluster: np.ndarray, entry: int) -> np.ndarray:
+        """Returns the nodes of the cluster with the entry node first."""
+        return np.concatenate([[entry], cluster[cluster != entry]])
+
+    def solve_clusters(self, subgraphs: list) -> list[list[int]]:
+        """Returns the tour of every subgraph, from its node 0."""
+        if self.workers <= 1:
+            return [solve_cluster(subgraph, self.cluster_strategy)
+                    for subgraph in subgraphs]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(solve_cluster, subgraphs,
+                                     repeat(self.cluster_strategy)))
+
+    def solve(self):
+        """Solve the TSP problem cluster by cluster."""
+        with stage("clustering"):
+            clusters = self.clusters()
+        with stage("entry_times"):
+            entries = self.entry_points(clusters)
+
+        nodes = [self.entry_first(cluster, entry)
+                 for cluster, (entry, _) in zip(clusters, entries)]
+        subgraphs = [self.graph.subgraph(cluster_nodes, t)
+                     for cluster_nodes, (_, t) in zip(nodes, entries)]
+        with stage("clusters"):
+            paths = self.solve_clusters(subgraphs)
+        tour = [int(node) for cluster_nodes, path in zip(nodes, paths)
+                for node in cluster_nodes[path]]
+
+        self.solve_stats = {"n_clusters": len(clusters),
+                            "largest_cluster": max(map(len, clusters))}
+        if len(clusters) == 1 or self.repair_time_limit <= 0:
+            return tour
+        with stage("repair"):
+            local_search = LocalSearchStrategy(
+                self.graph, self.start_node,
+                initial_strategy=partial(GivenTour, tour=tour),
+                time_limit=self.repair_time_limit,
+                n_candidates=self.n_candidates
+            )
+            return local_search.solve()
+
+
+if __name__ == "__main__":
+    from trafficTSP.CreateProblems.graphs import create_graph
+    graph = create_graph(n_nodes=60)
+    decomposition_solver = DecompositionStrategy(graph)
+    solution = decomposition_solver.solve()
+    print("Final solution:", solution)
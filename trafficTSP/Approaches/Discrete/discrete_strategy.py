@@ -1,18 +1,67 @@
-from itertools import product
-from collections import namedtuple
+from collections import namedtuple, defaultdict
+from typing import Callable
+import numpy as np
 from ortools.sat.python import cp_model
 from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.Discrete.time_bins import (
+    uniform_bin_times,
+    adaptive_bin_times
+)
+from trafficTSP.Approaches.Discrete.pruning import prune_edges
+from trafficTSP.CreateProblems.time_dependent_graph import (
+    candidate_lists,
+    evaluate_weights
+)
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Compare.profiling import stage
 
 Edge = namedtuple('Edge', ['start_node', 'start_step', 'end_node', 'end_step'])
 
 
+class SolutionCounter(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        """Counts the solutions found by CP-SAT during the search."""
+        super().__init__()
+        self.n_solutions = 0
+
+    def on_solution_callback(self):
+        self.n_solutions += 1
+
+
 class DiscreteStrategy:
     def __init__(self, graph: dict,
                  n_bins: int = 30,
                  starting_node: int = 0,
                  time_range: tuple = None,
-                 relative_gap_limit: float = 0.05
+                 relative_gap_limit: float = 0.05,
+                 greedy_hint: bool = True,
+                 greedy_upper_bound: bool = False,
+                 max_time_in_seconds: float = 60.0,
+                 num_workers: int = 0,
+                 log_callback: Callable = None,
+                 discretisation: str = "uniform",
+                 horizon_factor: float = 2.0,
+                 n_candidates: int = None,
+                 candidates_by: str = "distance",
+                 open_tour: bool = False,
+                 hint_tour: list[int] = None,
+                 prune: bool = True,
+                 prune_by_bound: bool = False
                  ):
+        """
+        Discrete strategy to solve the TSP with CP-SAT on the graph
+        expanded over n_bins time steps.
+        With open_tour, the tour does not have to go back to the
+        starting node: going back costs nothing and can arrive at the
+        last step, so the cost is the step at which the last node is
+        reached.
+        With hint_tour, the search starts from that tour instead of the
+        greedy one.
+        With prune, the timed edges that no tour from the starting node
+        at step 0 can use are left out of the model, and with
+        prune_by_bound also those that only tours worse than the greedy
+        or hint tour can use. What was removed is kept in pruning_stats.
+        """
         self.graph = graph
         self.n_bins = n_bins
         self.starting_node = starting_node
@@ -23,51 +72,239 @@ class DiscreteStrategy:
             self.time_range = time_range
         self.time_increments = ((self.time_range[1] - self.time_range[0]) /
                                 (n_bins - 1))
+        self.greedy_tour = None
+        self.n_candidates = n_candidates
+        self.candidates_by = candidates_by
+        self.open_tour = open_tour
+        self.hint_tour = hint_tour
+        self.prune = prune
+        self.prune_by_bound = prune_by_bound
+        self.pruning_stats = {}
+
+        # Time at which every step starts
+        self.discretisation = discretisation
+        if discretisation == "uniform":
+            self.bin_times = uniform_bin_times(self.time_range, n_bins)
+        elif discretisation == "adaptive":
+            # Concentrate the bins before the time the greedy tour
+            # takes, times horizon_factor
+            horizon = None
+            if horizon_factor is not None:
+                horizon = self.time_range[0] + horizon_factor * (
+                    evaluate_solution(graph, self.greedy_solution())
+                )
+            self.bin_times = adaptive_bin_times(graph, n_bins,
+                                                self.time_range, horizon)
+        else:
+            raise ValueError(f"Unknown discretisation {discretisation}.")
 
         self.vertices = [{'node': i, 'step': t} for i in range(self.n_nodes)
                          for t in range(n_bins)]
         # Stop solving when being this close to the solution
         self.relative_gap_limit = relative_gap_limit
+        # Time budget and number of search workers (0 lets CP-SAT choose)
+        self.max_time_in_seconds = max_time_in_seconds
+        self.num_workers = num_workers
+        # Function receiving the search log, if any
+        self.log_callback = log_callback
+        self.solve_stats = {}
 
         self.model = cp_model.CpModel()
         self.edge_vars = {}
         self.travel_times = {}
+        # Edges leaving and reaching every node and every (node, step)
+        self.outgoing_edges = defaultdict(list)
+        self.incoming_edges = defaultdict(list)
+        self.outgoing_vertex_edges = defaultdict(list)
+        self.incoming_vertex_edges = defaultdict(list)
+
+        with stage("model_variables"):
+            self.define_variables()
+        with stage("model_constraints"):
+            self.define_constraints()
+
+        # Start the search from the greedy tour
+        self.greedy_edges = None
+        if greedy_hint or greedy_upper_bound:
+            self.greedy_edges = self.project_tour(self.greedy_solution())
+        if hint_tour is not None:
+            hint_edges = self.project_tour(hint_tour)
+            if hint_edges is not None:
+                self.add_hint(hint_edges)
+        if self.greedy_edges is not None:
+            if greedy_hint and hint_tour is None:
+                self.add_hint(self.greedy_edges)
+            if greedy_upper_bound:
+                # The optimum cannot be worse than the greedy tour
+                self.model.Add(self.objective <=
+                               self.edges_cost(self.greedy_edges))
+
+    def candidate_edges(self) -> tuple[np.ndarray, ...]:
+        """
+        Returns the edges of the time-expanded graph as arrays
+        (start_nodes, start_steps, end_nodes, end_steps, travel_times).
+        Leaving a node at a given step reaches a single arrival step,
+        so the travel times of all (node, node, step) triples are
+        evaluated in one batch.
+        """
+        start_nodes, end_nodes = np.nonzero(self.allowed_pairs())
+        start_nodes = np.repeat(start_nodes, self.n_bins)
+        end_nodes = np.repeat(end_nodes, self.n_bins)
+        start_steps = np.tile(np.arange(self.n_bins),
+                              len(start_nodes) // self.n_bins)
 
-        self.define_variables()
-        self.define_constraints()
+        start_times = self.bin_times[start_steps]
+        travel_times = evaluate_weights(self.graph, start_nodes, end_nodes,
+                                        start_times)
+        end_steps = self.arrival_steps(start_steps, travel_times)
+        if self.open_tour:
+            # Going back to the starting node just ends the tour
+            returns = end_nodes == self.starting_node
+            travel_times = np.where(returns, 0.0, travel_times)
+            end_steps = np.where(returns, self.n_bins - 1, end_steps)
+
+        # Only keep the edges arriving before the last step
+        valid = end_steps < self.n_bins
+        return (start_nodes[valid], start_steps[valid], end_nodes[valid],
+                end_steps[valid], travel_times[valid])
+
+    def allowed_pairs(self) -> np.ndarray:
+        """
+        Returns the (n_nodes, n_nodes) boolean matrix of the pairs of
+        nodes that get edges in the model: all of them, or with
+        n_candidates the edges to the n_candidates nearest nodes of
+        every node. The edges from and to the starting node and those
+        of the greedy and hint tours are always kept, so the model has
+        a tour.
+        """
+        if self.n_candidates is None:
+            allowed = np.ones((self.n_nodes, self.n_nodes), dtype=bool)
+        else:
+            allowed = np.zeros((self.n_nodes, self.n_nodes), dtype=bool)
+            candidates = candidate_lists(self.graph, self.n_candidates,
+                                         self.candidates_by)
+            np.put_along_axis(allowed, candidates, True, axis=1)
+            allowed[self.starting_node, :] = True
+            allowed[:, self.starting_node] = True
+            for tour in [self.greedy_solution(), self.hint_tour]:
+                if tour is not None:
+                    tour = list(tour)
+                    allowed[tour, tour[1:] + tour[:1]] = True
+        np.fill_diagonal(allowed, False)
+        return allowed
+
+    def arrival_steps(self, start_steps: np.ndarray,
+                      travel_times: np.ndarray) -> np.ndarray:
+        """
+        Returns the step closest to the arrival time of each trip, at least
+        one step after its departure. Trips arriving after the last step
+        get n_bins or more.
+        """
+        if self.discretisation == "uniform":
+            round_travel_timesteps = np.maximum(
+                1, np.rint(travel_times / self.time_increments)
+            ).astype(int)
+            return start_steps + round_travel_timesteps
+
+        arrival_times = self.bin_times[start_steps] + travel_times
+        upper = np.searchsorted(self.bin_times, arrival_times)
+        lower = np.maximum(upper - 1, 0)
+        upper = np.minimum(upper, self.n_bins - 1)
+        closest = np.where(
+            self.bin_times[upper] - arrival_times <
+            arrival_times - self.bin_times[lower],
+            upper, lower
+        )
+        # Past the last step by more than half of the last bin
+        last_bin = self.bin_times[-1] - self.bin_times[-2]
+        closest[arrival_times > self.bin_times[-1] + last_bin / 2] = (
+            self.n_bins
+        )
+        return np.maximum(start_steps + 1, closest)
 
     def define_variables(self):
-        for vertex1, vertex2 in product(self.vertices, self.vertices):
-            if vertex1['node'] != vertex2['node']:
-                weight_func = self.graph[(vertex1['node'], vertex2['node'])]
-                travel_time = weight_func(vertex1['step'])
-                round_travel_timesteps = max(
-                    1, round(travel_time / self.time_increments)
-                )
+        columns = self.candidate_edges()
+        if self.prune:
+            with stage("pruning"):
+                columns = self.prune_edges(columns)
+        for (start_node, start_step, end_node, end_step,
+             travel_time) in zip(*(column.tolist() for column in columns)):
+            edge = Edge(start_node, start_step, end_node, end_step)
+            var = self.model.NewBoolVar(
+                f'x_{edge.start_node}_{edge.start_step}' +
+                f'_{edge.end_node}_{edge.end_step}')
+            self.edge_vars[edge] = var
+            self.travel_times[edge] = travel_time
+            self.index_edge(edge)
 
-                if vertex2['step'] - vertex1['step'] == round_travel_timesteps:
-                    edge = Edge(vertex1["node"], vertex1["step"],
-                                vertex2["node"], vertex2["step"])
-                    var = self.model.NewBoolVar(
-                        f'x_{edge.start_node}_{edge.start_step}' +
-                        f'_{edge.end_node}_{edge.end_step}')
-                    self.edge_vars[edge] = var
-                    self.travel_times[edge] = travel_time
+    def prune_edges(self, columns: tuple[np.ndarray, ...]
+                    ) -> tuple[np.ndarray, ...]:
+        """
+        Returns the candidate edges that can be part of a tour, leaving
+        out those that cannot be reached from the starting node at step
+        0 or from which it cannot be reached again, and with
+        prune_by_bound those on no path cheaper than the best of the
+        greedy and hint tours.
+        """
+        costs = self.edge_costs(columns)
+        upper_bound = None
+        if self.prune_by_bound:
+            upper_bound = self.tours_bound(columns, costs)
+        keep, self.pruning_stats = prune_edges(
+            columns, costs, self.n_nodes, self.n_bins, self.starting_node,
+            upper_bound
+        )
+        return tuple(column[keep] for column in columns)
+
+    def tours_bound(self, columns: tuple[np.ndarray, ...],
+                    costs: np.ndarray) -> int:
+        """
+        Returns the lowest cost of the greedy and hint tours over the
+        edges, or None if neither of them fits in the time range.
+        """
+        edges = {(start_node, start_step, end_node): (end_step, cost)
+                 for start_node, start_step, end_node, end_step, cost
+                 in zip(*(column.tolist() for column in columns[:4]),
+                        costs.tolist())}
+        bounds = []
+        for tour in [self.greedy_solution(), self.hint_tour]:
+            if tour is None or len(tour) < 2:
+                continue
+            step, total = 0, 0
+            for start_node, end_node in zip(tour, tour[1:] + tour[:1]):
+                if (start_node, step, end_node) not in edges:
+                    break
+                step, cost = edges[(start_node, step, end_node)]
+                total += cost
+            else:
+                bounds.append(total)
+        return min(bounds, default=None)
+
+    def index_edge(self, edge: Edge):
+        """Add the edge to the indexes by node and by (node, step)."""
+        self.outgoing_edges[edge.start_node].append(edge)
+        self.incoming_edges[edge.end_node].append(edge)
+        self.outgoing_vertex_edges[
+            (edge.start_node, edge.start_step)].append(edge)
+        self.incoming_vertex_edges[
+            (edge.end_node, edge.end_step)].append(edge)
 
     def define_constraints(self):
         for node in range(self.n_nodes):
+            edges_to_node = self.edges_to_node(node)
+            edges_from_node = self.edges_from_node(node)
             receiving_edges = [self.edge_vars[edge]
-                               for edge in self.edges_to_node(node)]
+                               for edge in edges_to_node]
             leaving_edges = [self.edge_vars[edge]
-                             for edge in self.edges_from_node(node)]
+                             for edge in edges_from_node]
 
             self.model.Add(sum(receiving_edges) == 1)
             self.model.Add(sum(leaving_edges) == 1)
 
             arriving_time = sum(self.edge_vars[edge] * edge.end_step
-                                for edge in self.edges_to_node(node))
+                                for edge in edges_to_node)
             leaving_time = sum(self.edge_vars[edge] * edge.start_step
-                               for edge in self.edges_from_node(node))
+                               for edge in edges_from_node)
 
             if node != self.starting_node:
                 self.model.Add(arriving_time == leaving_time)
@@ -75,44 +312,150 @@ class DiscreteStrategy:
                 self.model.Add(leaving_time == 0)
 
         # Objective: minimize total travel time
-        self.model.Minimize(
-            sum(self.edge_vars[edge] * int(self.travel_times[edge])
-                for edge in self.edge_vars)
+        self.objective = sum(self.edge_vars[edge] * self.edge_cost(edge)
+                             for edge in self.edge_vars)
+        self.model.Minimize(self.objective)
+
+    def greedy_solution(self) -> list[int]:
+        """Returns the tour of the greedy strategy, computed only once."""
+        if self.greedy_tour is None:
+            with stage("greedy"):
+                greedy_strategy = GreedyStrategy(self.graph,
+                                                 self.starting_node)
+                self.greedy_tour = greedy_strategy.solve()
+        return self.greedy_tour
+
+    def project_tour(self, tour: list[int]) -> list[Edge]:
+        """
+        Returns the edges of the time-expanded graph followed by tour,
+        starting at step 0 and going back to the first node.
+        Returns None if the tour does not fit in the time range.
+        """
+        if len(tour) < 2:
+            return None
+        edges = []
+        step = 0
+        for start_node, end_node in zip(tour, tour[1:] + tour[:1]):
+            edge = next((edge for edge in
+                         self.edges_from_vertex(start_node, step)
+                         if edge.end_node == end_node), None)
+            if edge is None:
+                return None
+            edges.append(edge)
+            step = edge.end_step
+        return edges
+
+    def edges_cost(self, edges: list[Edge]) -> int:
+        """Returns the objective value of a set of edges."""
+        return sum(self.edge_cost(edge) for edge in edges)
+
+    def edge_costs(self, columns: tuple[np.ndarray, ...]) -> np.ndarray:
+        """
+        Returns the cost of every edge of the arrays (start_nodes,
+        start_steps, end_nodes, end_steps, travel_times), as edge_cost.
+        """
+        start_nodes, start_steps, end_nodes, end_steps, travel_times = (
+            columns
         )
+        if not self.open_tour:
+            return travel_times.astype(int)
+        return np.where(end_nodes == self.starting_node, 0,
+                        end_steps - start_steps)
+
+    def edge_cost(self, edge: Edge) -> int:
+        """
+        Returns the cost of the edge in the objective: its travel time,
+        or with open_tour its number of steps, so that the objective is
+        the step at which the last node is reached.
+        """
+        if not self.open_tour:
+            return int(self.travel_times[edge])
+        if edge.end_node == self.starting_node:
+            return 0
+        return edge.end_step - edge.start_step
+
+    def add_hint(self, edges: list[Edge]):
+        """Hint the solver with the solution that uses the given edges."""
+        self.model.ClearHints()
+        chosen = set(edges)
+        for edge, var in self.edge_vars.items():
+            self.model.AddHint(var, edge in chosen)
 
     def solve(self):
         solver = cp_model.CpSolver()
-        solver.parameters.relative_gap_limit = self.relative_gap_limit
         # Stop if within 95% of optimal
-        solver.parameters.max_time_in_seconds = 60.0
+        solver.parameters.relative_gap_limit = self.relative_gap_limit
+        solver.parameters.max_time_in_seconds = self.max_time_in_seconds
+        if self.num_workers:
+            solver.parameters.num_workers = self.num_workers
+        if self.log_callback is not None:
+            solver.parameters.log_search_progress = True
+            # The callback replaces the native log, which would write
+            # every line to stdout as well
+            solver.parameters.log_to_stdout = False
+            solver.log_callback = self.log_callback
 
         print("Starting CP-SAT solver...")
-        status = solver.Solve(self.model)
+        solution_counter = SolutionCounter()
+        with stage("cp_sat"):
+            status = solver.Solve(self.model, solution_counter)
         print("Solver finished with status:", solver.StatusName(status))
+        self.solve_stats = self.solver_stats(solver, status,
+                                             solution_counter.n_solutions)
+        self.solve_stats.update({f"pruning_{name}": value for name, value
+                                 in self.pruning_stats.items()})
 
         if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-            greedy_strategy = GreedyStrategy(self.graph)
-            return greedy_strategy.solve()
+            return self.greedy_solution()
 
         # Extract solution path
         solution = [self.starting_node]
+        current_step = 0
         while len(solution) < self.n_nodes:
             current_node = solution[-1]
-            edges = self.edges_from_node(current_node)
+            edges = self.edges_from_vertex(current_node, current_step)
             for edge in edges:
                 if solver.BooleanValue(self.edge_vars[edge]):
                     next_node = edge.end_node
                     print(f"step {edge.start_step} -> {edge.end_step}")
                     solution.append(next_node)
+                    current_step = edge.end_step
                     break
 
         return solution
 
+    @staticmethod
+    def solver_stats(solver: cp_model.CpSolver, status,
+                     n_solutions: int) -> dict:
+        """
+        Returns the statistics of a solve, to tell whether it stopped
+        at the time limit or at the gap.
+        """
+        found = status in [cp_model.OPTIMAL, cp_model.FEASIBLE]
+        objective = solver.ObjectiveValue() if found else float('nan')
+        best_bound = solver.BestObjectiveBound()
+        # Same definition of the gap as relative_gap_limit
+        gap = abs(objective - best_bound) / max(1, abs(objective))
+        return {
+            "solver_status": solver.StatusName(status),
+            "solver_wall_time": solver.WallTime(),
+            "solver_objective": objective,
+            "solver_best_bound": best_bound,
+            "solver_gap": gap,
+            "solver_n_solutions": n_solutions
+        }
+
     def edges_from_node(self, node):
-        return [edge for edge in self.edge_vars if edge.start_node == node]
+        return self.outgoing_edges[node]
 
     def edges_to_node(self, node):
-        return [edge for edge in self.edge_vars if edge.end_node == node]
+        return self.incoming_edges[node]
+
+    def edges_from_vertex(self, node, step):
+        return self.outgoing_vertex_edges[(node, step)]
+
+    def edges_to_vertex(self, node, step):
+        return self.incoming_vertex_edges[(node, step)]
 
 
 if __name__ == "__main__":
@@ -1,11 +1,32 @@
+import numpy as np
 import pandas as pd
+from trafficTSP.CreateProblems.time_dependent_graph import evaluate_weights
 
 
-def discretise_and_approximate_graph(graph: dict, bins: int) -> dict:
+def discretise_and_approximate_graph(graph: dict, bins: int,
+                                     output: str = "dataframe"):
     """
     Discretises the weight of the graph from a continuous function
     to a finite set.
     Also, these weights are approximated to the closer timestamp.
+
+    With output="tensor" the travel times are returned as an int32 array
+    of shape (n_nodes, n_nodes, bins), otherwise as a DataFrame with one
+    row per (start_node, final_node, time).
+    """
+    tensor = travel_time_tensor(graph, bins)
+    if output == "tensor":
+        return tensor
+    if output != "dataframe":
+        raise ValueError(f"Unknown output {output}.")
+    return tensor_to_dataframe(tensor)
+
+
+def travel_time_tensor(graph: dict, bins: int) -> np.ndarray:
+    """
+    Returns the travel times of all the edges at every step, in steps,
+    as an int32 array of shape (n_nodes, n_nodes, bins).
+    The whole tensor is evaluated in a single vectorized call.
     """
     n_nodes = graph['n_nodes']
     time_range = graph['time_range']
@@ -14,25 +35,27 @@ def discretise_and_approximate_graph(graph: dict, bins: int) -> dict:
     else:
         timestep = (time_range[1] - time_range[0])/(bins - 1)
 
-    rows = []
-    # Iterate over all the edges
-    for i in range(n_nodes):
-        for j in range(n_nodes):
-            if i != j:
-                for step in range(bins):
-                    # Calculate the weight at time t
-                    weight_funct = graph[(i, j)]
-                    t = step * timestep
-                    weight = weight_funct(t)
-                    # Add the weight to the DataFrame
-                    new_row = {'start_node': i,
-                               'final_node': j,
-                               'time': step,
-                               'travel_time': round(weight/timestep)}
-                    rows.append(new_row)
-
-    # Create DataFrame from rows
-    df = pd.DataFrame(rows,
-                      columns=['start_node', 'final_node',
-                               'time', 'travel_time'])
-    return df
+    nodes = np.arange(n_nodes)
+    times = np.arange(bins) * timestep
+    weights = evaluate_weights(graph, nodes[:, None, None],
+                               nodes[None, :, None], times[None, None, :])
+    return np.rint(weights / timestep).astype(np.int32)
+
+
+def tensor_to_dataframe(tensor: np.ndarray) -> pd.DataFrame:
+    """
+    Returns a DataFrame with one row per edge and step of the tensor
+    of travel times, leaving out the diagonal.
+    """
+    n_nodes, _, bins = tensor.shape
+    start_nodes, final_nodes, times = np.meshgrid(
+        np.arange(n_nodes), np.arange(n_nodes), np.arange(bins),
+        indexing='ij'
+    )
+    edges = start_nodes != final_nodes
+    return pd.DataFrame({'start_node': start_nodes[edges],
+                         'final_node': final_nodes[edges],
+                         'time': times[edges],
+                         'travel_time': tensor[edges]},
+                        columns=['start_node', 'final_node',
+                                 'time', 'travel_time'])
@@ -0,0 +1,106 @@
+import numpy as np
+
+
+def steps_order(start_steps: np.ndarray, n_bins: int
+                ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the order that sorts the edges by departure step and the
+    position in that order where the edges of every step begin, so
+    that the edges leaving at step s are order[bounds[s]:bounds[s + 1]].
+    """
+    order = np.argsort(start_steps, kind='stable')
+    bounds = np.searchsorted(start_steps[order], np.arange(n_bins + 1))
+    return order, bounds
+
+
+def forward_costs(start_nodes: np.ndarray, start_steps: np.ndarray,
+                  end_nodes: np.ndarray, end_steps: np.ndarray,
+                  costs: np.ndarray, n_nodes: int, n_bins: int,
+                  source: int) -> np.ndarray:
+    """
+    Returns the lowest cost of the paths of the time-expanded graph from
+    (source, 0) to every (node, step), as an (n_nodes, n_bins) array
+    that is infinite at the vertices that cannot be reached.
+    The source is only left at step 0, and every edge arrives later than
+    it leaves, except those going back to the source, so the steps are
+    swept forwards once.
+    """
+    reach = np.full((n_nodes, n_bins), np.inf)
+    reach[source, 0] = 0
+    order, bounds = steps_order(start_steps, n_bins)
+    for step in range(n_bins):
+        edges = order[bounds[step]:bounds[step + 1]]
+        edges = edges[start_nodes[edges] != source] if step else edges
+        arrival_costs = reach[start_nodes[edges], step] + costs[edges]
+        np.minimum.at(reach, (end_nodes[edges], end_steps[edges]),
+                      arrival_costs)
+    return reach
+
+
+def backward_costs(start_nodes: np.ndarray, start_steps: np.ndarray,
+                   end_nodes: np.ndarray, end_steps: np.ndarray,
+                   costs: np.ndarray, n_nodes: int, n_bins: int,
+                   sink: int) -> np.ndarray:
+    """
+    Returns the lowest cost of the paths of the time-expanded graph from
+    every (node, step) back to the sink at any step, as an
+    (n_nodes, n_bins) array that is infinite at the vertices from which
+    the sink cannot be reached before the last step.
+    """
+    back = np.full((n_nodes, n_bins), np.inf)
+    back[sink, :] = 0
+    order, bounds = steps_order(start_steps, n_bins)
+    for step in reversed(range(n_bins)):
+        edges = order[bounds[step]:bounds[step + 1]]
+        edges = edges[start_nodes[edges] != sink]
+        departure_costs = costs[edges] + back[end_nodes[edges],
+                                              end_steps[edges]]
+        np.minimum.at(back, (start_nodes[edges], step), departure_costs)
+    # Leaving the sink is only possible at step 0, towards the others
+    sink_edges = (start_nodes == sink) & (start_steps == 0)
+    back[sink, 0] = np.min(costs[sink_edges] +
+                           back[end_nodes[sink_edges],
+                                end_steps[sink_edges]],
+                           initial=np.inf)
+    return back
+
+
+def prune_edges(columns: tuple[np.ndarray, ...], costs: np.ndarray,
+                n_nodes: int, n_bins: int, starting_node: int,
+                upper_bound: float = None) -> tuple[np.ndarray, dict]:
+    """
+    Returns which edges of the time-expanded graph can be part of a tour
+    from (starting_node, 0), and how many were removed for each reason.
+    columns are the arrays (start_nodes, start_steps, end_nodes,
+    end_steps, ...) of the edges and costs their cost in the objective.
+    - unreachable: edges leaving a vertex that cannot be reached from
+      (starting_node, 0), such as the starting node after step 0.
+    - dead_ends: edges arriving at a vertex from which the starting node
+      cannot be reached before the last step.
+    - dominated: with an upper_bound on the cost of the best tour, edges
+      whose cheapest path from and back to the starting node costs more.
+    """
+    start_nodes, start_steps, end_nodes, end_steps = columns[:4]
+    reach = forward_costs(start_nodes, start_steps, end_nodes, end_steps,
+                          costs, n_nodes, n_bins, starting_node)
+    back = backward_costs(start_nodes, start_steps, end_nodes, end_steps,
+                          costs, n_nodes, n_bins, starting_node)
+    cost_to = reach[start_nodes, start_steps]
+    cost_from = back[end_nodes, end_steps]
+    # The starting node is only left at step 0
+    cost_to[(start_nodes == starting_node) & (start_steps > 0)] = np.inf
+
+    reachable = np.isfinite(cost_to)
+    returns = np.isfinite(cost_from)
+    keep = reachable & returns
+    stats = {"candidate_edges": len(costs),
+             "unreachable": int(np.sum(~reachable)),
+             "dead_ends": int(np.sum(reachable & ~returns)),
+             "dominated": 0}
+    if upper_bound is not None:
+        # Integer costs, so a small tolerance is enough
+        bounded = cost_to + costs + cost_from <= upper_bound + 1e-9
+        stats["dominated"] = int(np.sum(keep & ~bounded))
+        keep &= bounded
+    stats["removed"] = len(costs) - int(np.sum(keep))
+    return keep, stats
@@ -0,0 +1,127 @@
+import numpy as np
+from trafficTSP.Approaches.Discrete.discrete_strategy import DiscreteStrategy
+from trafficTSP.Compare.evaluate_strategy import TourEvaluator
+from trafficTSP.Compare.profiling import stage
+
+
+class RollingHorizonStrategy:
+    def __init__(self, graph: dict, start_node: int = 0,
+                 window_size: int = 6,
+                 commit_size: int = 2,
+                 n_bins: int = 20,
+                 horizon_factor: float = 1.5,
+                 max_time_in_seconds: float = 1.0,
+                 relative_gap_limit: float = 0.0,
+                 num_workers: int = 0):
+        """
+        Rolling horizon strategy to solve the TSP with the discrete
+        strategy on small windows.
+        Every window has the window_size nodes left that are nearest to
+        the current node, and only spans the time its hint tour takes,
+        times horizon_factor, so its n_bins steps are fine. Its open tour
+        is solved with at most max_time_in_seconds of CP-SAT, the first
+        commit_size visits are fixed and the clock is advanced to the
+        arrival at the last of them. The visits left of every window
+        are the hint of the next one.
+        The graph must have subgraphs, as TimeDependentGraph.
+        """
+        if not 0 < commit_size <= window_size:
+            raise ValueError("commit_size must be between 1 and "
+                             "window_size.")
+        self.graph = graph
+        self.start_node = start_node
+        self.n_nodes = graph['n_nodes']
+        self.window_size = window_size
+        self.commit_size = commit_size
+        self.n_bins = n_bins
+        self.horizon_factor = horizon_factor
+        self.max_time_in_seconds = max_time_in_seconds
+        self.relative_gap_limit = relative_gap_limit
+        self.num_workers = num_workers
+        self.solve_stats = {}
+
+    def window_nodes(self, current: int, nodes_left: set,
+                     plan: list[int]) -> list[int]:
+        """
+        Returns the nodes of the next window, as a hint tour from the
+        current node: the planned visits that are still among the
+        window_size nodes left nearest to current, then the other ones
+        by nearest neighbour.
+        """
+        nodes_left = np.array(sorted(nodes_left))
+        nearest = nodes_left[np.argsort(
+            self.graph.distances[current, nodes_left], kind='stable'
+        )[:self.window_size]].tolist()
+        hint = [current] + [node for node in plan if node in nearest]
+        others = set(nearest) - set(hint)
+        while others:
+            hint.append(min(others, key=lambda node:
+                            self.graph.distances[hint[-1], node]))
+            others.remove(hint[-1])
+        return hint
+
+    def solve_window(self, nodes: list[int], t: float) -> list[int]:
+        """
+        Returns the order in which the window visits the nodes, leaving
+        nodes[0] at time t, starting from the order of nodes. The order
+        of nodes is kept if it reaches its last node earlier.
+        """
+        subgraph = self.graph.subgraph(nodes, t)
+        hint = list(range(len(nodes)))
+        # Time at which the hint reaches its last node
+        hint_time = TourEvaluator(subgraph, hint).departure_times[-2]
+        window_end = max(hint_time * self.horizon_factor, 1e-6)
+        strategy = DiscreteStrategy(
+            subgraph,
+            n_bins=self.n_bins,
+            time_range=(0, window_end),
+            relative_gap_limit=self.relative_gap_limit,
+            greedy_hint=False,
+            max_time_in_seconds=self.max_time_in_seconds,
+            num_workers=self.num_workers,
+            open_tour=True,
+            hint_tour=hint
+        )
+        order = strategy.solve()
+        self.solve_stats["solver_wall_time"] += strategy.solve_stats.get(
+            "solver_wall_time", 0.0
+        )
+        # The steps are rounded, so keep the hint if it is really faster
+        if (TourEvaluator(subgraph, order).departure_times[-2] >
+                hint_time):
+            order = hint
+        return [nodes[index] for index in order]
+
+    def solve(self):
+        """Solve the TSP problem one window at a time."""
+        self.solve_stats = {"n_windows": 0, "solver_wall_time": 0.0}
+        solution = [self.start_node]
+        nodes_left = set(range(self.n_nodes)) - {self.start_node}
+        plan = []
+        t = 0.0
+        with stage("windows"):
+            while nodes_left:
+                window = self.window_nodes(solution[-1], nodes_left, plan)
+                if len(window) > 2:
+                    window = self.solve_window(window, t)
+                self.solve_stats["n_windows"] += 1
+                # The last window is committed at once
+                if len(nodes_left) <= self.window_size:
+                    committed = window[1:]
+                else:
+                    committed = window[1:self.commit_size + 1]
+                for node in committed:
+                    t += self.graph[(solution[-1], node)](t)
+                    solution.append(node)
+                    nodes_left.remove(node)
+                plan = window[self.commit_size + 1:]
+        return solution
+
+
+if __name__ == "__main__":
+    from trafficTSP.CreateProblems.graphs import create_graph
+
+    graph = create_graph(n_nodes=15)
+    rolling_horizon_solver = RollingHorizonStrategy(graph)
+    solution = rolling_horizon_solver.solve()
+    print("Final solution:", solution)
@@ -0,0 +1,76 @@
+import numpy as np
+
+
+def uniform_bin_times(time_range: tuple[float, float],
+                      n_bins: int) -> np.ndarray:
+    """
+    Returns n_bins times evenly spaced across time_range.
+    """
+    return np.linspace(time_range[0], time_range[1], n_bins)
+
+
+def adaptive_bin_times(graph, n_bins: int,
+                       time_range: tuple[float, float] = None,
+                       horizon: float = None,
+                       uniform_share: float = 0.5,
+                       points_per_bin: int = 50,
+                       chunk_size: int = 1024) -> np.ndarray:
+    """
+    Returns n_bins times across time_range, closer together where the
+    disruptions of the graph are.
+
+    The times are the quantiles of a distribution that mixes a uniform
+    distribution (uniform_share of the bins) with the disruptions,
+    each one a Gaussian with its own mean and width, weighted by the
+    distance of its edge. The first and last times are the ends of
+    time_range.
+    If a horizon is given, only the last time is placed after it, so
+    that the resolution is spent where the tour can actually be.
+    """
+    # scipy is only imported when adaptive bins are used
+    from scipy.special import ndtr
+
+    if not hasattr(graph, 'means'):
+        raise TypeError("Adaptive bins need the disruptions of a "
+                        "TimeDependentGraph.")
+    if time_range is None:
+        time_range = graph.time_range
+    start, end = time_range
+    if n_bins <= 2 or graph.n_nodes < 2:
+        return uniform_bin_times(time_range, n_bins)
+    if horizon is not None and start < horizon < end:
+        # One bin for the rest of the time range
+        times = adaptive_bin_times(graph, n_bins - 1, (start, horizon),
+                                   uniform_share=uniform_share,
+                                   points_per_bin=points_per_bin,
+                                   chunk_size=chunk_size)
+        return np.append(times, end)
+
+    # Disruptions of all the edges, weighted by the edge distance
+    off_diagonal = ~np.eye(graph.n_nodes, dtype=bool)
+    means = graph.means[off_diagonal].ravel()
+    inv_std_devs = graph.inv_std_devs[off_diagonal].ravel()
+    weights = np.repeat(graph.distances[off_diagonal], graph.n_disruptions)
+    relevant = inv_std_devs > 0
+    means, inv_std_devs = means[relevant], inv_std_devs[relevant]
+    weights = weights[relevant]
+
+    # Cumulative distribution of the disruptions on a fine grid
+    grid = np.linspace(start, end, points_per_bin * n_bins)
+    cumulative = np.zeros_like(grid)
+    for first in range(0, len(means), chunk_size):
+        chunk = slice(first, first + chunk_size)
+        z = (grid[:, None] - means[chunk]) * inv_std_devs[chunk]
+        cumulative += ndtr(z) @ weights[chunk]
+    cumulative -= cumulative[0]
+    if cumulative[-1] <= 0:
+        return uniform_bin_times(time_range, n_bins)
+    cumulative /= cumulative[-1]
+
+    # Mix with the uniform distribution and invert it
+    uniform = (grid - start) / (end - start)
+    cumulative = uniform_share * uniform + (1 - uniform_share) * cumulative
+    quantiles = np.linspace(0, 1, n_bins)
+    times = np.interp(quantiles, cumulative, grid)
+    times[0], times[-1] = start, end
+    return times
@@ -0,0 +1,142 @@
+import numpy as np
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Compare.profiling import stage
+from trafficTSP.CreateProblems.time_dependent_graph import evaluate_weights
+
+
+class DynamicProgrammingStrategy:
+    def __init__(self, graph: dict, start_node: int = 0,
+                 prune: bool = True, max_nodes: int = 18,
+                 tolerance: float = 1e-9):
+        """
+        Held-Karp dynamic programming strategy to solve the TSP.
+
+        The states are (set of visited nodes, last node) and keep the
+        earliest arrival time at the last node, in NumPy arrays indexed
+        by the bitmask of the set. The states are expanded one layer
+        (number of visited nodes) at a time, with all the weights of a
+        layer evaluated in a single vectorized call.
+
+        The solution is exact when the edges are FIFO, that is, when
+        leaving later never means arriving earlier, because then the
+        earliest arrival is the best way to be in a state. Otherwise it
+        is the best tour among those that arrive as early as possible.
+
+        With prune, states that cannot beat the greedy tour are dropped:
+        every weight is at least the distance between the nodes, so from
+        any state the tour still needs the distance of a detour through
+        each unvisited node back to start_node.
+        """
+        self.graph = graph
+        self.start_node = start_node
+        self.n_nodes = graph['n_nodes']
+        self.prune = prune
+        self.tolerance = tolerance
+        if self.n_nodes > max_nodes:
+            raise ValueError(f"{self.n_nodes} nodes are too many for the "
+                             f"dynamic programming strategy, the limit "
+                             f"is {max_nodes}.")
+        # Nodes other than start_node, one bit of the bitmask each
+        self.nodes = np.array([node for node in range(self.n_nodes)
+                               if node != start_node], dtype=int)
+        self.solve_stats = {}
+
+    def upper_bound(self) -> tuple[list[int], float]:
+        """Returns the greedy tour and its weight."""
+        with stage("greedy"):
+            tour = GreedyStrategy(self.graph, self.start_node).solve()
+        return tour, evaluate_solution(self.graph, tour)
+
+    def detours(self) -> np.ndarray:
+        """
+        Returns the distance from the node of bit i to the node of bit j
+        and then to start_node, a lower bound on the weight of that path.
+        """
+        distances = self.graph.distances
+        return (distances[np.ix_(self.nodes, self.nodes)]
+                + distances[self.nodes, self.start_node][None, :])
+
+    def solve(self):
+        """Solve the TSP problem exactly with dynamic programming."""
+        n_bits = len(self.nodes)
+        if n_bits == 0:
+            return [self.start_node]
+
+        full = (1 << n_bits) - 1
+        bits = np.arange(n_bits)
+        subsets = np.arange(full + 1)
+        layers = ((subsets[:, None] >> bits) & 1).sum(axis=1)
+        times = np.full((full + 1, n_bits), np.inf)
+        parents = np.full((full + 1, n_bits), -1, dtype=np.int8)
+        times[1 << bits, bits] = evaluate_weights(
+            self.graph, self.start_node, self.nodes, 0.0
+        )
+
+        prune = self.prune and hasattr(self.graph, 'distances')
+        if prune:
+            greedy_tour, bound = self.upper_bound()
+            detours = self.detours()
+        n_states = n_pruned = 0
+        for size in range(1, n_bits):
+            # Reachable states of the layer
+            rows, last = np.nonzero(np.isfinite(times[layers == size]))
+            visited = subsets[layers == size][rows]
+            t = times[visited, last]
+            unvisited = ((visited[:, None] >> bits) & 1) == 0
+            if prune:
+                lower = t + np.where(unvisited, detours[last],
+                                     -np.inf).max(axis=1)
+                kept = lower <= bound + self.tolerance
+                n_pruned += int(np.count_nonzero(~kept))
+                visited, last, t = visited[kept], last[kept], t[kept]
+                unvisited = unvisited[kept]
+            n_states += len(visited)
+
+            # Every way to extend every state
+            state, following = np.nonzero(unvisited)
+            arrivals = t[state] + evaluate_weights(
+                self.graph, self.nodes[last[state]],
+                self.nodes[following], t[state]
+            )
+            targets = ((visited[state] | (1 << following)) * n_bits
+                       + following)
+
+            # Keep the earliest arrival to every new state
+            order = np.lexsort((arrivals, targets))
+            targets = targets[order]
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = targets[1:] != targets[:-1]
+            best = order[first]
+            times.flat[targets[first]] = arrivals[best]
+            parents.flat[targets[first]] = last[state[best]]
+
+        # Return to start_node
+        finite = np.flatnonzero(np.isfinite(times[full]))
+        n_states += len(finite)
+        self.solve_stats = {"dp_states": n_states, "dp_pruned": n_pruned}
+        if len(finite) == 0:
+            # Everything was pruned, which can only happen without FIFO
+            return greedy_tour
+        totals = times[full, finite] + evaluate_weights(
+            self.graph, self.nodes[finite], self.start_node,
+            times[full, finite]
+        )
+        last = int(finite[np.argmin(totals)])
+
+        # Follow the parents back to start_node
+        solution = []
+        visited = full
+        while last >= 0:
+            solution.append(int(self.nodes[last]))
+            visited, last = (visited ^ (1 << last),
+                             int(parents[visited, last]))
+        return [self.start_node] + solution[::-1]
+
+
+if __name__ == "__main__":
+    from trafficTSP.CreateProblems.graphs import create_graph
+    graph = create_graph(n_nodes=10)
+    dynamic_programming_solver = DynamicProgrammingStrategy(graph)
+    solution = dynamic_programming_solver.solve()
+    print("Final solution:", solution)
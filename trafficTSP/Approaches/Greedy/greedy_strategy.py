@@ -1,7 +1,13 @@
+from trafficTSP.CreateProblems.time_dependent_graph import candidate_lists
+
+
 class GreedyStrategy:
-    def __init__(self, graph: dict, start_node: int = 0):
+    def __init__(self, graph: dict, start_node: int = 0,
+                 n_candidates: int = None, candidates_by: str = "distance"):
         """
         Greedy strategy to solve the TSP.
+        With n_candidates, only the n_candidates nearest nodes of the
+        current node are considered, unless all of them are visited.
         """
         self.graph = graph
         self.start_node = start_node
@@ -10,10 +16,18 @@ class GreedyStrategy:
         self.solution = [self.start_node]
         self.current_node = self.start_node
         self.t = 0
+        self.candidates = None
+        if n_candidates is not None:
+            self.candidates = candidate_lists(graph, n_candidates,
+                                              candidates_by).tolist()
 
     def find_next_node(self):
         """Find the closest node from the current node."""
-        return min(self.nodes_left,
+        nodes = self.nodes_left
+        if self.candidates is not None:
+            nodes = [node for node in self.candidates[self.current_node]
+                     if node in self.nodes_left] or self.nodes_left
+        return min(nodes,
                    key=lambda node:
                    self.graph[(self.current_node, node)](self.t))
 
@@ -0,0 +1,141 @@
+import numpy as np
+from trafficTSP.Compare.evaluate_strategy import evaluate_solutions
+from trafficTSP.CreateProblems.time_dependent_graph import (
+    candidate_lists,
+    evaluate_weights
+)
+
+
+class VectorizedGreedyStrategy:
+    def __init__(self, graph: dict, start_node: int = 0,
+                 all_starts: bool = False, k_best: int = 1,
+                 n_runs: int = 1, seed: int = None,
+                 n_candidates: int = None, candidates_by: str = "distance"):
+        """
+        Greedy strategy to solve the TSP, with all the candidates of a
+        step evaluated in a single vectorized call.
+
+        Several greedy runs are built together, one per row of the
+        arrays: with all_starts one run starts from every node, and
+        with k_best > 1 every run picks at random among the k_best
+        closest nodes (GRASP), n_runs times. The first run from every
+        node is kept fully greedy, so the randomised runs can only
+        improve on it. Every tour is rotated to
+        begin at start_node and the best one from t=0 is returned.
+        With n_candidates, only the edges to the n_candidates nearest
+        nodes of the current node are evaluated, and the whole row only
+        when all of them are visited.
+        With the defaults it builds the same tour as GreedyStrategy.
+        """
+        self.graph = graph
+        self.start_node = start_node
+        self.n_nodes = graph['n_nodes']
+        self.all_starts = all_starts
+        self.k_best = k_best
+        self.n_runs = n_runs
+        self.rng = np.random.default_rng(seed)
+        self.candidates = None
+        if n_candidates is not None:
+            self.candidates = candidate_lists(graph, n_candidates,
+                                              candidates_by)
+
+    def first_nodes(self) -> np.ndarray:
+        """Returns the first node of every run."""
+        if self.all_starts:
+            first_nodes = np.arange(self.n_nodes)
+        else:
+            first_nodes = np.array([self.start_node])
+        if self.k_best > 1:
+            first_nodes = np.repeat(first_nodes, self.n_runs)
+        return first_nodes
+
+    def choose(self, weights: np.ndarray, n_left: int) -> np.ndarray:
+        """
+        Returns the next node of every run, given the weights to every
+        node, infinite for the visited ones.
+        """
+        if self.k_best <= 1 or n_left == 1:
+            return np.argmin(weights, axis=1)
+        k_best = min(self.k_best, n_left)
+        closest = np.argpartition(weights, k_best - 1, axis=1)[:, :k_best]
+        order = np.argsort(np.take_along_axis(weights, closest, axis=1),
+                           axis=1)
+        closest = np.take_along_axis(closest, order, axis=1)
+        # Only pick among the nodes that can be reached
+        n_choices = np.minimum(k_best, np.isfinite(weights).sum(axis=1))
+        picks = self.rng.integers(n_choices)
+        choices = closest[np.arange(len(weights)), picks]
+        greedy = slice(None, None, self.n_runs)
+        choices[greedy] = np.argmin(weights[greedy], axis=1)
+        return choices
+
+    def weights(self, current: np.ndarray, t: np.ndarray,
+                visited: np.ndarray) -> np.ndarray:
+        """
+        Returns the weights from the current node of every run at its
+        time to every node, infinite for the visited nodes and, with
+        candidate lists, for the nodes that are not candidates.
+        """
+        nodes = np.arange(self.n_nodes)
+        if self.candidates is None:
+            weights = evaluate_weights(self.graph, current[:, None],
+                                       nodes[None, :], t[:, None])
+            return np.where(visited, np.inf, weights)
+
+        rows = np.arange(len(current))[:, None]
+        candidates = self.candidates[current]
+        weights = np.full(visited.shape, np.inf)
+        weights[rows, candidates] = np.where(
+            visited[rows, candidates], np.inf,
+            evaluate_weights(self.graph, current[:, None], candidates,
+                             t[:, None])
+        )
+        # Runs whose candidates are all visited look at every node
+        stuck = np.flatnonzero(np.isinf(weights).all(axis=1))
+        if len(stuck):
+            weights[stuck] = np.where(
+                visited[stuck], np.inf,
+                evaluate_weights(self.graph, current[stuck, None],
+                                 nodes[None, :], t[stuck, None])
+            )
+        return weights
+
+    def tours(self) -> np.ndarray:
+        """Returns the tours of all the runs, one per row."""
+        current = self.first_nodes()
+        n_tours = len(current)
+        rows = np.arange(n_tours)
+        tours = np.empty((n_tours, self.n_nodes), dtype=int)
+        tours[:, 0] = current
+        visited = np.zeros((n_tours, self.n_nodes), dtype=bool)
+        visited[rows, current] = True
+        t = np.zeros(n_tours)
+        for position in range(1, self.n_nodes):
+            weights = self.weights(current, t, visited)
+            current = self.choose(weights, self.n_nodes - position)
+            t += weights[rows, current]
+            visited[rows, current] = True
+            tours[:, position] = current
+        return tours
+
+    def solve(self):
+        """Solve the TSP problem using batched greedy runs."""
+        tours = self.tours()
+        if len(tours) > 1:
+            # Rotate every tour to begin at start_node
+            shifts = np.argmax(tours == self.start_node, axis=1)
+            columns = (np.arange(self.n_nodes) + shifts[:, None])
+            tours = np.take_along_axis(tours, columns % self.n_nodes,
+                                       axis=1)
+            tours = tours[np.argmin(evaluate_solutions(self.graph, tours))]
+        else:
+            tours = tours[0]
+        return tours.tolist()
+
+
+if __name__ == "__main__":
+    from trafficTSP.CreateProblems.graphs import create_graph
+    graph = create_graph(n_nodes=100)
+    greedy_solver = VectorizedGreedyStrategy(graph, all_starts=True)
+    solution = greedy_solver.solve()
+    print("Final solution:", solution)
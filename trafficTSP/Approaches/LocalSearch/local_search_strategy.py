@@ -0,0 +1,160 @@
+import time
+from typing import Callable
+import numpy as np
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Compare.evaluate_strategy import TourEvaluator
+from trafficTSP.Compare.profiling import stage
+from trafficTSP.CreateProblems.time_dependent_graph import candidate_lists
+
+
+def two_opt_permutations(length: int) -> np.ndarray:
+    """
+    Returns the permutations of a suffix of the given length that
+    reverse its first r + 1 nodes, for r = 1, ..., length - 1.
+    """
+    columns = np.arange(length)[None, :]
+    ends = np.arange(1, length)[:, None]
+    return np.where(columns <= ends, ends - columns, columns)
+
+
+def swap_permutations(length: int) -> np.ndarray:
+    """
+    Returns the permutations of a suffix of the given length that swap
+    its first node with a non-adjacent one.
+    """
+    others = np.arange(2, length)
+    permutations = np.tile(np.arange(length), (len(others), 1))
+    rows = np.arange(len(others))
+    permutations[rows, 0] = others
+    permutations[rows, others] = 0
+    return permutations
+
+
+def or_opt_permutations(length: int, segment_length: int) -> np.ndarray:
+    """
+    Returns the permutations of a suffix of the given length that move
+    a segment of segment_length nodes: the first segment to any later
+    position, or any later segment to the front.
+    """
+    columns = np.arange(length)[None, :]
+    # First segment moved to after position j
+    ends = np.arange(segment_length, length)[:, None]
+    forward = np.where(columns <= ends - segment_length,
+                       columns + segment_length,
+                       np.where(columns <= ends,
+                                columns - (ends - segment_length + 1),
+                                columns))
+    # Segment starting at i moved to the front
+    starts = np.arange(1, length - segment_length + 1)[:, None]
+    backward = np.where(columns < segment_length, starts + columns,
+                        np.where(columns < starts + segment_length,
+                                 columns - segment_length, columns))
+    return np.concatenate([forward, backward])
+
+
+class LocalSearchStrategy:
+    def __init__(self, graph: dict, start_node: int = 0,
+                 initial_strategy: Callable = GreedyStrategy,
+                 time_limit: float = 1.0,
+                 max_segment_length: int = 3,
+                 tolerance: float = 1e-9,
+                 n_candidates: int = None,
+                 candidates_by: str = "distance"):
+        """
+        Local search strategy to solve the TSP.
+        Starts from the tour of initial_strategy and improves it with
+        2-opt, Or-opt and swap moves until no move improves the tour
+        or time_limit seconds have passed.
+        Every move changes the tour from some position k onwards, so
+        only the arrival times after k are evaluated again, for all
+        the moves starting at k together.
+        With n_candidates, only the moves whose new edge at k goes to
+        one of the n_candidates nearest nodes are evaluated.
+        """
+        self.graph = graph
+        self.start_node = start_node
+        self.n_nodes = graph['n_nodes']
+        self.initial_strategy = initial_strategy
+        self.time_limit = time_limit
+        self.max_segment_length = max_segment_length
+        self.tolerance = tolerance
+        self.permutations = {}
+        self.is_candidate = None
+        if n_candidates is not None:
+            # is_candidate[i, j] tells whether j is a candidate of i
+            candidates = candidate_lists(graph, n_candidates, candidates_by)
+            self.is_candidate = np.zeros((self.n_nodes, self.n_nodes),
+                                         dtype=bool)
+            np.put_along_axis(self.is_candidate, candidates, True, axis=1)
+
+    def initial_tour(self) -> list[int]:
+        """Returns the tour of the initial strategy, from start_node."""
+        tour = self.initial_strategy(self.graph).solve()
+        first = tour.index(self.start_node)
+        return tour[first:] + tour[:first]
+
+    def suffix_permutations(self, length: int) -> np.ndarray:
+        """
+        Returns all the moves of a suffix of the given length, as
+        permutations of its nodes that change its first node.
+        """
+        if length not in self.permutations:
+            moves = [two_opt_permutations(length),
+                     swap_permutations(length)]
+            for segment_length in range(1, self.max_segment_length + 1):
+                if segment_length < length:
+                    moves.append(or_opt_permutations(length,
+                                                     segment_length))
+            self.permutations[length] = np.unique(
+                np.concatenate(moves), axis=0
+            )
+        return self.permutations[length]
+
+    def improve_from(self, evaluator: TourEvaluator, position: int) -> bool:
+        """
+        Applies the best move that changes the tour from position
+        onwards, if it improves the tour. Returns whether it did.
+        """
+        suffix = evaluator.solution[position:]
+        if len(suffix) < 2:
+            return False
+        suffixes = suffix[self.suffix_permutations(len(suffix))]
+        if self.is_candidate is not None:
+            previous_node = evaluator.solution[position - 1]
+            suffixes = suffixes[self.is_candidate[previous_node,
+                                                  suffixes[:, 0]]]
+            if len(suffixes) == 0:
+                return False
+        costs = evaluator.evaluate_changes(suffixes, position)
+        best = np.argmin(costs)
+        if costs[best] < evaluator.total_weight - self.tolerance:
+            evaluator.apply_change(suffixes[best], position)
+            return True
+        return False
+
+    def solve(self):
+        """Solve the TSP problem improving a tour with local search."""
+        with stage("initial_tour"):
+            evaluator = TourEvaluator(self.graph, self.initial_tour())
+        if self.n_nodes < 3:
+            return evaluator.solution.tolist()
+
+        deadline = time.time() + self.time_limit
+        improved = True
+        with stage("local_search"):
+            while improved and time.time() < deadline:
+                improved = False
+                for position in range(1, self.n_nodes - 1):
+                    while self.improve_from(evaluator, position):
+                        improved = True
+                    if time.time() >= deadline:
+                        break
+        return evaluator.solution.tolist()
+
+
+if __name__ == "__main__":
+    from trafficTSP.CreateProblems.graphs import create_graph
+    graph = create_graph(n_nodes=10)
+    local_search_solver = LocalSearchStrategy(graph)
+    solution = local_search_solver.solve()
+    print("Final solution:", solution)
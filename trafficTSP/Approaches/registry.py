@@ -0,0 +1,31 @@
+from importlib import import_module
+
+# Strategies by name, as "module:class", so that only the modules of the
+# strategies in use are imported (the discrete strategy needs ortools)
+STRATEGIES = {
+    "Greedy": "trafficTSP.Approaches.Greedy.greedy_strategy:GreedyStrategy",
+    "VectorizedGreedy": "trafficTSP.Approaches.Greedy."
+                        "vectorized_greedy_strategy:VectorizedGreedyStrategy",
+    "Random": "trafficTSP.Approaches.Random.random_strategy:RandomStrategy",
+    "LocalSearch": "trafficTSP.Approaches.LocalSearch."
+                   "local_search_strategy:LocalSearchStrategy",
+    "DynamicProgramming": "trafficTSP.Approaches.DynamicProgramming."
+                          "dynamic_programming_strategy:"
+                          "DynamicProgrammingStrategy",
+    "Discrete": "trafficTSP.Approaches.Discrete.discrete_strategy:"
+                "DiscreteStrategy",
+    "RollingHorizon": "trafficTSP.Approaches.Discrete."
+                      "rolling_horizon_strategy:RollingHorizonStrategy",
+    "Decomposition": "trafficTSP.Approaches.Decomposition."
+                     "decomposition_strategy:DecompositionStrategy",
+}
+
+
+def load_strategy(name: str):
+    """
+    Returns the strategy class registered as name, importing its module.
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {name}.")
+    module_name, class_name = STRATEGIES[name].split(":")
+    return getattr(import_module(module_name), class_name)
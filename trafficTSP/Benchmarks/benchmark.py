@@ -0,0 +1,219 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable
+import numpy as np
+from trafficTSP.CreateProblems.graphs import (
+    InstanceSpec,
+    create_graph_from_spec
+)
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+from trafficTSP.Approaches.Greedy.greedy_strategy import GreedyStrategy
+from trafficTSP.Approaches.Greedy.vectorized_greedy_strategy import (
+    VectorizedGreedyStrategy
+)
+from trafficTSP.Approaches.LocalSearch.local_search_strategy import (
+    LocalSearchStrategy
+)
+from trafficTSP.Approaches.DynamicProgramming.dynamic_programming_strategy \
+    import DynamicProgrammingStrategy
+from trafficTSP.Approaches.Discrete.discretise_graph import (
+    travel_time_tensor
+)
+from trafficTSP.Approaches.Discrete.discrete_strategy import (
+    DiscreteStrategy
+)
+
+default_results_location = os.path.join("results", "benchmarks.json")
+# Baseline committed with the repository, timed on the reference machine.
+# Timings from other machines are only comparable with their own
+# baseline: run once with --save_baseline and --baseline pointing to a
+# local file, and compare later runs against it.
+default_baseline_location = os.path.join("results",
+                                         "benchmarks_baseline.json")
+
+SEEDS = (0, 1, 2)
+N_BINS = 30
+
+
+def discrete_strategy(graph: dict) -> DiscreteStrategy:
+    """Builds the CP-SAT model of the discrete strategy, single-threaded."""
+    return DiscreteStrategy(graph, n_bins=N_BINS, num_workers=1,
+                            max_time_in_seconds=10.0)
+
+
+def solve_quietly(strategy) -> list[int]:
+    """Solves with the strategy, hiding what it prints."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return strategy.solve()
+
+
+# Every stage: instance sizes, function preparing the input from the
+# spec and graph of an instance (not timed), and function timed on it.
+# The input is prepared again before every call, as strategies keep
+# their progress.
+STAGES = {
+    "create_graph": ((10, 50, 200), lambda spec, graph: spec,
+                     create_graph_from_spec),
+    "discretise": ((10, 50), lambda spec, graph: graph,
+                   lambda graph: travel_time_tensor(graph, N_BINS)),
+    "discrete_build": ((6, 10), lambda spec, graph: graph,
+                       discrete_strategy),
+    "discrete_solve": ((6, 8), lambda spec, graph: discrete_strategy(graph),
+                       solve_quietly),
+    "greedy": ((10, 50, 200), lambda spec, graph: GreedyStrategy(graph),
+               solve_quietly),
+    "vectorized_greedy": ((10, 50, 200),
+                          lambda spec, graph: VectorizedGreedyStrategy(graph),
+                          solve_quietly),
+    "local_search": ((10, 50),
+                     lambda spec, graph: LocalSearchStrategy(graph),
+                     solve_quietly),
+    "dynamic_programming": ((10, 14),
+                            lambda spec, graph:
+                            DynamicProgrammingStrategy(graph),
+                            solve_quietly),
+    "evaluate": ((10, 50, 200),
+                 lambda spec, graph: (graph, GreedyStrategy(graph).solve()),
+                 lambda arguments: evaluate_solution(*arguments)),
+}
+
+
+def time_call(function: Callable, prepare: Callable,
+              repeat: int) -> list[float]:
+    """
+    Returns the seconds taken by each of repeat calls of function, on
+    a new input from prepare every time.
+    """
+    times = []
+    for _ in range(repeat):
+        argument = prepare()
+        start = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarise(times: list[float]) -> dict:
+    """Returns the median, percentiles and extremes of the times."""
+    p10, median, p90 = np.percentile(times, [10, 50, 90])
+    return {"median": float(median), "p10": float(p10), "p90": float(p90),
+            "min": float(np.min(times)), "max": float(np.max(times)),
+            "n": len(times)}
+
+
+def run_benchmarks(stages: dict = None, seeds: tuple = SEEDS,
+                   repeat: int = 3) -> dict:
+    """
+    Times every stage on fixed instances, one per size and seed, and
+    returns the summaries keyed by "<stage>/<n_nodes>".
+    The instances are rebuilt from their seeds, so every run times the
+    same work.
+    """
+    if stages is None:
+        stages = STAGES
+    results = {}
+    for stage, (sizes, prepare, function) in stages.items():
+        for n_nodes in sizes:
+            times = []
+            for seed in seeds:
+                spec = InstanceSpec(n_nodes, seed)
+                graph = create_graph_from_spec(spec)
+                times += time_call(function,
+                                   lambda: prepare(spec, graph), repeat)
+            results[f"{stage}/{n_nodes}"] = summarise(times)
+    return {"meta": {"python": platform.python_version(),
+                     "numpy": np.__version__,
+                     "machine": platform.machine(),
+                     "seeds": list(seeds),
+                     "repeat": repeat},
+            "results": results}
+
+
+def compare_to_baseline(benchmarks: dict, baseline: dict,
+                        threshold: float = 0.25) -> list[dict]:
+    """
+    Returns the benchmarks whose median is more than threshold (as a
+    fraction) slower than in the baseline.
+    """
+    regressions = []
+    for name, summary in benchmarks["results"].items():
+        if name not in baseline["results"]:
+            continue
+        reference = baseline["results"][name]["median"]
+        ratio = summary["median"] / reference if reference > 0 else 1.0
+        if ratio > 1 + threshold:
+            regressions.append({"benchmark": name, "baseline": reference,
+                                "current": summary["median"],
+                                "ratio": ratio})
+    return regressions
+
+
+def save_benchmarks(benchmarks: dict, file_name: str):
+    """Saves the benchmarks as JSON, creating its directory if needed."""
+    directory = os.path.dirname(file_name)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_name, "w") as file:
+        json.dump(benchmarks, file, indent=2)
+
+
+def load_benchmarks(file_name: str) -> dict:
+    """Loads benchmarks saved as JSON."""
+    with open(file_name) as file:
+        return json.load(file)
+
+
+def main(arguments: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Time every stage on pinned instances"
+    )
+    parser.add_argument('--stages', type=str, nargs='+',
+                        choices=sorted(STAGES),
+                        help='Stages to time (all by default)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed calls per instance')
+    parser.add_argument('--output', type=str,
+                        default=default_results_location,
+                        help='JSON file for the results')
+    parser.add_argument('--baseline', type=str,
+                        default=default_baseline_location,
+                        help='JSON file of the baseline to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Slowdown of the median flagged as regression')
+    parser.add_argument('--save_baseline', action='store_true',
+                        help='Store the results as the new baseline')
+    args = parser.parse_args(arguments)
+
+    stages = STAGES
+    if args.stages:
+        stages = {stage: STAGES[stage] for stage in args.stages}
+    benchmarks = run_benchmarks(stages, repeat=args.repeat)
+    save_benchmarks(benchmarks, args.output)
+    for name, summary in benchmarks["results"].items():
+        print(f"{name:28} median {summary['median'] * 1e3:10.3f} ms  "
+              f"p90 {summary['p90'] * 1e3:10.3f} ms")
+
+    if args.save_baseline:
+        save_benchmarks(benchmarks, args.baseline)
+        return 0
+    try:
+        baseline = load_benchmarks(args.baseline)
+    except FileNotFoundError:
+        print(f"No baseline in {args.baseline}, run with --save_baseline "
+              "first.")
+        return 0
+    regressions = compare_to_baseline(benchmarks, baseline, args.threshold)
+    for regression in regressions:
+        print(f"Regression in {regression['benchmark']}: "
+              f"{regression['ratio']:.2f}x the baseline median")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,185 +1,348 @@
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
+import os
+import random
 import time
-from sqlalchemy import create_engine
-from trafficTSP.CreateProblems.graphs import create_graph
-from trafficTSP.Compare.evaluate_strategy import evaluate_strategy
-
-default_db_location = "databases\\strategy_results.db"
+from itertools import islice
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait
+)
+from trafficTSP.CreateProblems.graphs import (
+    InstanceSpec,
+    create_graph_from_spec
+)
+from trafficTSP.CreateProblems.cached_graph import CachedGraph
+from trafficTSP.CreateProblems.instance_store import (
+    InstanceStore,
+    StoredInstance,
+    default_instances_location,
+    instance_id,
+    load_instance
+)
+from trafficTSP.Compare.evaluate_strategy import run_strategy
+from trafficTSP.Compare.profiling import (
+    default_profiles_location,
+    profile_task,
+    record_stages
+)
+from trafficTSP.Compare.results_writer import (
+    ResultsWriter,
+    default_db_location
+)
 
 
 def compare_strategies(strategies: dict,
                        max_nodes: str = 10,
-                       n_repetitions: int = 5):
+                       n_repetitions: int = 5,
+                       workers: int = 1,
+                       seed: int = 0,
+                       instance_set: str = None,
+                       instances_db: str = default_instances_location,
+                       run_id: str = None,
+                       resume: bool = False,
+                       db_name: str = default_db_location,
+                       cache_size: int = None,
+                       profile: str = None,
+                       profile_dir: str = default_profiles_location,
+                       plot: bool = True,
+                       shard: tuple[int, int] = None,
+                       sizes=None):
     """
     Compare the strategies in randomly generated graphs.
+    With workers > 1 the instances are solved in parallel processes.
+    If instance_set is given, the instances of that set in the instance
+    store are used, generating and saving them the first time.
+    Results are appended to the database while the sweep runs, under
+    run_id. With resume, the (instance, strategy) pairs that already
+    have results in run_id are skipped.
+    With cache_size, the strategies share a cache of the weights of each
+    instance holding that many values.
+    The stages that strategies report are recorded as stage_<name>
+    columns, and every task can be profiled with cProfile or tracemalloc
+    (see run_instance).
+    With plot, the results of the run are plotted to files in results.
+    With shard=(i, N) only the i-th of N disjoint slices of the sweep is
+    run, so that several machines can share it under the same run_id
+    and their databases can be merged with merge_results. Shards are
+    not plotted.
+    The results are not kept in memory, only written to the database.
     """
-    results = []
-    n_strategies = len(strategies)
-    for n_nodes in range(3, max_nodes):
-        print(f"Running for {n_nodes} nodes")
-        # run n_repetitions
-        for _ in range(n_repetitions):
-            graph = create_graph(n_nodes)
-            for strategy_name, strategy in strategies.items():
-                start_time = time.time()
-                # Cost of the solution
-                cost = evaluate_strategy(graph, strategy)
-                end_time = time.time()
-                # Time to find the solution
-                time_taken = end_time - start_time
-
-                # Append results to list
-                results.append({
-                    "strategy": strategy_name,
-                    "n_nodes": n_nodes,
-                    "cost": cost,
-                    "time_taken": time_taken
-                })
-                if len(results) % n_strategies == 0:
-                    print(results[-n_strategies:])
-                    print("\n")
-
-    # Save to SQL
-    save_results_to_sql(results)
+    if resume and run_id is None:
+        raise ValueError("A run_id is needed to resume a run.")
+    if shard is not None and run_id is None:
+        raise ValueError("A run_id is needed to run a shard.")
+
+    # Save to SQL as results arrive
+    with ResultsWriter(db_name, run_id) as writer:
+        print(f"Run {writer.run_id}")
+        run_sweep(strategies, max_nodes, n_repetitions,
+                  workers=workers, seed=seed,
+                  instance_set=instance_set,
+                  instances_db=instances_db,
+                  writer=writer, resume=resume,
+                  cache_size=cache_size,
+                  profile=profile, profile_dir=profile_dir,
+                  shard=shard, sizes=sizes, keep_results=False)
+
+    if not plot or shard is not None:
+        return
+    # Plotting needs matplotlib, only imported when plots are made
+    from trafficTSP.Compare.plot_results import visualise_results
 
     # Visualise results
     name = "results"
     for key in strategies.keys():
         name += "_" + key
     name += f"_nodes_{max_nodes}_reps_{n_repetitions}.png"
-    visualise_results(name)
+    visualise_results(name, db_name, run_id=writer.run_id)
 
 
-def save_results_to_sql(results, db_name=default_db_location):
+def iter_instance_specs(max_nodes: int, n_repetitions: int,
+                        seed: int = 0, sizes=None):
     """
-    Save the Pandas DataFrame results to an SQLite database.
+    Yields the specs of the instances of a sweep one at a time, each one
+    with its own deterministic seed: n_repetitions instances of every
+    size in sizes, which is range(3, max_nodes) by default.
     """
-    # Convert to DataFrame
-    df_results = pd.DataFrame(results)
-    # Connect to SQLite DB
-    engine = create_engine(f"sqlite:///{db_name}")
-    # Save to SQL
-    df_results.to_sql("results", con=engine, if_exists="replace", index=False)
-    print(f"✅ Results saved to {db_name}")
+    if sizes is None:
+        sizes = range(3, max_nodes)
+    rng = random.Random(seed)
+    for n_nodes in sizes:
+        for _ in range(n_repetitions):
+            yield InstanceSpec(n_nodes, rng.getrandbits(32))
 
 
-def visualise_results(name: str = "results.png",
-                      db_name: str = default_db_location,
-                      old_strategy: str = "Greedy",
-                      new_strategy: str = "Discrete"):
+def instance_specs(max_nodes: int, n_repetitions: int,
+                   seed: int = 0, sizes=None) -> list[InstanceSpec]:
     """
-    Visualise strategy performance:
-    - Solid line: Average cost per strategy
-    - Dotted line: Average time taken per strategy
+    Returns the specs of the instances of a sweep, each one with its own
+    deterministic seed.
     """
-    # Connect to the database and load results
-    engine = create_engine(f"sqlite:///{db_name}")
-
-    # Aggregate results
-    query_aggregated = """
-        SELECT strategy, n_nodes,
-            AVG(cost) AS avg_cost,
-            AVG(time_taken) AS avg_time
-        FROM results
-        GROUP BY strategy, n_nodes
-    """
-    df_aggregated = pd.read_sql(query_aggregated, con=engine)
-
-    # Save aggregated data to a new table
-    df_aggregated.to_sql('avg_results', con=engine,
-                         index=False, if_exists='replace')
-
-    # Plot the aggregated data
-    plot_aggregated_strategy_data(df_aggregated, name)
-
-    # Compare old and new strategies
-    available_strategies = df_aggregated["strategy"].unique()
-    if (old_strategy in available_strategies and
-       new_strategy in available_strategies):
-        plot_improvement_old_to_new(engine, old_strategy, new_strategy)
-    else:
-        raise Exception(f"{old_strategy} or {new_strategy} not available.")
+    return list(iter_instance_specs(max_nodes, n_repetitions, seed, sizes))
 
 
-def plot_aggregated_strategy_data(df: pd.DataFrame, name: str):
+def sweep_instances(max_nodes: int, n_repetitions: int,
+                    seed: int = 0,
+                    instance_set: str = None,
+                    instances_db: str = default_instances_location,
+                    sizes=None):
     """
-    Plot the aggregated data.
+    Returns the instances of a sweep: a generator of InstanceSpecs, or
+    references to the instances of instance_set if it is given. A set
+    that does not exist yet is generated from the specs and saved.
     """
+    if instance_set is None:
+        return iter_instance_specs(max_nodes, n_repetitions, seed, sizes)
+    store = InstanceStore(instances_db)
+    instances = store.set_instances(instance_set)
+    if not instances:
+        instances = store.create_set(
+            instance_set,
+            iter_instance_specs(max_nodes, n_repetitions, seed, sizes)
+        )
+    return instances
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """
+    Returns the (index, n_shards) of a shard written as "i/N", with
+    0 <= i < N.
+    """
+    try:
+        index, n_shards = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"A shard is written as i/N, not {shard}.") \
+            from None
+    if not 0 <= index < n_shards:
+        raise ValueError(f"Shard {shard} must have 0 <= i < N.")
+    return index, n_shards
 
-    # Create a plot
-    fig, ax1 = plt.subplots()
-
-    # Create a second y-axis
-    ax2 = ax1.twinx()
-
-    # Number of unique strategies
-    strategies = df["strategy"].unique()
-
-    # Generate a list of colors from the 'viridis' colormap
-    colours = plt.cm.viridis(np.linspace(0, 1, len(strategies)))
-
-    # Loop through strategies and plot
-    for strategy, colour in zip(strategies, colours):
-        data = df[df["strategy"] == strategy]
-
-        # Solid line for cost
-        ax1.plot(data["n_nodes"], data["avg_cost"],
-                 color=colour, label=f"{strategy} - Cost",
-                 linestyle="-")
-
-        # Dotted line for time taken
-        ax2.plot(data["n_nodes"], data["avg_time"],
-                 color=colour, label=f"{strategy} - Time Taken",
-                 linestyle="dotted")
-
-    # Labels and titles
-    ax1.set_xlabel("Number of Nodes")
-    ax1.set_ylabel("Cost (Minutes)")
-    ax2.set_ylabel("Time Taken (Seconds)")
-
-    # Title
-    plt.title("Strategy Performance Comparison")
 
-    # Legends
-    ax1.legend(loc="upper left")
-    ax2.legend(loc="upper right")
+def shard_instances(instances, shard: tuple[int, int] = None):
+    """
+    Returns the instances of the shard (index, n_shards) of a sweep:
+    every n_shards-th instance, starting at index. The shards of a sweep
+    are disjoint, cover it, and get instances of every size.
+    """
+    if shard is None:
+        return iter(instances)
+    index, n_shards = shard
+    return islice(instances, index, None, n_shards)
 
-    # Save the plot
-    plt.savefig(f"results\\{name}")
 
-    # Show the plot
-    plt.show()
+def load_graph(instance):
+    """
+    Returns the graph of an InstanceSpec or a StoredInstance.
+    """
+    if isinstance(instance, StoredInstance):
+        return load_instance(instance)
+    return create_graph_from_spec(instance)
 
 
-def plot_improvement_old_to_new(engine, old_strategy, new_strategy):
+def run_instance(instance, strategies: dict,
+                 cache_size: int = None,
+                 profile: str = None,
+                 profile_dir: str = default_profiles_location) -> list[dict]:
     """
-    Plot the improvement from the old to the new strategy.
+    Builds the graph of the instance and returns the results of every
+    strategy on it. Runs in the worker processes of parallel sweeps,
+    so instance and strategies must be picklable.
+    With cache_size, the weights are memoized in a cache shared by all
+    the strategies, and its hits and misses are recorded.
+    The time of every stage reported by a strategy is recorded as
+    stage_<name>. With profile="cprofile" the statistics of every
+    strategy are saved in profile_dir, and with profile="tracemalloc"
+    its peak memory is recorded.
     """
-
-    # Compute improvement from old to new
-    query_improvement = f"""
-        SELECT
-            g.n_nodes,
-            g.avg_cost AS greedy_cost,
-            d.avg_cost AS discrete_cost,
-            (g.avg_cost / d.avg_cost - 1) AS improvement
-        FROM avg_results AS g
-        JOIN avg_results AS d
-        ON g.n_nodes = d.n_nodes
-        WHERE g.strategy = '{old_strategy}' AND d.strategy = '{new_strategy}'
+    graph = load_graph(instance)
+    graph_id = instance_id(graph)
+    if cache_size is not None:
+        graph = CachedGraph(graph, maxsize=cache_size)
+    if not strategies:
+        return []
+    seed = instance.seed if isinstance(instance, InstanceSpec) else None
+    results = []
+    for strategy_name, strategy in strategies.items():
+        if cache_size is not None:
+            cache_before = graph.cache_info()
+        profile_file = os.path.join(profile_dir,
+                                    f"{strategy_name}_{graph_id[:16]}.prof")
+        with record_stages() as timer, \
+                profile_task(profile, profile_file) as profile_stats:
+            start_time = time.time()
+            # Cost of the solution and statistics of the solver
+            run = run_strategy(graph, strategy)
+            end_time = time.time()
+        run.update(timer.columns())
+        run.update(profile_stats)
+        # Time to find the solution
+        time_taken = end_time - start_time
+        if cache_size is not None:
+            cache_after = graph.cache_info()
+            run["cache_hits"] = cache_after.hits - cache_before.hits
+            run["cache_misses"] = cache_after.misses - cache_before.misses
+
+        results.append({
+            "strategy": strategy_name,
+            "n_nodes": instance.n_nodes,
+            "instance_id": graph_id,
+            "seed": seed,
+            "cost": run.pop("cost"),
+            "time_taken": time_taken,
+            **run
+        })
+    return results
+
+
+def run_sweep(strategies: dict,
+              max_nodes: int = 10,
+              n_repetitions: int = 5,
+              workers: int = 1,
+              seed: int = 0,
+              instance_set: str = None,
+              instances_db: str = default_instances_location,
+              writer: ResultsWriter = None,
+              resume: bool = False,
+              cache_size: int = None,
+              profile: str = None,
+              profile_dir: str = default_profiles_location,
+              shard: tuple[int, int] = None,
+              sizes=None,
+              keep_results: bool = True,
+              max_in_flight: int = None) -> list[dict]:
     """
+    Returns the results of every strategy on every instance of the sweep,
+    or of its shard (index, n_shards) if one is given.
+    The results do not depend on the number of workers, but with
+    several workers they come in the order in which instances finish.
+    If a writer is given, results are passed to it as soon as each
+    instance is solved. With resume, the (instance, strategy) pairs that
+    the writer's run already has are skipped.
+    The sweep is a pipeline of generators (instances, results, writer),
+    so without keep_results its memory does not grow with its length,
+    and an empty list is returned.
+    """
+    instances = shard_instances(
+        sweep_instances(max_nodes, n_repetitions, seed, instance_set,
+                        instances_db, sizes),
+        shard
+    )
+    completed = writer.completed() if resume else set()
+    instance_results = stream_results(instances, strategies, completed,
+                                      workers, max_in_flight,
+                                      cache_size=cache_size,
+                                      profile=profile,
+                                      profile_dir=profile_dir)
+    return collect_results(instance_results, writer, keep_results)
+
+
+def stream_results(instances, strategies: dict, completed: set = None,
+                   workers: int = 1, max_in_flight: int = None,
+                   **options):
+    """
+    Yields every instance with its results (see run_instance).
+    With workers > 1, up to max_in_flight instances (twice the workers
+    by default) are being solved at a time, so the instances are only
+    read as they are needed, and results are yielded as soon as each
+    instance is solved, not in the order of instances.
+    """
+    if completed is None:
+        completed = set()
+    tasks = ((instance, pending_strategies(instance, strategies, completed))
+             for instance in instances)
+    if workers <= 1:
+        for instance, pending in tasks:
+            yield instance, run_instance(instance, pending, **options)
+        return
+
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Instance of every future being solved
+        in_flight = {}
+        for instance, pending in tasks:
+            future = executor.submit(run_instance, instance, pending,
+                                     **options)
+            in_flight[future] = instance
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), future.result()
+        for future in as_completed(list(in_flight)):
+            yield in_flight.pop(future), future.result()
+
+
+def pending_strategies(instance, strategies: dict, completed: set) -> dict:
+    """
+    Returns the strategies without results for the instance in completed.
+    Stored instances are identified by their id, generated ones by seed.
+    """
+    if isinstance(instance, StoredInstance):
+        key = instance.instance_id
+    else:
+        key = instance.seed
+    return {name: strategy for name, strategy in strategies.items()
+            if (key, name) not in completed}
 
-    df_improvement = pd.read_sql(query_improvement, con=engine)
-
-    fig_name = f"results\\improvement_{old_strategy}_to_{new_strategy}"
-    # fig_name += f"_nodes_{max_nodes}_reps_{n_repetitions}.png"
 
-    # Plot the improvement
-    plt.plot(df_improvement["n_nodes"], df_improvement["improvement"])
-    plt.xlabel("Number of Nodes")
-    plt.ylabel("Improvement (%)")
-    plt.title(f"Improvement from {old_strategy} to {new_strategy}")
-    plt.savefig(f"{fig_name}.png")
-    plt.show()
+def collect_results(instance_results, writer: ResultsWriter = None,
+                    keep_results: bool = True) -> list:
+    """
+    Merges the results of the (instance, results) pairs, passing them to
+    the writer as they arrive. Without keep_results they are not kept
+    and an empty list is returned.
+    """
+    results = []
+    current_n_nodes = None
+    for instance, new_results in instance_results:
+        if instance.n_nodes != current_n_nodes:
+            current_n_nodes = instance.n_nodes
+            print(f"Running for {current_n_nodes} nodes")
+        if keep_results:
+            results.extend(new_results)
+        if writer is not None:
+            writer.add(new_results)
+        print(new_results)
+        print("\n")
+    return results
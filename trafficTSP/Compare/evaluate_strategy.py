@@ -1,4 +1,7 @@
 from typing import Callable
+import numpy as np
+from trafficTSP.CreateProblems.time_dependent_graph import evaluate_weights
+from trafficTSP.Compare.profiling import stage
 
 
 def evaluate_solution(graph: dict, solution: list) -> float:
@@ -27,3 +30,132 @@ def evaluate_strategy(graph: dict, strategy: Callable) -> float:
     strategy = strategy(graph)
     solution = strategy.solve()
     return evaluate_solution(graph, solution)
+
+
+def run_strategy(graph: dict, strategy: Callable) -> dict:
+    """
+    Returns the cost of the solution generated by the strategy,
+    together with the statistics the strategy reports in solve_stats.
+    Building the strategy, solving and evaluating are reported as
+    stages.
+    """
+    with stage("build"):
+        strategy = strategy(graph)
+    with stage("solve"):
+        solution = strategy.solve()
+    with stage("evaluate"):
+        cost = evaluate_solution(graph, solution)
+    return {"cost": cost, **getattr(strategy, "solve_stats", {})}
+
+
+def evaluate_suffixes(graph: dict, previous_node: int, start_node: int,
+                      suffixes: np.ndarray, t: float) -> np.ndarray:
+    """
+    Returns the time at which each tour gets back to start_node, leaving
+    previous_node at time t and then visiting the nodes of each row of
+    suffixes. All the rows are evaluated together, one position at
+    a time.
+    """
+    suffixes = np.asarray(suffixes, dtype=int)
+    times = np.full(len(suffixes), t, dtype=float)
+    current = np.full(len(suffixes), previous_node)
+    for position in range(suffixes.shape[1]):
+        times += evaluate_weights(graph, current, suffixes[:, position],
+                                  times)
+        current = suffixes[:, position]
+    times += evaluate_weights(graph, current, start_node, times)
+    return times
+
+
+def evaluate_solutions(graph: dict, solutions) -> np.ndarray:
+    """
+    Returns the total weight of every solution path, evaluated together.
+    solutions is an array with one solution per row.
+    """
+    solutions = np.asarray(solutions, dtype=int)
+    if solutions.shape[1] < 2:
+        return np.zeros(len(solutions))
+    start_nodes = solutions[:, 0]
+    weights = np.zeros(len(solutions))
+    for position in range(1, solutions.shape[1]):
+        weights += evaluate_weights(graph, solutions[:, position - 1],
+                                    solutions[:, position], weights)
+    # Add the weight to return to the starting node
+    weights += evaluate_weights(graph, solutions[:, -1], start_nodes,
+                                weights)
+    return weights
+
+
+class TourEvaluator:
+    def __init__(self, graph: dict, solution: list):
+        """
+        Keeps the departure time from every position of a solution path,
+        so that a change from position k onwards is evaluated again
+        only from k, without walking the first k nodes.
+        The total weight of a path that starts at t=0 is the time at
+        which it gets back to the starting node.
+        """
+        self.graph = graph
+        self.solution = np.array(solution, dtype=int)
+        # departure_times[k] is the time at which position k is left,
+        # and departure_times[-1] the return to the starting node
+        self.departure_times = np.zeros(len(self.solution) + 1)
+        self.update(1)
+
+    @property
+    def total_weight(self) -> float:
+        """Total weight of the solution path, as evaluate_solution."""
+        if len(self.solution) < 2:
+            return 0.0
+        return float(self.departure_times[-1])
+
+    def weights(self) -> np.ndarray:
+        """Weight of every edge of the path, the return included."""
+        return np.diff(self.departure_times)
+
+    def update(self, position: int):
+        """
+        Evaluates again the departure times from position onwards.
+        """
+        n_nodes = len(self.solution)
+        for previous in range(max(position, 1) - 1, n_nodes):
+            node = self.solution[previous]
+            next_node = self.solution[(previous + 1) % n_nodes]
+            if node == next_node:
+                weight = 0.0
+            else:
+                weight = self.graph[(node, next_node)](
+                    self.departure_times[previous]
+                )
+            self.departure_times[previous + 1] = (
+                self.departure_times[previous] + weight
+            )
+
+    def evaluate_change(self, suffix: list, position: int) -> float:
+        """
+        Returns the total weight of the path that keeps the first
+        position nodes and then visits suffix.
+        """
+        return float(self.evaluate_changes([suffix], position)[0])
+
+    def evaluate_changes(self, suffixes, position: int) -> np.ndarray:
+        """
+        Returns the total weight of the paths that keep the first
+        position nodes and then visit each row of suffixes, all evaluated
+        together. With position 0 every row is a whole new path.
+        """
+        if position < 0:
+            raise ValueError(f"Position {position} is negative.")
+        if position == 0:
+            # No previous node: the rows start at t=0 from their own node
+            return evaluate_solutions(self.graph, suffixes)
+        return evaluate_suffixes(self.graph, self.solution[position - 1],
+                                 self.solution[0], suffixes,
+                                 self.departure_times[position - 1])
+
+    def apply_change(self, suffix: list, position: int):
+        """
+        Replaces the nodes from position onwards by suffix.
+        """
+        self.solution[position:] = suffix
+        self.update(position)
@@ -0,0 +1,131 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+from trafficTSP.Compare.results_writer import default_db_location
+
+# Plots are only saved to files, no display is needed
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def visualise_results(name: str = "results.png",
+                      db_name: str = default_db_location,
+                      old_strategy: str = "Greedy",
+                      new_strategy: str = "Discrete",
+                      run_id: str = None):
+    """
+    Visualise strategy performance:
+    - Solid line: Average cost per strategy
+    - Dotted line: Average time taken per strategy
+    Only the results of run_id are used if it is given.
+    """
+    # Connect to the database and load results
+    engine = create_engine(f"sqlite:///{db_name}")
+
+    # Aggregate results
+    query_aggregated = f"""
+        SELECT strategy, n_nodes,
+            AVG(cost) AS avg_cost,
+            AVG(time_taken) AS avg_time
+        FROM results
+        {"" if run_id is None else "WHERE run_id = :run_id"}
+        GROUP BY strategy, n_nodes
+    """
+    df_aggregated = pd.read_sql(text(query_aggregated), con=engine,
+                                params={"run_id": run_id})
+
+    # Save aggregated data to a new table
+    df_aggregated.to_sql('avg_results', con=engine,
+                         index=False, if_exists='replace')
+
+    # Plot the aggregated data
+    plot_aggregated_strategy_data(df_aggregated, name)
+
+    # Compare old and new strategies
+    available_strategies = df_aggregated["strategy"].unique()
+    if (old_strategy in available_strategies and
+       new_strategy in available_strategies):
+        plot_improvement_old_to_new(engine, old_strategy, new_strategy)
+    else:
+        raise Exception(f"{old_strategy} or {new_strategy} not available.")
+
+
+def plot_aggregated_strategy_data(df: pd.DataFrame, name: str):
+    """
+    Plot the aggregated data.
+    """
+
+    # Create a plot
+    fig, ax1 = plt.subplots()
+
+    # Create a second y-axis
+    ax2 = ax1.twinx()
+
+    # Number of unique strategies
+    strategies = df["strategy"].unique()
+
+    # Generate a list of colors from the 'viridis' colormap
+    colours = plt.cm.viridis(np.linspace(0, 1, len(strategies)))
+
+    # Loop through strategies and plot
+    for strategy, colour in zip(strategies, colours):
+        data = df[df["strategy"] == strategy]
+
+        # Solid line for cost
+        ax1.plot(data["n_nodes"], data["avg_cost"],
+                 color=colour, label=f"{strategy} - Cost",
+                 linestyle="-")
+
+        # Dotted line for time taken
+        ax2.plot(data["n_nodes"], data["avg_time"],
+                 color=colour, label=f"{strategy} - Time Taken",
+                 linestyle="dotted")
+
+    # Labels and titles
+    ax1.set_xlabel("Number of Nodes")
+    ax1.set_ylabel("Cost (Minutes)")
+    ax2.set_ylabel("Time Taken (Seconds)")
+
+    # Title
+    plt.title("Strategy Performance Comparison")
+
+    # Legends
+    ax1.legend(loc="upper left")
+    ax2.legend(loc="upper right")
+
+    # Save the plot
+    plt.savefig(f"results\\{name}")
+    plt.close(fig)
+
+
+def plot_improvement_old_to_new(engine, old_strategy, new_strategy):
+    """
+    Plot the improvement from the old to the new strategy.
+    """
+
+    # Compute improvement from old to new
+    query_improvement = f"""
+        SELECT
+            g.n_nodes,
+            g.avg_cost AS greedy_cost,
+            d.avg_cost AS discrete_cost,
+            (g.avg_cost / d.avg_cost - 1) AS improvement
+        FROM avg_results AS g
+        JOIN avg_results AS d
+        ON g.n_nodes = d.n_nodes
+        WHERE g.strategy = '{old_strategy}' AND d.strategy = '{new_strategy}'
+    """
+
+    df_improvement = pd.read_sql(query_improvement, con=engine)
+
+    fig_name = f"results\\improvement_{old_strategy}_to_{new_strategy}"
+    # fig_name += f"_nodes_{max_nodes}_reps_{n_repetitions}.png"
+
+    # Plot the improvement
+    plt.plot(df_improvement["n_nodes"], df_improvement["improvement"])
+    plt.xlabel("Number of Nodes")
+    plt.ylabel("Improvement (%)")
+    plt.title(f"Improvement from {old_strategy} to {new_strategy}")
+    plt.savefig(f"{fig_name}.png")
+    plt.close()
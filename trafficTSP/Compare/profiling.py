@@ -0,0 +1,98 @@
+import cProfile
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+default_profiles_location = "results\\profiles"
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+# Timer that the stages of the running task are reported to
+current_timer = ContextVar("current_timer", default=None)
+
+
+class StageTimer:
+    def __init__(self):
+        """
+        Registry of the seconds spent in every stage of a task.
+        Stages can be nested, and each one keeps its whole duration,
+        so a stage includes the time of the stages inside it.
+        """
+        self.durations = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Adds the time spent inside the context to the stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = (self.durations.get(name, 0.0)
+                                    + time.perf_counter() - start)
+
+    def columns(self) -> dict:
+        """Returns the durations as stage_<name> result columns."""
+        return {f"stage_{name}": seconds
+                for name, seconds in self.durations.items()}
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Reports the time spent inside the context as the stage name of the
+    current task, if its stages are being recorded.
+    """
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+@contextmanager
+def record_stages():
+    """Records the stages reported inside the context in a StageTimer."""
+    timer = StageTimer()
+    token = current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        current_timer.reset(token)
+
+
+@contextmanager
+def profile_task(mode: str = None, file_name: str = None):
+    """
+    Profiles the code inside the context. The dictionary it gives is
+    filled on exit with the result columns of the profile:
+    - "cprofile": the statistics are saved to file_name, whose name is
+      stored in profile_file.
+    - "tracemalloc": the peak of traced memory in bytes, as peak_memory.
+    With no mode nothing is profiled.
+    """
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode {mode}.")
+    profile = {}
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profile
+        finally:
+            profiler.disable()
+            directory = os.path.dirname(file_name)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(file_name)
+            profile["profile_file"] = file_name
+    elif mode == "tracemalloc":
+        tracemalloc.start()
+        try:
+            yield profile
+        finally:
+            profile["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    else:
+        yield profile
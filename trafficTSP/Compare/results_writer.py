@@ -0,0 +1,162 @@
+import time
+import uuid
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+default_db_location = "databases\\strategy_results.db"
+
+
+def new_run_id() -> str:
+    """
+    Returns a new identifier for a run, starting with its date and time.
+    """
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def add_missing_columns(connection, columns):
+    """
+    Adds to the results table the columns it does not have yet,
+    so that tables written by older versions can still be appended to.
+    """
+    existing = {row.name for row in connection.execute(
+        text("PRAGMA table_info(results)")
+    )}
+    if not existing:
+        return
+    for column in columns:
+        if column not in existing:
+            connection.execute(
+                text(f'ALTER TABLE results ADD COLUMN "{column}"')
+            )
+
+
+def save_results_to_sql(results, db_name=default_db_location,
+                        run_id: str = None):
+    """
+    Append the results to the results table of an SQLite database,
+    in a single transaction.
+    """
+    if not results:
+        return
+    # Convert to DataFrame
+    df_results = pd.DataFrame(results)
+    if "run_id" not in df_results:
+        df_results.insert(0, "run_id", run_id)
+    # Connect to SQLite DB
+    engine = create_engine(f"sqlite:///{db_name}")
+    # Save to SQL
+    with engine.begin() as connection:
+        add_missing_columns(connection, df_results.columns)
+        df_results.to_sql("results", con=connection,
+                          if_exists="append", index=False)
+        connection.execute(text("""
+            CREATE INDEX IF NOT EXISTS results_run_strategy_nodes
+            ON results (run_id, strategy, n_nodes)
+        """))
+    print(f"✅ {len(df_results)} results saved to {db_name}")
+
+
+def completed_results(db_name: str = default_db_location,
+                      run_id: str = None) -> set:
+    """
+    Returns the (instance, strategy) pairs that already have results in
+    the run. Instances are identified both by instance_id and by seed.
+    """
+    engine = create_engine(f"sqlite:///{db_name}")
+    with engine.connect() as connection:
+        columns = {row.name for row in connection.execute(
+            text("PRAGMA table_info(results)")
+        )}
+        if not {"run_id", "instance_id", "seed"} <= columns:
+            return set()
+        rows = connection.execute(text("""
+            SELECT DISTINCT instance_id, seed, strategy
+            FROM results
+            WHERE run_id = :run_id
+        """), {"run_id": run_id}).fetchall()
+    completed = set()
+    for row in rows:
+        completed.add((row.instance_id, row.strategy))
+        if row.seed is not None:
+            completed.add((row.seed, row.strategy))
+    return completed
+
+
+class ResultsWriter:
+    def __init__(self, db_name: str = default_db_location,
+                 run_id: str = None,
+                 batch_size: int = 20):
+        """
+        Streams results to the database as they are produced, writing
+        one transaction every batch_size rows, so that a crash only
+        loses the last unwritten batch.
+        """
+        self.db_name = db_name
+        self.run_id = new_run_id() if run_id is None else run_id
+        self.batch_size = batch_size
+        self.pending = []
+
+    def add(self, results: list[dict]):
+        """Queue results, writing them if a batch is complete."""
+        self.pending.extend(results)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all the queued results."""
+        save_results_to_sql(self.pending, self.db_name, self.run_id)
+        self.pending = []
+
+    def completed(self) -> set:
+        """Returns the (instance, strategy) pairs of this run in the DB."""
+        return completed_results(self.db_name, self.run_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Keep what was computed even if the run is interrupted
+        self.flush()
+
+
+def merge_results(db_names: list[str], output_db: str,
+                  chunk_size: int = 10000) -> int:
+    """
+    Appends the results of the databases db_names, for instance those
+    written by the shards of a sweep, to output_db. The rows of an
+    (run_id, instance_id, strategy) that output_db already has are
+    skipped, so merging the same databases twice adds nothing.
+    The databases are read chunk_size rows at a time.
+    Returns the number of rows added.
+    """
+    key_columns = ["run_id", "instance_id", "strategy"]
+    engine = create_engine(f"sqlite:///{output_db}")
+    with engine.connect() as connection:
+        columns = {row.name for row in connection.execute(
+            text("PRAGMA table_info(results)")
+        )}
+        seen = set()
+        if set(key_columns) <= columns:
+            seen = set(connection.execute(text("""
+                SELECT DISTINCT run_id, instance_id, strategy FROM results
+            """)).fetchall())
+    engine.dispose()
+
+    n_added = 0
+    for db_name in db_names:
+        engine = create_engine(f"sqlite:///{db_name}")
+        for chunk in pd.read_sql("SELECT * FROM results", engine,
+                                 chunksize=chunk_size):
+            keys = list(zip(*(chunk[column] if column in chunk
+                              else [None] * len(chunk)
+                              for column in key_columns)))
+            is_new = []
+            for key in keys:
+                # Rows of older versions, without instance_id, are kept
+                is_new.append(pd.isna(key[1]) or key not in seen)
+                seen.add(key)
+            new_rows = chunk[is_new]
+            save_results_to_sql(new_rows.to_dict("records"), output_db)
+            n_added += len(new_rows)
+        engine.dispose()
+    return n_added
@@ -0,0 +1,82 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from trafficTSP.CreateProblems.time_dependent_graph import evaluate_weights
+
+
+class CachedEdgeWeight:
+    def __init__(self, graph: "CachedGraph", start_node: int, end_node: int):
+        """
+        Weight function of an edge of a CachedGraph.
+        """
+        self.graph = graph
+        self.start_node = start_node
+        self.end_node = end_node
+
+    def __call__(self, t: float) -> float:
+        """Returns the weight at time t."""
+        return self.graph.weight(self.start_node, self.end_node, t)
+
+
+class CachedGraph(Mapping):
+    def __init__(self, graph: dict, maxsize: int = 2**16,
+                 resolution: float = 1e-6):
+        """
+        Wraps a graph memoizing graph[(i, j)](t).
+
+        Times are quantised to multiples of resolution and the weights
+        of the last maxsize (edge, time) pairs are kept. Vectorized
+        evaluations are passed through to the wrapped graph without
+        caching. Several strategies can share the same CachedGraph.
+        """
+        self.graph = graph
+        self.resolution = resolution
+        self.cached_weight = lru_cache(maxsize=maxsize)(self.exact_weight)
+
+    def exact_weight(self, start_node: int, end_node: int,
+                     quantised_t: int) -> float:
+        """
+        Returns the weight of the edge at the quantised time, without cache.
+        """
+        return self.graph[(start_node, end_node)](
+            quantised_t * self.resolution
+        )
+
+    def weight(self, start_node: int, end_node: int, t: float) -> float:
+        """
+        Returns the weight of the edge (start_node, end_node) at time t.
+        """
+        return self.cached_weight(start_node, end_node,
+                                  round(t / self.resolution))
+
+    def evaluate(self, start_nodes, end_nodes, t):
+        """
+        Returns the weights of the edges (start_nodes, end_nodes) at times t,
+        evaluated by the wrapped graph.
+        """
+        return evaluate_weights(self.graph, start_nodes, end_nodes, t)
+
+    def cache_info(self):
+        """Returns the hits, misses, maxsize and current size of the cache."""
+        return self.cached_weight.cache_info()
+
+    def cache_clear(self):
+        """Empties the cache and resets its counters."""
+        self.cached_weight.cache_clear()
+
+    def __getattr__(self, name):
+        # Arrays and other attributes of the wrapped graph
+        if name == 'graph':
+            raise AttributeError(name)
+        return getattr(self.graph, name)
+
+    def __getitem__(self, key):
+        value = self.graph[key]
+        if isinstance(key, tuple):
+            return CachedEdgeWeight(self, *key)
+        return value
+
+    def __iter__(self):
+        return iter(self.graph)
+
+    def __len__(self) -> int:
+        return len(self.graph)
@@ -1,17 +1,25 @@
 import random
 import math
-from trafficTSP.CreateProblems.weight_functions import (
-    create_random_weight_function
-)
+from collections import namedtuple
+import numpy as np
+from trafficTSP.CreateProblems.weight_functions import random_disruptions
+from trafficTSP.CreateProblems.time_dependent_graph import TimeDependentGraph
+
+# Picklable description of a random graph, enough to rebuild it anywhere
+InstanceSpec = namedtuple('InstanceSpec',
+                          ['n_nodes', 'seed', 'max_distance', 'time_range'],
+                          defaults=[10, (0, 480)])
 
 
 def create_graph(n_nodes: int,
                  max_distance: float = 10,
-                 time_range: tuple[float, float] = (0, 480)
-                 ) -> dict:
+                 time_range: tuple[float, float] = (0, 480),
+                 n_disruptions: int = 2
+                 ) -> TimeDependentGraph:
     """
-    Returns a graph saved in a dictionary
-    with n_nodes and weight functions for the edges.
+    Returns a graph with n_nodes and weight functions for the edges.
+    The graph can be used as a dictionary: graph[(i, j)] is the weight
+    function of the edge from i to j.
     """
     # Create n_nodes nodes with random locations
     # in a square in which max_distance is the desired
@@ -19,17 +27,26 @@ def create_graph(n_nodes: int,
     nodes = [(random.uniform(0, side), random.uniform(0, side))
              for _ in range(n_nodes)]
 
-    # Create a graph with random weight functions
-    graph = {
-        'n_nodes': n_nodes,
-        'time_range': time_range
-        }
+    # Create random disruptions for every edge
+    means = np.zeros((n_nodes, n_nodes, n_disruptions))
+    maxima = np.zeros((n_nodes, n_nodes, n_disruptions))
     for i in range(n_nodes):
         for j in range(n_nodes):
             if i != j:
-                graph[(i, j)] = create_random_weight_function(
-                    nodes[i],
-                    nodes[j],
-                    mean_range=time_range
+                means[i, j], maxima[i, j] = random_disruptions(
+                    mean_range=time_range,
+                    n_disruptions=n_disruptions
                 )
-    return graph
+    return TimeDependentGraph(nodes, means, maxima, time_range)
+
+
+def create_graph_from_spec(spec: InstanceSpec) -> TimeDependentGraph:
+    """
+    Returns the graph described by spec.
+    The random generator is seeded with spec.seed, so the same spec
+    always gives the same graph, in any process.
+    """
+    random.seed(spec.seed)
+    return create_graph(spec.n_nodes,
+                        max_distance=spec.max_distance,
+                        time_range=spec.time_range)
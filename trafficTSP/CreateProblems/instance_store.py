@@ -0,0 +1,161 @@
+import hashlib
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import create_engine, text
+from trafficTSP.CreateProblems.graphs import create_graph_from_spec
+from trafficTSP.CreateProblems.time_dependent_graph import TimeDependentGraph
+
+default_instances_location = "databases\\instances.db"
+
+# Picklable reference to an instance saved in an InstanceStore
+StoredInstance = namedtuple('StoredInstance',
+                            ['instance_id', 'n_nodes', 'db_name'])
+
+
+def instance_id(graph: TimeDependentGraph) -> str:
+    """
+    Returns the content hash of a graph, which identifies it in the store.
+    Two graphs with the same nodes, disruptions and time range have
+    the same id.
+    """
+    content = hashlib.sha256()
+    content.update(np.array(graph.time_range, dtype='<f8').tobytes())
+    content.update(np.array(graph.means.shape, dtype='<i8').tobytes())
+    for array in (graph.nodes, graph.means, graph.maxima):
+        content.update(np.ascontiguousarray(array, dtype='<f8').tobytes())
+    return content.hexdigest()
+
+
+class InstanceStore:
+    def __init__(self, db_name: str = default_instances_location):
+        """
+        SQLite store of graphs, keyed by their content hash.
+        Instances are grouped in named sets, so the same instances
+        can be used by several runs.
+        """
+        self.db_name = db_name
+        self.engine = create_engine(f"sqlite:///{db_name}")
+        with self.engine.begin() as connection:
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS instances (
+                    instance_id TEXT PRIMARY KEY,
+                    n_nodes INTEGER NOT NULL,
+                    n_disruptions INTEGER NOT NULL,
+                    time_start REAL NOT NULL,
+                    time_end REAL NOT NULL,
+                    nodes BLOB NOT NULL,
+                    means BLOB NOT NULL,
+                    maxima BLOB NOT NULL
+                )
+            """))
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS instance_sets (
+                    set_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    instance_id TEXT NOT NULL
+                        REFERENCES instances (instance_id),
+                    PRIMARY KEY (set_id, position)
+                )
+            """))
+
+    def add(self, graph: TimeDependentGraph) -> str:
+        """
+        Saves the graph, if it is not already saved, and returns its id.
+        """
+        graph_id = instance_id(graph)
+        with self.engine.begin() as connection:
+            connection.execute(text("""
+                INSERT OR IGNORE INTO instances
+                VALUES (:instance_id, :n_nodes, :n_disruptions,
+                        :time_start, :time_end, :nodes, :means, :maxima)
+            """), {
+                "instance_id": graph_id,
+                "n_nodes": graph.n_nodes,
+                "n_disruptions": graph.n_disruptions,
+                "time_start": graph.time_range[0],
+                "time_end": graph.time_range[1],
+                "nodes": graph.nodes.astype('<f8').tobytes(),
+                "means": graph.means.astype('<f8').tobytes(),
+                "maxima": graph.maxima.astype('<f8').tobytes()
+            })
+        return graph_id
+
+    def load(self, graph_id: str) -> TimeDependentGraph:
+        """
+        Returns the graph saved with the given id.
+        """
+        with self.engine.connect() as connection:
+            row = connection.execute(text("""
+                SELECT n_nodes, n_disruptions, time_start, time_end,
+                       nodes, means, maxima
+                FROM instances
+                WHERE instance_id = :instance_id
+            """), {"instance_id": graph_id}).fetchone()
+        if row is None:
+            raise KeyError(f"Instance {graph_id} not in {self.db_name}.")
+
+        n_nodes, n_disruptions = row.n_nodes, row.n_disruptions
+        shape = (n_nodes, n_nodes, n_disruptions)
+        return TimeDependentGraph(
+            np.frombuffer(row.nodes, dtype='<f8').reshape(n_nodes, 2),
+            np.frombuffer(row.means, dtype='<f8').reshape(shape),
+            np.frombuffer(row.maxima, dtype='<f8').reshape(shape),
+            time_range=(row.time_start, row.time_end)
+        )
+
+    def add_set(self, set_id: str, graph_ids: list[str]):
+        """
+        Appends the instances with the given ids to the set set_id.
+        """
+        if not graph_ids:
+            return
+        start = len(self.set_instances(set_id))
+        with self.engine.begin() as connection:
+            connection.execute(text("""
+                INSERT INTO instance_sets (set_id, position, instance_id)
+                VALUES (:set_id, :position, :instance_id)
+            """), [{"set_id": set_id, "position": start + position,
+                    "instance_id": graph_id}
+                   for position, graph_id in enumerate(graph_ids)])
+
+    def set_instances(self, set_id: str) -> list[StoredInstance]:
+        """
+        Returns references to the instances of a set, in order.
+        The graphs themselves are only loaded when needed.
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(text("""
+                SELECT s.instance_id, i.n_nodes
+                FROM instance_sets AS s
+                JOIN instances AS i
+                ON s.instance_id = i.instance_id
+                WHERE s.set_id = :set_id
+                ORDER BY s.position
+            """), {"set_id": set_id}).fetchall()
+        return [StoredInstance(row.instance_id, row.n_nodes, self.db_name)
+                for row in rows]
+
+    def iter_set(self, set_id: str):
+        """
+        Yields the id and the graph of every instance of a set, loading
+        them one at a time.
+        """
+        for instance in self.set_instances(set_id):
+            yield instance.instance_id, self.load(instance.instance_id)
+
+    def create_set(self, set_id: str, specs: list) -> list[StoredInstance]:
+        """
+        Generates the graphs of the InstanceSpecs, saves them in the set
+        set_id and returns references to them.
+        """
+        graph_ids = [self.add(create_graph_from_spec(spec))
+                     for spec in specs]
+        self.add_set(set_id, graph_ids)
+        return self.set_instances(set_id)
+
+
+def load_instance(instance: StoredInstance) -> TimeDependentGraph:
+    """
+    Returns the graph referenced by instance.
+    """
+    return InstanceStore(instance.db_name).load(instance.instance_id)
@@ -0,0 +1,228 @@
+import math
+from collections.abc import Mapping
+import numpy as np
+from trafficTSP.CreateProblems.weight_kernels import (
+    inverse_std_dev,
+    disrupted_weight,
+    scalar_disrupted_weight
+)
+
+
+class EdgeWeight:
+    def __init__(self, graph: "TimeDependentGraph",
+                 start_node: int, end_node: int):
+        """
+        Weight function of the edge (start_node, end_node) of a
+        TimeDependentGraph. Behaves like the functions returned by
+        create_random_weight_function.
+        """
+        self.graph = graph
+        self.start_node = start_node
+        self.end_node = end_node
+
+    def __call__(self, t: float) -> float:
+        """Returns the weight at time t."""
+        return self.graph.weight(self.start_node, self.end_node, t)
+
+
+class TimeDependentGraph(Mapping):
+    def __init__(self, nodes, means, maxima,
+                 time_range: tuple[float, float] = (0, 480)):
+        """
+        Graph whose edge weights depend on the time of the day.
+
+        Node coordinates are stored in an array of shape (n, 2) and the
+        disruptions of every edge in arrays of shape (n, n, k). The graph
+        can still be used as the dictionary returned by the old
+        create_graph: graph['n_nodes'], graph['time_range'] and
+        graph[(i, j)](t) work as before.
+        """
+        self.nodes = np.asarray(nodes, dtype=float).reshape(-1, 2)
+        self.n_nodes = len(self.nodes)
+        self.time_range = tuple(time_range)
+        self.means = np.asarray(means, dtype=float)
+        self.maxima = np.asarray(maxima, dtype=float)
+        if (self.means.shape != self.maxima.shape or
+                self.means.shape[:2] != (self.n_nodes, self.n_nodes)):
+            raise ValueError("means and maxima must have shape (n, n, k).")
+        self.n_disruptions = self.means.shape[2]
+        # Normalisation constants of the disruptions, computed only once
+        self.inv_std_devs = inverse_std_dev(self.maxima)
+
+        # Distance between every pair of nodes, computed only once
+        points = self.nodes.tolist()
+        self.distances = np.array(
+            [[math.dist(p, q) for q in points] for p in points],
+            dtype=float
+        ).reshape(self.n_nodes, self.n_nodes)
+
+    def weight(self, start_node: int, end_node: int, t: float) -> float:
+        """
+        Returns the weight of the edge (start_node, end_node) at time t.
+        """
+        if np.ndim(t) > 0:
+            return self.evaluate(start_node, end_node, t)
+        edge = (start_node, end_node)
+        disruptions = zip(self.means[edge].tolist(),
+                          self.maxima[edge].tolist(),
+                          self.inv_std_devs[edge].tolist())
+        return scalar_disrupted_weight(float(self.distances[edge]), t,
+                                       disruptions)
+
+    def evaluate(self, start_nodes, end_nodes, t) -> np.ndarray:
+        """
+        Returns the weights of the edges (start_nodes, end_nodes) at times t.
+        The three arguments are broadcast against each other, so a whole
+        row, a whole matrix or a batch of (edge, t) pairs is evaluated
+        in a single call.
+        """
+        start_nodes, end_nodes, t = np.broadcast_arrays(
+            np.asarray(start_nodes, dtype=int),
+            np.asarray(end_nodes, dtype=int),
+            np.asarray(t, dtype=float)
+        )
+        edges = (start_nodes, end_nodes)
+        return disrupted_weight(self.distances[edges], t,
+                                self.means[edges], self.maxima[edges],
+                                self.inv_std_devs[edges])
+
+    def row(self, start_node: int, t: float) -> np.ndarray:
+        """
+        Returns the weights of all the edges leaving start_node at time t.
+        """
+        return self.evaluate(start_node, np.arange(self.n_nodes), t)
+
+    def matrix(self, t: float) -> np.ndarray:
+        """
+        Returns the matrix with the weights of all the edges at time t.
+        """
+        nodes = np.arange(self.n_nodes)
+        return self.evaluate(nodes[:, None], nodes[None, :], t)
+
+    def min_travel_times(self, n_times: int = 97) -> np.ndarray:
+        """
+        Returns the matrix with the minimum weight of every edge over
+        n_times times evenly spread across the time range.
+        """
+        times = np.linspace(*self.time_range, n_times)
+        minimum = np.full((self.n_nodes, self.n_nodes), np.inf)
+        nodes = np.arange(self.n_nodes)
+        for t in times:
+            minimum = np.minimum(minimum, self.evaluate(nodes[:, None],
+                                                        nodes[None, :], t))
+        return minimum
+
+    def candidate_lists(self, k: int, by: str = "distance") -> np.ndarray:
+        """
+        Returns an array of shape (n_nodes, k) with the k nearest other
+        nodes of every node, nearest first, by base distance or by
+        minimum travel time over the day (by="min_travel_time").
+        """
+        if by == "distance":
+            costs = self.distances
+        elif by == "min_travel_time":
+            costs = self.min_travel_times()
+        else:
+            raise ValueError(f"Unknown candidate ordering {by}.")
+        return nearest_nodes(costs, k)
+
+    def subgraph(self, nodes, time_offset: float = 0.0
+                 ) -> "TimeDependentGraph":
+        """
+        Returns the graph of the given nodes, where node i is nodes[i],
+        seen from time_offset: its weights at time t are those of this
+        graph at time t + time_offset, so a tour entering the nodes at
+        time_offset can be solved as a tour starting at 0.
+        The time range keeps its length.
+        """
+        nodes = np.asarray(nodes, dtype=int)
+        edges = np.ix_(nodes, nodes)
+        subgraph = TimeDependentGraph.__new__(TimeDependentGraph)
+        subgraph.nodes = self.nodes[nodes]
+        subgraph.n_nodes = len(nodes)
+        subgraph.time_range = self.time_range
+        subgraph.means = self.means[edges] - time_offset
+        subgraph.maxima = self.maxima[edges]
+        subgraph.n_disruptions = self.n_disruptions
+        subgraph.inv_std_devs = self.inv_std_devs[edges]
+        subgraph.distances = self.distances[edges]
+        return subgraph
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key == 'n_nodes':
+                return self.n_nodes
+            if key == 'time_range':
+                return self.time_range
+        elif isinstance(key, tuple) and len(key) == 2:
+            start_node, end_node = key
+            if (start_node != end_node and
+                    0 <= start_node < self.n_nodes and
+                    0 <= end_node < self.n_nodes):
+                return EdgeWeight(self, start_node, end_node)
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield 'n_nodes'
+        yield 'time_range'
+        for i in range(self.n_nodes):
+            for j in range(self.n_nodes):
+                if i != j:
+                    yield (i, j)
+
+    def __len__(self) -> int:
+        return 2 + self.n_nodes * (self.n_nodes - 1)
+
+
+def evaluate_weights(graph: dict, start_nodes, end_nodes, t) -> np.ndarray:
+    """
+    Returns the weights of the edges (start_nodes, end_nodes) at times t.
+    Uses the vectorized evaluation of graphs that have one, such as
+    TimeDependentGraph, and falls back to calling the weight functions
+    one by one for other graphs.
+    """
+    if hasattr(graph, 'evaluate'):
+        return graph.evaluate(start_nodes, end_nodes, t)
+    start_nodes, end_nodes, t = np.broadcast_arrays(
+        np.asarray(start_nodes, dtype=int),
+        np.asarray(end_nodes, dtype=int),
+        np.asarray(t, dtype=float)
+    )
+    weights = [0.0 if i == j else graph[(i, j)](time)
+               for i, j, time in zip(start_nodes.flat, end_nodes.flat,
+                                     t.flat)]
+    return np.array(weights, dtype=float).reshape(t.shape)
+
+
+def nearest_nodes(costs: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the k other nodes with the lowest cost from every node
+    (the rows of costs), lowest first. k is at most n_nodes - 1.
+    """
+    n_nodes = len(costs)
+    k = max(0, min(k, n_nodes - 1))
+    costs = np.array(costs, dtype=float)
+    np.fill_diagonal(costs, np.inf)
+    if k == 0:
+        return np.empty((n_nodes, 0), dtype=int)
+    nearest = np.argpartition(costs, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(costs, nearest, axis=1),
+                       axis=1, kind='stable')
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def candidate_lists(graph: dict, k: int, by: str = "distance") -> np.ndarray:
+    """
+    Returns the k nearest other nodes of every node of the graph.
+    Uses the candidate lists of graphs that have them, such as
+    TimeDependentGraph. For other graphs the nodes are ordered by their
+    minimum weight over the day, as they have no base distances.
+    """
+    if hasattr(graph, 'candidate_lists'):
+        return graph.candidate_lists(k, by)
+    n_nodes = graph['n_nodes']
+    nodes = np.arange(n_nodes)
+    costs = np.min([evaluate_weights(graph, nodes[:, None], nodes[None, :],
+                                     t)
+                    for t in np.linspace(*graph['time_range'], 97)], axis=0)
+    return nearest_nodes(costs, k)
@@ -1,19 +1,42 @@
 import random
 import math
-from scipy.stats import norm
 from typing import Callable
+import numpy as np
+from trafficTSP.CreateProblems.weight_kernels import (
+    inverse_std_dev,
+    disrupted_weight,
+    scalar_disrupted_weight
+)
 
 
 def gaussian(t: float, mean: float, maximum: float) -> float:
     """
     Returns the value in t of a Gaussian function with a specified mean
     and highest value (maximum).
+    Reference implementation with scipy.stats, which is slow to import,
+    so it is only imported here.
     """
+    from scipy.stats import norm
+
     # Standard deviation of gaussian for desired maximum
     std_dev = 1 / (maximum * math.sqrt(2 * math.pi))
     return norm.pdf(t, loc=mean, scale=std_dev)
 
 
+def random_disruptions(mean_range: tuple[float, float] = (0, 480),
+                       maximum_range: tuple[float, float] = (0, 2),
+                       n_disruptions: int = 2
+                       ) -> tuple[list[float], list[float]]:
+    """
+    Returns the means and maxima of n_disruptions random disruptions.
+    """
+    maxima = [random.uniform(*maximum_range)
+              for _ in range(n_disruptions)]
+    means = [random.uniform(*mean_range)
+             for _ in range(n_disruptions)]
+    return means, maxima
+
+
 def create_random_weight_function(initial_node: tuple[float, float],
                                   final_node: tuple[float, float],
                                   mean_range: tuple[float, float] = (0, 480),
@@ -25,10 +48,11 @@ def create_random_weight_function(initial_node: tuple[float, float],
     """
 
     # Choose random disruptions
-    maxima = [random.uniform(*maximum_range)
-              for _ in range(n_disruptions)]
-    means = [random.uniform(*mean_range)
-             for _ in range(n_disruptions)]
+    means, maxima = random_disruptions(mean_range, maximum_range,
+                                       n_disruptions)
+    disruptions = [(mean, maximum, inverse_std_dev(maximum))
+                   for mean, maximum in zip(means, maxima)]
+    distance = math.dist(initial_node, final_node)
 
     def weight_function(t: float) -> float:
         """
@@ -36,8 +60,8 @@ def create_random_weight_function(initial_node: tuple[float, float],
         Weight is calculated as the distance between the nodes multiplied by
         a factor that depends on the disruptions at that time of the day.
         """
-        weight = math.dist(initial_node, final_node)
-        for mean, maximum in zip(means, maxima):
-            weight *= (1 + gaussian(t, mean, maximum))
-        return weight
+        if np.ndim(t) > 0:
+            return disrupted_weight(distance, t, means, maxima,
+                                    inverse_std_dev(np.array(maxima)))
+        return scalar_disrupted_weight(distance, t, disruptions)
     return weight_function
@@ -0,0 +1,60 @@
+import math
+import numpy as np
+
+SQRT_2PI = math.sqrt(2 * math.pi)
+
+
+def inverse_std_dev(maximum):
+    """
+    Returns the inverse of the standard deviation of a Gaussian function
+    whose highest value is maximum. Works with floats and arrays.
+    """
+    # std_dev = 1 / (maximum * sqrt(2 * pi))
+    return maximum * SQRT_2PI
+
+
+def fast_gaussian(t, mean, maximum, inv_std_dev=None):
+    """
+    Returns the value in t of a Gaussian function with a specified mean
+    and highest value (maximum), in closed form.
+    Same values as weight_functions.gaussian, without the overhead of
+    scipy.stats. The inverse of the standard deviation can be given
+    if it has been precomputed.
+    """
+    if inv_std_dev is None:
+        inv_std_dev = inverse_std_dev(maximum)
+    z = (t - mean) * inv_std_dev
+    if isinstance(z, float):
+        return maximum * math.exp(-0.5 * z * z)
+    return maximum * np.exp(-0.5 * z * z)
+
+
+def disrupted_weight(distance, t, means, maxima, inv_std_devs):
+    """
+    Returns the weight at time t of edges with the given base distance
+    and disruptions.
+    means, maxima and inv_std_devs have the disruptions in the last axis,
+    distance and t are broadcast against the other axes.
+    """
+    t = np.asarray(t, dtype=float)[..., None]
+    z = (t - means) * inv_std_devs
+    gaussians = maxima * np.exp(-0.5 * z * z)
+    weight = np.broadcast_to(np.asarray(distance, dtype=float),
+                             gaussians.shape[:-1])
+    # Apply one disruption at a time, as the weight functions do
+    for k in range(gaussians.shape[-1]):
+        weight = weight * (1 + gaussians[..., k])
+    return weight
+
+
+def scalar_disrupted_weight(distance: float, t: float,
+                            disruptions: list) -> float:
+    """
+    Returns the weight at time t of an edge with the given base distance,
+    where disruptions is a list of (mean, maximum, inv_std_dev) tuples.
+    """
+    weight = distance
+    for mean, maximum, inv_std_dev in disruptions:
+        z = (t - mean) * inv_std_dev
+        weight *= 1 + maximum * math.exp(-0.5 * z * z)
+    return weight
@@ -0,0 +1,174 @@
+import contextlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from trafficTSP.Approaches.registry import STRATEGIES, load_strategy
+from trafficTSP.CreateProblems.time_dependent_graph import TimeDependentGraph
+from trafficTSP.Compare.evaluate_strategy import evaluate_solution
+
+
+def graph_to_json(graph: TimeDependentGraph) -> dict:
+    """
+    Returns the instance of a graph as it is sent to the service:
+    node coordinates, disruption means and maxima, and time range.
+    """
+    return {"nodes": graph.nodes.tolist(),
+            "means": graph.means.tolist(),
+            "maxima": graph.maxima.tolist(),
+            "time_range": list(graph.time_range)}
+
+
+def graph_from_json(instance: dict) -> TimeDependentGraph:
+    """Returns the graph of an instance sent to the service."""
+    n_nodes = len(instance["nodes"])
+    shape = (n_nodes, n_nodes, -1)
+    return TimeDependentGraph(
+        instance["nodes"],
+        np.asarray(instance["means"], dtype=float).reshape(shape),
+        np.asarray(instance["maxima"], dtype=float).reshape(shape),
+        time_range=instance.get("time_range", (0, 480))
+    )
+
+
+def warm_up(strategies: tuple[str, ...]):
+    """
+    Imports the modules of the strategies, so that the first request a
+    worker process gets does not pay for them (ortools in particular).
+    """
+    for name in strategies:
+        load_strategy(name)
+
+
+def solve_request(request: dict) -> dict:
+    """
+    Solves the instance of a request with the strategy it names and
+    returns the response: the tour, its cost, the time taken and the
+    statistics of the strategy. Errors are returned in the response.
+
+    A request has the keys "instance" (see graph_to_json), "strategy"
+    and, optionally, "options" for the strategy and an "id" that is
+    copied to the response.
+    """
+    response = {"id": request.get("id")}
+    try:
+        strategy = load_strategy(request.get("strategy", "Greedy"))
+        graph = graph_from_json(request["instance"])
+        # Strategies print their progress, stdout is for responses
+        with contextlib.redirect_stdout(sys.stderr):
+            start_time = time.time()
+            solver = strategy(graph, **request.get("options", {}))
+            solution = solver.solve()
+            time_taken = time.time() - start_time
+        response.update({"solution": [int(node) for node in solution],
+                         "cost": evaluate_solution(graph, solution),
+                         "time_taken": time_taken,
+                         **getattr(solver, "solve_stats", {})})
+    except Exception as error:
+        response["error"] = f"{type(error).__name__}: {error}"
+    return response
+
+
+class SolveService:
+    def __init__(self, workers: int = 1,
+                 strategies: tuple[str, ...] = tuple(STRATEGIES)):
+        """
+        Pool of warm worker processes solving requests.
+        The workers import the strategies when they start and are kept
+        for all the requests, which wait in the queue of the pool while
+        all the workers are busy.
+        """
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            initializer=warm_up,
+                                            initargs=(tuple(strategies),))
+        # Start every worker now, rather than on the first requests
+        for future in [self.executor.submit(int) for _ in range(workers)]:
+            future.result()
+
+    def submit(self, request: dict) -> Future:
+        """Queues a request, returning the future of its response."""
+        return self.executor.submit(solve_request, request)
+
+    def solve(self, request: dict) -> dict:
+        """Returns the response to a request, waiting for it."""
+        return self.submit(request).result()
+
+    def serve(self, input_stream=None, output_stream=None):
+        """
+        Reads one JSON request per line of input_stream (stdin by
+        default) and writes one JSON response per line to output_stream
+        (stdout by default) as soon as each one is solved, so responses
+        can come in a different order than requests: their "id" tells
+        them apart. Returns when the input ends and all the requests
+        are answered.
+        """
+        if input_stream is None:
+            input_stream = sys.stdin
+        if output_stream is None:
+            output_stream = sys.stdout
+        lock = threading.Lock()
+        # Requests whose response has not been written yet
+        unanswered = threading.Condition()
+        n_unanswered = 0
+
+        def write(response: dict):
+            with lock:
+                output_stream.write(json.dumps(response, default=float)
+                                    + "\n")
+                output_stream.flush()
+
+        def respond(request_id, future: Future):
+            try:
+                response = future.result()
+            except Exception as error:
+                # The worker process failed
+                response = {"id": request_id,
+                            "error": f"{type(error).__name__}: {error}"}
+            write(response)
+            nonlocal n_unanswered
+            with unanswered:
+                n_unanswered -= 1
+                unanswered.notify_all()
+
+        for line in input_stream:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as error:
+                write({"id": None, "error": f"JSONDecodeError: {error}"})
+                continue
+            if not isinstance(request, dict):
+                write({"id": None, "error": "A request must be an object."})
+                continue
+            with unanswered:
+                n_unanswered += 1
+            future = self.submit(request)
+            future.add_done_callback(partial(respond, request.get("id")))
+        # Futures are done before their callbacks run, so wait for the
+        # responses to be written rather than for the futures
+        with unanswered:
+            unanswered.wait_for(lambda: n_unanswered == 0)
+
+    def close(self):
+        """Waits for the queued requests and stops the workers."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def serve(input_stream=None, output_stream=None, workers: int = 1,
+          strategies: tuple[str, ...] = tuple(STRATEGIES)):
+    """
+    Answers the JSON-lines requests of input_stream with a new
+    SolveService (see SolveService.serve).
+    """
+    with SolveService(workers, strategies) as service:
+        service.serve(input_stream, output_stream)